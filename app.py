@@ -1,36 +1,44 @@
 # app.py
 
+import time
+SCRIPT_STARTED = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 from io import BytesIO
 import asyncio
 from datetime import datetime
+import sys
+import hashlib
 import re
 import os
 from typing import List, Dict, Optional
 import json
 
 # Import modules (assuming these are correctly defined in their respective files)
-from scraper import NewsScraper
-from sentiment_analyzer import SentimentAnalyzer
-from journalist_detector import JournalistDetector
-from summarizer import ArticleSummarizer
-from topic_modeller import TopicModeller # --- BARU ---
-from config import GEMINI_API_KEY
+from domain_scheduler import DomainScheduler
+from http_transport import HttpTransport
+from run_store import RunStore
+from resources import get_job_runner, get_user_agent_stats
+from job_runner import JOB_WORKERS, parse_workers_per_job
+from config import get_gemini_api_key
+from lazy_imports import IMPORT_TIMES, startup_report
+
+# Scraper, Gemini and newspaper3k modules are imported by the job workers, or on first
+# use here, never before the first paint
+MODULES_IMPORTED = time.perf_counter()
+
+# `streamlit run app.py -- --profile-startup` shows the import and first-render cost
+PROFILE_STARTUP = '--profile-startup' in sys.argv[1:] or os.getenv('NEWS_ANALYZER_PROFILE_STARTUP') == '1'
+
+# Live results table of a running job: rows shown, and seconds between refreshes
+LIVE_PREVIEW_ROWS = 200
+POLL_SECONDS = 2.0
 
 class NewsAnalyzerApp:
     def __init__(self):
-        self.scraper = NewsScraper()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.journalist_detector = JournalistDetector()
-        self.summarizer = ArticleSummarizer()
-        self.topic_modeller = TopicModeller() # --- BARU ---
-    
-        # Set API key from config
-        if GEMINI_API_KEY and GEMINI_API_KEY != "YOUR_GEMINI_API_KEY_HERE":
-            self.sentiment_analyzer.set_api_key(GEMINI_API_KEY)
-            self.summarizer.set_api_key(GEMINI_API_KEY)
-            self.topic_modeller.set_api_key(GEMINI_API_KEY) # --- BARU ---
+        # Shared per server process (resources), so reruns and new sessions reuse them
+        self.jobs = get_job_runner()
     
     def setup_page(self):
         st.set_page_config(
@@ -44,7 +52,7 @@ class NewsAnalyzerApp:
     
         # Show scraper info
         try:
-            stats = self.scraper.get_user_agent_stats()
+            stats = get_user_agent_stats()
             st.info(f"🔄 Scraper ready: {stats['total']} User-Agents (Bots: {stats['bots']}, Browsers: {stats['browsers']}) | Bahasa: Indonesia Priority")
         except:
             st.info("🔄 Menggunakan Newspaper3k + BeautifulSoup dengan multiple User-Agents dan prioritas Bahasa Indonesia")
@@ -86,10 +94,63 @@ class NewsAnalyzerApp:
             help="Menentukan topik artikel menggunakan AI"
         )
     
+        # Satu panggilan AI untuk semua fungsi AI yang aktif
+        ai_feature_count = sum([enable_sentiment, enable_summarize, enable_topic])
+        combine_ai_calls = False
+        if ai_feature_count >= 2:
+            combine_ai_calls = st.sidebar.checkbox(
+                "⚡ Gabungkan Analisis AI",
+                value=True,
+                help="Sentimen, ringkasan dan topik diminta dalam satu panggilan AI per artikel (lebih cepat dan hemat token)"
+            )
+    
+        use_llm_cache = True
+        if ai_feature_count >= 1:
+            use_llm_cache = st.sidebar.checkbox(
+                "🧠 Cache Hasil AI",
+                value=True,
+                help="Artikel dan konfigurasi yang sama tidak dikirim ulang ke AI (hasil disimpan di disk)"
+            )
+    
+        group_duplicates = False
+        duplicate_threshold = 0.7
+        if ai_feature_count >= 1:
+            group_duplicates = st.sidebar.checkbox(
+                "🔁 Gabungkan Artikel Duplikat",
+                value=True,
+                help="Berita yang sama dari beberapa media (sindikasi) dianalisis AI sekali; hasilnya disalin ke semua salinannya"
+            )
+            duplicate_threshold = st.sidebar.slider(
+                "Ambang Kemiripan Duplikat",
+                min_value=0.5, max_value=0.95, value=0.7, step=0.05,
+                disabled=not group_duplicates,
+                help="Perkiraan kemiripan teks (Jaccard) minimal agar dua artikel dianggap salinan"
+            )
+    
+        gemini_quota = {}
+        if ai_feature_count >= 1:
+            with st.sidebar.expander("⚙️ Kuota Gemini"):
+                gemini_quota = {
+                    'max_concurrency': st.number_input(
+                        "Request Paralel", min_value=1, max_value=64, value=8,
+                        help="Jumlah request AI yang berjalan bersamaan"
+                    ),
+                    'requests_per_minute': st.number_input(
+                        "Request per Menit (RPM)", min_value=1, max_value=10000, value=60,
+                        help="Sesuaikan dengan kuota API key Anda"
+                    ),
+                    'tokens_per_minute': st.number_input(
+                        "Token per Menit (TPM)", min_value=1000, max_value=10_000_000, value=1_000_000, step=10000,
+                        help="Perkiraan token input + output per menit"
+                    )
+                }
+    
         st.sidebar.markdown("---")
     
         # Conditional configurations
         sentiment_context = None
+        sentiment_local_first = True
+        sentiment_local_threshold = 0.75
         summarize_config = {}
         topic_config = {} # --- BARU ---
     
@@ -114,9 +175,39 @@ class NewsAnalyzerApp:
                     help="Masukkan daftar topik yang bisa dipilih."
                 )
                 topic_config['user_topics'] = [topic.strip() for topic in user_topics_input.split(',') if topic.strip()]
+                topic_keywords_input = st.sidebar.text_area(
+                    "Kata Kunci Topik (Opsional)",
+                    placeholder="Satu topik per baris, contoh:\nOtomotif: mobil, motor, dealer\nEkonomi: inflasi, harga",
+                    help="Menambah kata kunci bawaan untuk klasifikasi lokal"
+                )
+                from topic_modeller import parse_topic_keywords # numpy, only once topics are enabled
+                topic_config['topic_keywords'] = parse_topic_keywords(topic_keywords_input)
+                topic_config['local_first'] = st.sidebar.checkbox(
+                    "⚡ Klasifikasi Lokal Dulu",
+                    value=True,
+                    help="Artikel yang jelas cocok dengan satu topik diberi label tanpa AI; sisanya dikirim ke Gemini"
+                )
+                topic_config['local_margin'] = st.sidebar.slider(
+                    "Margin Keyakinan Lokal",
+                    min_value=0.05, max_value=0.5, value=0.15, step=0.05,
+                    disabled=not topic_config['local_first'],
+                    help="Selisih kemiripan minimal antara topik terbaik dan topik kedua"
+                )
             else:
                 topic_config['user_topics'] = []
     
+            topic_config['batch'] = st.sidebar.checkbox(
+                "📦 Batch Topik",
+                value=True,
+                help="Beberapa artikel dikirim dalam satu prompt; artikel yang gagal di-parse diulang satu per satu"
+            )
+            if topic_config['batch']:
+                topic_config['batch_token_budget'] = st.sidebar.slider(
+                    "Budget Token per Batch",
+                    min_value=2000, max_value=30000, value=8000, step=1000,
+                    help="Perkiraan jumlah token artikel yang dimasukkan dalam satu prompt"
+                )
+    
         # Sentiment Configuration (only show if enabled)
         if enable_sentiment:
             st.sidebar.subheader("😊 Konfigurasi Sentimen")
@@ -125,6 +216,17 @@ class NewsAnalyzerApp:
                 placeholder="Contoh: Toyota Avanza, harga mobil, kualitas produk",
                 help="Masukkan objek/aspek untuk analisis sentimen"
             )
+            sentiment_local_first = st.sidebar.checkbox(
+                "⚡ Tahap Lokal Dulu",
+                value=True,
+                help="Artikel yang tidak menyebut konteks atau sentimennya jelas diputuskan tanpa AI; sisanya dikirim ke Gemini"
+            )
+            sentiment_local_threshold = st.sidebar.slider(
+                "Ambang Keyakinan Lokal",
+                min_value=0.5, max_value=1.0, value=0.75, step=0.05,
+                disabled=not sentiment_local_first,
+                help="Semakin tinggi, semakin banyak artikel yang tetap dikirim ke Gemini"
+            )
     
         # Summarize Configuration (only show if enabled)
         if enable_summarize:
@@ -166,8 +268,60 @@ class NewsAnalyzerApp:
                 "Timeout (detik)", min_value=10, max_value=60, value=30,
                 help="Waktu tunggu maksimal untuk setiap URL"
             )
+            fetch_concurrency = st.sidebar.slider(
+                "URL Paralel", min_value=1, max_value=64, value=16,
+                help="Jumlah URL yang diambil secara bersamaan"
+            )
+            domain_interval = st.sidebar.slider(
+                "Jeda per Domain (detik)", min_value=0.0, max_value=5.0, value=1.0, step=0.25,
+                help="Jarak minimal antar request ke situs yang sama. Situs berbeda tetap diambil paralel. "
+                     f"Setiap job memakai jeda ini dikali {JOB_WORKERS} (jumlah job yang bisa berjalan bersamaan), "
+                     "agar total request ke satu situs tetap dalam batas"
+            )
+            domain_overrides = DomainScheduler.parse_overrides(st.sidebar.text_input(
+                "Jeda Khusus Domain (Opsional)",
+                placeholder="Contoh: detik.com=2, kompas.com=0.5",
+                help="Jeda berbeda untuk domain tertentu (detik)"
+            ))
+            host_pool_sizes = HttpTransport.parse_pool_sizes(st.sidebar.text_input(
+                "Koneksi per Host (Opsional)",
+                placeholder="Contoh: news.detik.com=16, www.kompas.com=12",
+                help="Jumlah koneksi keep-alive yang disimpan untuk host tertentu (default 8 per host)"
+            ))
+            use_http_cache = st.sidebar.checkbox(
+                "💾 Cache Halaman", value=True,
+                help="Simpan halaman yang sudah diunduh agar upload berikutnya tidak mengunduh ulang"
+            )
+            cache_ttl_hours = st.sidebar.slider(
+                "Masa Berlaku Cache (jam)", min_value=1, max_value=168, value=24,
+                disabled=not use_http_cache,
+                help="Setelah lewat, halaman dicek ulang ke server (ETag / Last-Modified)"
+            )
+            parse_workers = st.sidebar.slider(
+                "Proses Parsing per Job (CPU)", min_value=0, max_value=max(parse_workers_per_job(), 1),
+                value=parse_workers_per_job(),
+                help="Parsing HTML dikerjakan di beberapa proses agar semua core CPU terpakai (0 = di proses job). "
+                     "Core dibagi rata antar job yang berjalan bersamaan"
+            )
+            max_body_mb = st.sidebar.slider(
+                "Batas Ukuran Halaman (MB)", min_value=1, max_value=50, value=5,
+                help="Download dihentikan jika halaman lebih besar dari ini (halaman tidak wajar)"
+            )
+            use_extraction_profiles = st.sidebar.checkbox(
+                "🧭 Profil Ekstraksi per Situs", value=True,
+                help="Ingat metode ekstraksi yang berhasil untuk tiap situs dan coba itu dulu; pencarian penuh hanya jika hasilnya buruk"
+            )
         else:
             scraping_timeout = 30
+            fetch_concurrency = 16
+            domain_interval = 1.0
+            domain_overrides = {}
+            host_pool_sizes = {}
+            use_http_cache = True
+            cache_ttl_hours = 24
+            use_extraction_profiles = True
+            max_body_mb = 5
+            parse_workers = parse_workers_per_job()
     
         return {
             'enable_scraping': enable_scraping,
@@ -175,10 +329,26 @@ class NewsAnalyzerApp:
             'enable_journalist': enable_journalist,
             'enable_summarize': enable_summarize,
             'enable_topic': enable_topic, # --- BARU ---
+            'combine_ai_calls': combine_ai_calls,
+            'use_llm_cache': use_llm_cache,
+            'group_duplicates': group_duplicates,
+            'duplicate_threshold': duplicate_threshold,
+            'gemini_quota': gemini_quota,
             'sentiment_context': sentiment_context,
+            'sentiment_local_first': sentiment_local_first,
+            'sentiment_local_threshold': sentiment_local_threshold,
             'summarize_config': summarize_config,
             'topic_config': topic_config, # --- BARU ---
-            'scraping_timeout': scraping_timeout
+            'scraping_timeout': scraping_timeout,
+            'fetch_concurrency': fetch_concurrency,
+            'domain_interval': domain_interval,
+            'domain_overrides': domain_overrides,
+            'host_pool_sizes': host_pool_sizes,
+            'use_http_cache': use_http_cache,
+            'cache_ttl_hours': cache_ttl_hours,
+            'use_extraction_profiles': use_extraction_profiles,
+            'max_body_mb': max_body_mb,
+            'parse_workers': parse_workers
         }
     
     def get_column_mapping(self, df: pd.DataFrame, input_method: str):
@@ -208,197 +378,149 @@ class NewsAnalyzerApp:
             'snippet_column': snippet_column if snippet_column != "Tidak Ada" else None
         }
     
-    def process_urls_manual(self, urls: List[str], config: Dict) -> List[Dict]:
-        """Process manual URL input"""
-        results = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    def submit_job(self, input_method: str, urls: List[str], df: Optional[pd.DataFrame], column_mapping: Dict,
+                   config: Dict, run_id: str, label: str) -> str:
+        """Hand the run to a background worker; the page only polls the run store from here on"""
+        if input_method == "URL Manual":
+            kind, payload = 'urls', {'urls': urls}
+        else:
+            kind, payload = 'records', {'records': df.to_dict('records'), 'column_mapping': column_mapping}
+        return self.jobs.submit(run_id, kind, payload, config, api_key=get_gemini_api_key(), label=label)
+    
+    def display_jobs(self):
+        """Every job of this server: status, progress and a button to show its results"""
+        jobs = self.jobs.jobs()
+        if not jobs:
+            return
+        with st.expander(f"🗂️ Daftar Job ({len(jobs)})", expanded=False):
+            for job in jobs:
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    st.text(f"{job['label'] or job['run_id']} — {job['status']} ({job['done']}/{job['total']} baris)")
+                with col2:
+                    if st.button("Lihat", key=f"show_job_{job['run_id']}"):
+                        st.session_state['active_run'] = job['run_id']
+    
+    def display_job_progress(self, store: RunStore, info: Dict):
+        """Progress of a queued or running job and a live table of its latest rows"""
+        total = info['total'] or 0
+        progress = info['progress']
+        st.progress(min(info['done'] / total, 1.0) if total else 0.0)
+        if info['status'] == 'queued':
+            st.text("Menunggu worker...")
+        elif progress.get('status'):
+            st.text(progress['status'])
+        elif progress:
+            st.text(
+                f"Selesai {info['done']}/{total} | Diambil {progress['fetched'] + progress.get('resumed', 0)}/{total} | "
+                f"Antrian AI: {progress['queued']} menunggu, {progress['in_flight']} berjalan"
+            )
+        if st.button("⏹️ Hentikan Job", key=f"cancel_job_{info['run_id']}"):
+            self.jobs.cancel(info['run_id'])
+            st.rerun()
+        if info['done']:
+            st.caption(f"⏳ {info['done']} baris selesai (menampilkan {LIVE_PREVIEW_ROWS} terbaru)")
+            st.dataframe(store.latest(LIVE_PREVIEW_ROWS))
+    
+    def display_run(self, run_id: str) -> bool:
+        """Results of a run from the store; returns True while its job is still going"""
+        info = self.jobs.status(run_id)
+        if info is None:
+            return False
+        config = info['meta'].get('config', {})
+        is_excel_data = info['meta'].get('kind') == 'records'
+        st.header("📊 Hasil Analisis")
+        if info['meta'].get('label'):
+            st.caption(info['meta']['label'])
+    
+        store = RunStore(run_id)
+        try:
+            if info['status'] in ('queued', 'running'):
+                self.display_job_progress(store, info)
+                return True
+            if info['status'] == 'failed':
+                st.error(f"❌ Job gagal: {info['error']}")
+            elif info['status'] in ('cancelled', 'interrupted'):
+                st.warning(
+                    f"⚠️ Job berhenti setelah {info['done']}/{info['total']} baris. "
+                    "Mulai Analisis dengan input dan konfigurasi yang sama melanjutkan dari baris yang belum selesai."
+                )
+            self.display_results(store, config, is_excel_data=is_excel_data,
+                                 stats=info['stats'] if info['status'] == 'done' else None)
+            return False
+        finally:
+            store.close()
+    
+    def _display_run_stats(self, stats: Dict, config: Dict):
+        """Cache, tier and quota counters of a finished run (NewsPipeline.get_stats)"""
+        if stats.get('http_cache'):
+            cache_stats = stats['http_cache']
+            st.info(
+                f"💾 **Cache Halaman:** {cache_stats['hits']} hit | {cache_stats['revalidated']} revalidasi (304) | "
+                f"{cache_stats['misses']} miss | {cache_stats['entries']} halaman tersimpan "
+                f"({cache_stats['bytes'] / 1024 / 1024:.1f} MB)"
+            )
     
-        for i, url in enumerate(urls):
-            status_text.text(f"Memproses URL {i+1}/{len(urls)}: {url[:50]}...")
+        if stats.get('profiles'):
+            profile_stats = stats['profiles']
+            st.info(
+                f"🧭 **Profil Ekstraksi:** {profile_stats['hits']} halaman lewat jalur tersimpan | "
+                f"{profile_stats['misses']} pencarian ulang | {profile_stats['learned']} profil baru | "
+                f"{profile_stats['domains']} situs dikenal"
+            )
     
-            try:
-                result = {'URL': url}
-                content = ""
+        if stats.get('llm_cache'):
+            llm_stats = stats['llm_cache']
+            st.info(
+                f"🧠 **Cache AI:** {llm_stats['hits']} hit | {llm_stats['misses']} miss "
+                f"({llm_stats['hit_rate']:.0%} hit rate) | {llm_stats['entries']} jawaban tersimpan"
+            )
     
-                title = self.scraper.get_title_newspaper3k(url)
-                result['Title'] = title if title else 'Gagal mengambil judul'
-                if config['enable_scraping']:
-                    article_data = self.scraper.scrape_article_sync(
-                        url, timeout=config['scraping_timeout']
-                    )
-                    if article_data:
-                        result['Content'] = article_data.get('content', '')
-                        result['Scraping_Method'] = article_data.get('method', 'unknown')
-                        content = article_data.get('content', '')
-                    else:
-                        result['Content'] = 'Gagal scraping'
-                        result['Scraping_Method'] = 'failed'
-                        content = ''
-                else:
-                    try:
-                        article_data = self.scraper.scrape_article_sync(url, basic_only=True)
-                        content = article_data.get('content', '') if article_data else ''
-                    except:
-                        content = ''
-    
-                analysis_text = content
-    
-                # 2. Journalist Detection
-                if config['enable_journalist']:
-                    if analysis_text:
-                        result['Journalist'] = self.journalist_detector.detect_journalist(url, analysis_text)
-                    else:
-                        result['Journalist'] = 'Tidak ada konten'
-    
-                # 3. Sentiment Analysis
-                if config['enable_sentiment'] and config['sentiment_context']:
-                    if analysis_text and len(analysis_text.strip()) > 5:
-                        sentiment = self.sentiment_analyzer.analyze_sentiment(
-                            analysis_text, config['sentiment_context']
-                        )
-                        if sentiment:
-                            result.update({
-                                'Sentiment': sentiment.get('sentiment', 'Gagal'),
-                                'Confidence': sentiment.get('confidence', ''),
-                                'Reasoning': sentiment.get('reasoning', '')
-                            })
-                        else:
-                             result.update({'Sentiment': 'Gagal Analisis AI'})
-                    else:
-                        result.update({'Sentiment': 'Konten tidak cukup'})
-    
-                # 4. Summarize
-                if config['enable_summarize']:
-                    if analysis_text and len(analysis_text.strip()) > 50:
-                        summary = self.summarizer.summarize_article(
-                            analysis_text, config['summarize_config']
-                        )
-                        result['Summary'] = summary.get('summary', 'Gagal summarize') if summary else 'Gagal summarize'
-                    else:
-                        result['Summary'] = 'Konten terlalu pendek'
-    
-                # 5. Topic Modelling --- BARU ---
-                if config['enable_topic']:
-                    if analysis_text and len(analysis_text.strip()) > 50:
-                        topic = self.topic_modeller.determine_topic(
-                            analysis_text, config['topic_config']
-                        )
-                        result['Topic'] = topic
-                    else:
-                        result['Topic'] = 'Konten terlalu pendek'
-    
-            except Exception as e:
-                result = {'URL': url, 'Title': f'Error: {str(e)}'}
-                status_text.text(f"❌ Error: {url[:30]}... - {str(e)[:50]}...")
-    
-            results.append(result)
-            progress_bar.progress((i + 1) / len(urls))
-    
-        status_text.text("Selesai!")
-        return results
-    
-    def process_excel_data(self, df: pd.DataFrame, column_mapping: Dict, config: Dict) -> pd.DataFrame:
-        """Process Excel file data"""
-        results = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-    
-        total_rows = len(df)
-    
-        for i, row in df.iterrows():
-            status_text.text(f"Menganalisis baris {i+1}/{total_rows}...")
-    
-            result = row.to_dict()
-    
-            url = row.get(column_mapping['url_column'], '')
-            snippet = ""
-            content = ""
-            if column_mapping['snippet_column']:
-                snippet = str(row.get(column_mapping['snippet_column'], ''))
-                if snippet == 'nan': snippet = ""
-            if url:
-                title = self.scraper.get_title_newspaper3k(url)
-                if title: result['Title_New'] = title
-            if config['enable_scraping'] and url:
-                try:
-                    article_data = self.scraper.scrape_article_sync(
-                        url, timeout=config['scraping_timeout']
-                    )
-                    if article_data:
-                        result['Content_New'] = article_data.get('content', '')
-                        result['Scraping_Method_New'] = article_data.get('method', 'unknown')
-                        content = article_data.get('content', '')
-                    else:
-                        result['Content_New'] = 'Gagal scraping'
-                        result['Scraping_Method_New'] = 'failed'
-                except Exception as e:
-                    result['Content_New'] = f'Error scraping: {str(e)}'
-                    result['Scraping_Method_New'] = 'error'
-    
-            analysis_text = content if content and len(content.strip()) > 10 else snippet
-    
-            # 2. Journalist Detection
-            if config['enable_journalist']:
-                if analysis_text:
-                    result['Journalist_New'] = self.journalist_detector.detect_journalist(url, analysis_text)
-                else:
-                    result['Journalist_New'] = 'Tidak ada konten'
-    
-            # 3. Sentiment Analysis
-            if config['enable_sentiment'] and config['sentiment_context']:
-                if analysis_text and len(analysis_text.strip()) > 5:
-                    sentiment = self.sentiment_analyzer.analyze_sentiment(
-                        analysis_text, config['sentiment_context']
-                    )
-                    if sentiment:
-                        result.update({
-                            'Sentiment_New': sentiment.get('sentiment', 'Gagal'),
-                            'Confidence_New': sentiment.get('confidence', ''),
-                            'Reasoning_New': sentiment.get('reasoning', '')
-                        })
-                    else:
-                        result.update({'Sentiment_New': 'Gagal Analisis AI'})
-                else:
-                    result.update({'Sentiment_New': 'Konten tidak cukup'})
-    
-            # 4. Summarize
-            if config['enable_summarize']:
-                if analysis_text and len(analysis_text.strip()) > 50:
-                    summary = self.summarizer.summarize_article(
-                        analysis_text, config['summarize_config']
-                    )
-                    result['Summary_New'] = summary.get('summary', 'Gagal summarize') if summary else 'Gagal summarize'
-                else:
-                    result['Summary_New'] = 'Konten terlalu pendek'
-    
-            # 5. Topic Modelling --- BARU ---
-            if config['enable_topic']:
-                if analysis_text and len(analysis_text.strip()) > 50:
-                    topic = self.topic_modeller.determine_topic(
-                        analysis_text, config['topic_config']
-                    )
-                    result['Topic_New'] = topic
-                else:
-                    result['Topic_New'] = 'Konten terlalu pendek'
+        if stats.get('sentiment_tiers'):
+            tiers = stats['sentiment_tiers']
+            st.info(
+                f"😊 **Tahap Sentimen:** {tiers['tidak_terkait']} tidak terkait (lokal) | "
+                f"{tiers['lokal']} diputuskan lokal | {tiers['gemini']} dikirim ke Gemini"
+            )
+    
+        url_stats = stats.get('urls') or {}
+        if url_stats.get('skipped'):
+            st.info(
+                f"🔗 **URL:** {url_stats['fetched']} artikel unik diunduh | "
+                f"{url_stats['skipped']} unduhan dan analisis AI dilewati (varian URL artikel yang sama)"
+            )
+    
+        if stats.get('duplicates'):
+            st.info(
+                f"🔁 **Duplikat:** {stats['duplicates']['groups']} grup berita yang sama | "
+                f"{stats['duplicates']['copies']} salinan memakai hasil AI grupnya (analisis AI dilewati)"
+            )
     
-            results.append(result)
-            progress_bar.progress((i + 1) / total_rows)
+        topic_cfg = config.get('topic_config', {})
+        if stats.get('topic_tiers') and topic_cfg.get('mode') in ["Ditentukan User", "Hybrid"]:
+            topic_tiers = stats['topic_tiers']
+            st.info(
+                f"📊 **Tahap Topik:** {topic_tiers['lokal']} diputuskan lokal | "
+                f"{topic_tiers['gemini']} dikirim ke Gemini"
+            )
     
-        status_text.text("Analisis selesai!")
-        return pd.DataFrame(results)
+        if stats.get('gemini'):
+            dispatch_stats = stats['gemini']
+            st.info(
+                f"⚙️ **Gemini:** {dispatch_stats['requests']} request | {dispatch_stats['retries']} retry | "
+                f"{dispatch_stats['failed']} gagal | tertahan kuota {dispatch_stats['throttled_seconds']:.0f} detik"
+            )
     
-    def display_results(self, results, config: Dict, is_excel_data: bool = False):
-        if isinstance(results, pd.DataFrame):
-            df = results
+    def display_results(self, store: RunStore, config: Dict, is_excel_data: bool = False, stats: Optional[Dict] = None):
+        if not store.count():
+            st.warning("Tidak ada hasil untuk ditampilkan.")
+            return
+        df = store.to_dataframe()
+        if is_excel_data:
             success_count = len(df)
         else:
-            if not results:
-                st.warning("Tidak ada hasil untuk ditampilkan.")
-                return
-            df = pd.DataFrame(results)
             # Assuming 'Content' column exists for manual URL processing
-            success_count = len([r for r in results if r.get('Content', '') != '' or r.get('Content_New', '') != ''])
+            success_count = int((df['Content'].fillna('') != '').sum()) if 'Content' in df else 0
     
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -412,6 +534,9 @@ class NewsAnalyzerApp:
     
         st.info(f"📊 **Metode Scraping:** {'Diaktifkan' if config.get('enable_scraping') else 'Dinonaktifkan'}")
     
+        if stats:
+            self._display_run_stats(stats, config)
+    
         enabled_features = []
         if config.get('enable_scraping'): enabled_features.append("📄 Full Teks")
         if config.get('enable_topic'): enabled_features.append("📊 Topik") # --- BARU ---
@@ -454,7 +579,7 @@ class NewsAnalyzerApp:
         ]):
             warnings.append("⚠️ Pilih minimal satu fungsi untuk digunakan")
     
-        if not GEMINI_API_KEY and any([
+        if not get_gemini_api_key() and any([
             config['enable_sentiment'], config['enable_summarize'], config['enable_topic']
         ]):
             features = []
@@ -478,9 +603,31 @@ class NewsAnalyzerApp:
     
         return warnings
     
+    def display_startup_profile(self):
+        """Import cost per heavy module and time to the first render of this script run"""
+        rendered = time.perf_counter()
+        rows = [
+            {
+                'Modul': item['module'],
+                'Status': ('dimuat (lazy)' if item['seconds'] is not None else 'dimuat') if item['loaded'] else 'belum dimuat',
+                'Impor (detik)': round(item['seconds'], 3) if item['seconds'] is not None else None,
+            }
+            for item in startup_report()
+        ]
+        imports = MODULES_IMPORTED - SCRIPT_STARTED
+        render = rendered - SCRIPT_STARTED
+        print(f"⏱️ Startup: impor modul {imports:.3f}s, render awal {render:.3f}s | lazy: {IMPORT_TIMES}")
+        with st.sidebar.expander("⏱️ Startup Profile", expanded=True):
+            st.metric("Render awal", f"{render:.2f} s", help="Sejak skrip mulai sampai sidebar selesai dirender")
+            st.caption(f"Impor modul aplikasi: {imports:.3f} s")
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+            st.caption("Biaya impor cold per modul: `python lazy_imports.py --profile-startup`")
+
     def run(self):
       self.setup_page()
       config = self.setup_sidebar()
+      if PROFILE_STARTUP:
+          self.display_startup_profile()
     
       # Main content area
       st.header("📝 Input Data")
@@ -540,7 +687,27 @@ class NewsAnalyzerApp:
               st.warning(warning)
     
       # Process button
-      can_process = not warnings
+      can_process = not warnings and (input_method == "URL Manual" or df is not None)
+    
+      # Hasil disimpan per run (input + konfigurasi): rerun, refresh atau restart tidak menghitung ulang
+      store = None
+      restart = False
+      if can_process:
+          if input_method == "URL Manual":
+              run_input, total_rows, label = {'urls': urls}, len(urls), f"{len(urls)} URL manual"
+          else:
+              run_input = {'file': hashlib.sha256(uploaded_file.getvalue()).hexdigest(), 'columns': column_mapping}
+              total_rows, label = len(df), f"{uploaded_file.name} ({len(df)} baris)"
+          store = RunStore(RunStore.make_run_id(run_input, config))
+          finished_rows = store.count()
+          if store.is_complete():
+              st.info(f"💾 Hasil untuk input dan konfigurasi ini sudah tersimpan ({finished_rows} baris)")
+              restart = st.checkbox("🔄 Proses ulang dari awal", value=False)
+          elif finished_rows and not self.jobs.is_active(store.run_id):
+              st.info(
+                  f"♻️ Run sebelumnya terhenti setelah {finished_rows}/{total_rows} baris. "
+                  "Mulai Analisis melanjutkan dari baris yang belum selesai."
+              )
     
       if st.button(
           "🚀 Mulai Analisis",
@@ -548,15 +715,22 @@ class NewsAnalyzerApp:
           use_container_width=True,
           type="primary"
       ):
-          st.header("📊 Hasil Analisis")
-    
-          with st.spinner("Memproses data... Mohon tunggu"):
-              if input_method == "URL Manual":
-                  results = self.process_urls_manual(urls, config)
-                  self.display_results(results, config, is_excel_data=False)
-              else:
-                  results = self.process_excel_data(df, column_mapping, config)
-                  self.display_results(results, config, is_excel_data=True)
+          if restart:
+              store.clear()
+          if not store.is_complete():
+              self.submit_job(input_method, urls, df, column_mapping, config, store.run_id, label)
+          st.session_state['active_run'] = store.run_id
+    
+      if store is not None:
+          store.close()
+    
+      self.display_jobs()
+    
+      # Job berjalan di proses worker; halaman hanya membaca run store dan memperbarui diri
+      active_run = st.session_state.get('active_run')
+      if active_run and self.display_run(active_run):
+          time.sleep(POLL_SECONDS)
+          st.rerun()
 if __name__ == "__main__":
     app = NewsAnalyzerApp()
-app.run()
+    app.run()
@@ -0,0 +1,154 @@
+"""
+Benchmark: single-pass ContentExtractor vs the old 25-selector BeautifulSoup loop.
+
+    python benchmark_extractor.py                 # synthetic Indonesian news pages
+    python benchmark_extractor.py URL [URL ...]   # real pages (newspaper3k text as reference)
+
+Reports time per page and word recall / precision against the reference text.
+"""
+
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from content_extractor import ContentExtractor
+
+LEGACY_SELECTORS = [
+    'article', '[role="main"] article', '.article-content', '.post-content', '.entry-content',
+    '.article-body', '.post-body', '.content-body', '.detail-content', '.news-content',
+    '[class*="article-content"]', '[class*="post-content"]', '[class*="entry-content"]',
+    '[class*="detail-content"]', '[class*="news-content"]', '.content', '[class*="content"]',
+    'main article', 'main .content', '.text', 'main', '.container article', '.wrapper article'
+]
+
+def legacy_extract(html: str) -> str:
+    """The previous NewsScraper._extract_article_data + _extract_content, without the prints"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for name in ['script', 'style', 'nav', 'header', 'footer', 'sidebar', 'advertisement', 'ads', 'menu',
+                 'noscript', 'iframe', 'form', 'button']:
+        for element in soup.find_all(name):
+            element.decompose()
+    for selector in ['.ad', '.ads', '.advertisement', '.social-share', '.related-posts', '.comments',
+                     '.comment-section', '.sidebar', '.navigation', '.nav', '.menu', '#comments', '#sidebar',
+                     '#navigation']:
+        for element in soup.select(selector):
+            element.decompose()
+
+    best_content = ""
+    for selector in LEGACY_SELECTORS:
+        for element in soup.select(selector):
+            for unwanted in element.select('''
+                script, style, .ad, .ads, .advertisement, .social-share, .related-posts, .comments,
+                .comment-section, nav, header, footer, .breadcrumb, .tags, .category, .meta,
+                .share-buttons, .social-buttons
+            '''):
+                unwanted.decompose()
+            text = element.get_text(separator=' ', strip=True)
+            if len(text) > len(best_content) and len(text) > 200:
+                best_content = text
+
+    if len(best_content) < 200:
+        paragraph_texts = [
+            p.get_text(strip=True) for p in soup.find_all('p')
+            if len(p.get_text(strip=True)) > 30 and not any(
+                skip in p.get_text(strip=True).lower()
+                for skip in ['copyright', 'baca juga', 'lihat juga', 'follow', 'subscribe']
+            )
+        ]
+        best_content = ' '.join(paragraph_texts)
+
+    best_content = re.sub(r'\s+', ' ', best_content)
+    for artifact in [r'Baca juga:.*?(?=\w)', r'Lihat juga:.*?(?=\w)', r'ADVERTISEMENT',
+                     r'CONTINUE READING BELOW', r'Loading...', r'Tunggu sebentar...']:
+        best_content = re.sub(artifact, '', best_content, flags=re.IGNORECASE)
+    return best_content.strip()
+
+WORDS = ('pemerintah harga mobil listrik jakarta menteri ekonomi rupiah investasi pasar warga kota proyek '
+         'pembangunan jalan tol banjir polisi kasus sidang pengadilan pemain laga liga pelatih sekolah siswa').split()
+
+def synthetic_page(rng: random.Random) -> Tuple[str, str]:
+    """A news page with the usual boilerplate; returns (html, article text)"""
+    paragraphs = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(25, 60))).capitalize() + '.'
+                  for _ in range(rng.randint(5, 15))]
+    links = ''.join(f'<li><a href="/berita/{i}">{" ".join(rng.choice(WORDS) for _ in range(8))}</a></li>'
+                    for i in range(rng.randint(20, 60)))
+    body_class = rng.choice(['detail__body-text itp_bodycontent', 'read__content', 'entry-content clearfix',
+                             'article-content-body__item-content', 'content_detail'])
+    inline_related = '<div class="baca-juga"><a href="/x">Baca juga: berita lain hari ini</a></div>'
+    body = ''.join(f'<p>{paragraph}</p>' + (inline_related if i == 2 else '') for i, paragraph in enumerate(paragraphs))
+    html = f"""<!DOCTYPE html><html><head><title>Berita</title>
+    <script>{'var x = 1;' * 200}</script><style>{'.a{{color:red}}' * 100}</style></head><body>
+    <header class="header"><nav class="navbar"><ul>{links[:2000]}</ul></nav></header>
+    <div class="container content-wrapper"><div class="row">
+      <div class="col-main"><h1>Judul berita</h1><div class="meta">Penulis | 1 Januari 2024</div>
+        <div class="{body_class}">{body}</div>
+        <div class="tags"><a href="/t/1">ekonomi</a> <a href="/t/2">mobil</a></div>
+        <div class="comments">{'<p>Komentar pembaca yang cukup panjang untuk dihitung sebagai paragraf.</p>' * 5}</div>
+      </div>
+      <div class="sidebar"><h3>Terpopuler</h3><ul>{links}</ul></div>
+    </div></div>
+    <footer class="footer"><p>Copyright 2024 Media Berita. All rights reserved. Hubungi kami.</p></footer>
+    </body></html>"""
+    return html, ' '.join(paragraphs)
+
+def overlap(output: str, reference: str) -> Tuple[float, float]:
+    """(recall, precision) of the output's words against the reference words"""
+    out_words = re.findall(r'\w+', output.lower())
+    ref_words = re.findall(r'\w+', reference.lower())
+    if not out_words or not ref_words:
+        return 0.0, 0.0
+    ref_counts: Dict[str, int] = {}
+    for word in ref_words:
+        ref_counts[word] = ref_counts.get(word, 0) + 1
+    common = 0
+    for word in out_words:
+        if ref_counts.get(word, 0) > 0:
+            ref_counts[word] -= 1
+            common += 1
+    return common / len(ref_words), common / len(out_words)
+
+def run(pages: List[Tuple[str, str]], extractors: Dict[str, Callable[[str], str]]):
+    for name, extract in extractors.items():
+        started = time.perf_counter()
+        scores = []
+        for html, reference in pages:
+            scores.append(overlap(extract(html), reference))
+        elapsed = (time.perf_counter() - started) / len(pages) * 1000
+        recall = sum(score[0] for score in scores) / len(scores)
+        precision = sum(score[1] for score in scores) / len(scores)
+        print(f"{name:>10}: {elapsed:7.2f} ms/halaman | recall {recall:.3f} | precision {precision:.3f}")
+
+def main():
+    extractor = ContentExtractor()
+    extractors = {
+        'lama': legacy_extract,
+        'baru': lambda html: extractor.extract(html)['content'],
+    }
+
+    if len(sys.argv) > 1:
+        from scraper import NewsScraper
+        scraper = NewsScraper()
+        scraper.enable_cache()
+        pages = []
+        for url in sys.argv[1:]:
+            document = scraper.fetch_document(url)
+            if document and document.article and document.article.text:
+                pages.append((document.html, document.article.text))
+            else:
+                print(f"⚠️ Dilewati (tidak ada teks referensi newspaper3k): {url}")
+        if not pages:
+            return
+        print(f"📊 {len(pages)} halaman asli, referensi = teks newspaper3k")
+    else:
+        rng = random.Random(42)
+        pages = [synthetic_page(rng) for _ in range(200)]
+        print(f"📊 {len(pages)} halaman sintetis, referensi = paragraf artikel")
+
+    run(pages, extractors)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Headless batch run of the scrape / analyze pipeline, without Streamlit.
+
+    python cli.py berita.xlsx --config config.yaml --output hasil.xlsx --workers 4
+    python cli.py urls.txt --output hasil.csv                  # one URL per line
+    python cli.py data.parquet --url-column Link --snippet-column Snippet -o hasil.parquet
+
+The config file (JSON or YAML) has the same keys as the app sidebar; missing keys
+take the sidebar defaults. Rows are sharded by site across the worker processes,
+so each site's politeness delay is kept by a single process. Every shard writes
+to the run store, so rerunning the same command after a crash or kill resumes
+instead of starting over (--fresh starts over). The Gemini API key is read from
+--api-key or the GEMINI_API_KEY environment variable.
+
+Near-duplicate grouping (group_duplicates) works per shard: syndicated copies of
+one story usually come from different outlets and so land in different shards,
+where they are analyzed separately. Use --workers 1 to group across the whole
+input. Duplicate_Group in the output is the 1-based input row of the group leader.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from domain_scheduler import DomainScheduler
+from http_transport import HttpTransport
+from job_runner import JobRunner
+from run_store import RunStore
+from url_canonicalizer import canonical_url
+
+# Sidebar defaults (app.setup_sidebar), for keys the config file leaves out
+DEFAULT_CONFIG = {
+    'enable_scraping': True,
+    'enable_sentiment': False,
+    'enable_journalist': False,
+    'enable_summarize': False,
+    'enable_topic': False,
+    'combine_ai_calls': True,
+    'use_llm_cache': True,
+    'group_duplicates': False,
+    'duplicate_threshold': 0.7,
+    'gemini_quota': {'max_concurrency': 8, 'requests_per_minute': 60, 'tokens_per_minute': 1_000_000},
+    'sentiment_context': '',
+    'sentiment_local_first': True,
+    'sentiment_local_threshold': 0.75,
+    'summarize_config': {
+        'summary_type': 'Ringkas', 'max_length': 150, 'language': 'Bahasa Indonesia', 'focus_aspect': ''
+    },
+    'topic_config': {
+        'mode': 'Ditentukan AI', 'user_topics': [], 'local_first': True, 'local_margin': 0.15,
+        'batch': True, 'batch_token_budget': 8000
+    },
+    'scraping_timeout': 30,
+    'fetch_concurrency': 16,
+    'domain_interval': 1.0,
+    'domain_overrides': {},
+    'host_pool_sizes': {},
+    'use_http_cache': True,
+    'cache_ttl_hours': 24,
+    'use_extraction_profiles': True,
+    'max_body_mb': 5,
+    # Shards are already one process each; a parse pool per shard would oversubscribe the cores
+    'parse_workers': 0,
+}
+
+URL_COLUMN_NAMES = ('URL', 'Url', 'url', 'Link', 'link')
+SNIPPET_COLUMN_NAMES = ('Snippet', 'snippet')
+PROGRESS_SECONDS = 5.0
+
+def load_config(path: Optional[str]) -> Dict:
+    """Sidebar defaults overlaid with the JSON/YAML file (nested dicts are merged)"""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if not path:
+        return config
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("❌ Config YAML membutuhkan PyYAML (pip install pyyaml), atau gunakan JSON")
+            overrides = yaml.safe_load(f) or {}
+        else:
+            overrides = json.load(f)
+
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            config[key].update(value)
+        else:
+            config[key] = value
+
+    # Same text formats as the sidebar inputs
+    if isinstance(config['domain_overrides'], str):
+        config['domain_overrides'] = DomainScheduler.parse_overrides(config['domain_overrides'])
+    if isinstance(config['host_pool_sizes'], str):
+        config['host_pool_sizes'] = HttpTransport.parse_pool_sizes(config['host_pool_sizes'])
+    topic_config = config['topic_config']
+    if isinstance(topic_config.get('user_topics'), str):
+        topic_config['user_topics'] = [topic.strip() for topic in topic_config['user_topics'].split(',') if topic.strip()]
+    if isinstance(topic_config.get('topic_keywords'), str):
+        from topic_modeller import parse_topic_keywords
+        topic_config['topic_keywords'] = parse_topic_keywords(topic_config['topic_keywords'])
+    return config
+
+def validate_config(config: Dict, api_key: Optional[str]) -> List[str]:
+    """Errors that make the run pointless (same checks as app.validate_configuration)"""
+    errors = []
+    if not any([config['enable_scraping'], config['enable_sentiment'], config['enable_journalist'],
+                config['enable_summarize'], config['enable_topic']]):
+        errors.append("Pilih minimal satu fungsi (enable_*) di config")
+    if not api_key and any([config['enable_sentiment'], config['enable_summarize'], config['enable_topic']]):
+        errors.append("GEMINI_API_KEY belum diset untuk fungsi AI")
+    if config['enable_sentiment'] and not config['sentiment_context']:
+        errors.append("sentiment_context diperlukan untuk analisis sentimen")
+    if config['enable_topic'] and config['topic_config'].get('mode') in ["Ditentukan User", "Hybrid"]:
+        if not config['topic_config'].get('user_topics'):
+            errors.append("topic_config.user_topics diperlukan untuk mode 'Ditentukan User' atau 'Hybrid'")
+    return errors
+
+def read_input(path: str) -> pd.DataFrame:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xls'):
+        return pd.read_excel(path)
+    if extension == '.csv':
+        return pd.read_csv(path)
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    if extension == '.txt':
+        with open(path, 'r', encoding='utf-8') as f:
+            return pd.DataFrame({'URL': [line.strip() for line in f if line.strip()]})
+    raise SystemExit(f"❌ Format input tidak didukung: {extension} (xlsx, xls, csv, parquet, txt)")
+
+def write_output(df: pd.DataFrame, path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        df.to_csv(path, index=False)
+    elif extension == '.parquet':
+        # Mixed-type result columns (numbers and error strings) as text
+        df.astype({column: str for column in df.columns if df[column].dtype == object}).to_parquet(path, index=False)
+    elif extension == '.xlsx':
+        df.to_excel(path, index=False)
+    elif extension == '.json':
+        df.to_json(path, orient='records', force_ascii=False)
+    else:
+        raise SystemExit(f"❌ Format output tidak didukung: {extension} (xlsx, csv, parquet, json)")
+
+def pick_column(df: pd.DataFrame, requested: Optional[str], candidates) -> Optional[str]:
+    if requested:
+        if requested not in df.columns:
+            raise SystemExit(f"❌ Kolom '{requested}' tidak ada di input ({', '.join(map(str, df.columns))})")
+        return requested
+    return next((name for name in candidates if name in df.columns), None)
+
+def shard_rows(urls: List[str], shards: int) -> List[List[int]]:
+    """Row indices per shard: all rows of one site (after URL canonicalization) go to the same shard"""
+    assignment: List[List[int]] = [[] for _ in range(shards)]
+    for i, url in enumerate(urls):
+        if url:
+            host = DomainScheduler.domain_of(canonical_url(url))
+            shard = zlib.crc32(host.encode('utf-8')) % shards
+        else:
+            shard = i % shards
+        assignment[shard].append(i)
+    return assignment
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="News Analyzer batch run tanpa Streamlit")
+    parser.add_argument('input', help="File input: .xlsx, .xls, .csv, .parquet, atau .txt (satu URL per baris)")
+    parser.add_argument('-c', '--config', help="Config JSON/YAML (kunci sama dengan sidebar)")
+    parser.add_argument('-o', '--output', help="File output: .xlsx, .csv, .parquet atau .json (default: <input>_hasil.xlsx)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="Jumlah proses worker (shard)")
+    parser.add_argument('--url-column', help="Kolom URL (default: URL / Link)")
+    parser.add_argument('--snippet-column', help="Kolom snippet (default: Snippet, jika ada)")
+    parser.add_argument('--api-key', default=os.getenv('GEMINI_API_KEY'), help="Gemini API key (default: env GEMINI_API_KEY)")
+    parser.add_argument('--fresh', action='store_true', help="Abaikan hasil tersimpan dan proses ulang dari awal")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    errors = validate_config(config, args.api_key)
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        return 2
+
+    df = read_input(args.input)
+    url_column = pick_column(df, args.url_column, URL_COLUMN_NAMES)
+    if url_column is None:
+        print(f"❌ Kolom URL tidak ditemukan; pilih dengan --url-column ({', '.join(map(str, df.columns))})")
+        return 2
+    column_mapping = {
+        'url_column': url_column,
+        'snippet_column': pick_column(df, args.snippet_column, SNIPPET_COLUMN_NAMES),
+    }
+    records = df.to_dict('records')
+    urls = ['' if pd.isna(record.get(url_column)) else str(record.get(url_column)).strip() for record in records]
+
+    shards = [rows for rows in shard_rows(urls, max(1, args.workers)) if rows]
+    with open(args.input, 'rb') as f:
+        input_hash = hashlib.sha256(f.read()).hexdigest()
+    base_id = RunStore.make_run_id({'file': input_hash, 'columns': column_mapping, 'shards': len(shards)}, config)
+    run_ids = [f"{base_id}-{number}" for number in range(len(shards))]
+    output = args.output or f"{os.path.splitext(args.input)[0]}_hasil.xlsx"
+
+    print(f"📰 {len(records)} baris, {len(shards)} shard | output: {output}")
+    if config.get('group_duplicates') and len(shards) > 1:
+        print("ℹ️ Grup duplikat hanya dibentuk di dalam satu shard (situs yang sama); --workers 1 untuk seluruh input")
+    runner = JobRunner(workers=len(shards))
+    try:
+        for number, (run_id, rows) in enumerate(zip(run_ids, shards)):
+            store = RunStore(run_id)
+            if args.fresh:
+                store.clear()
+            complete = store.is_complete()
+            store.close()
+            if complete:
+                print(f"💾 Shard {number + 1}: {len(rows)} baris sudah tersimpan")
+                continue
+            payload = {'records': [records[i] for i in rows], 'column_mapping': column_mapping}
+            runner.submit(run_id, 'records', payload, config, api_key=args.api_key,
+                          label=f"shard {number + 1}/{len(shards)}")
+
+        while any(runner.is_active(run_id) for run_id in run_ids):
+            time.sleep(PROGRESS_SECONDS)
+            done = sum(runner.status(run_id)['done'] for run_id in run_ids)
+            print(f"📊 {done}/{len(records)} baris selesai")
+    except KeyboardInterrupt:
+        print("⏹️ Dihentikan; jalankan perintah yang sama untuk melanjutkan")
+        for run_id in run_ids:
+            runner.cancel(run_id)
+        return 130
+    finally:
+        runner.close()
+
+    # Merge: shard rows are keyed by position in their shard
+    merged: Dict[int, Dict] = {}
+    failed = False
+    for run_id, rows in zip(run_ids, shards):
+        store = RunStore(run_id)
+        info = store.info()
+        if info['status'] != 'done':
+            failed = True
+            print(f"❌ {run_id}: {info['status']} {info['error'] or ''} ({info['done']}/{info['total']} baris)")
+        for local_index, row in store.iter_items():
+            group = row.get('Duplicate_Group')
+            if isinstance(group, int) and group > 0:
+                # Leader's row number within the shard -> row number in the input
+                row['Duplicate_Group'] = rows[group - 1] + 1
+            merged[rows[local_index]] = row
+        store.close()
+
+    write_output(pd.DataFrame([merged[i] for i in sorted(merged)]), output)
+    print(f"✅ {len(merged)}/{len(records)} baris ditulis ke {output}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
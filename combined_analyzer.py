@@ -0,0 +1,96 @@
+# combined_analyzer.py
+
+from typing import Dict, List
+import json
+import re
+
+from gemini_dispatcher import GeminiClient
+from passage_selector import TASK_TOKEN_BUDGETS, context_terms, select_passages
+
+class CombinedAnalyzer(GeminiClient):
+    """Satu panggilan Gemini untuk sentimen, ringkasan dan topik sekaligus.
+
+    Task instructions come from the single-task analyzers so both modes ask the
+    same question; any task missing from the JSON answer is left out of the result
+    so the caller can fall back to the single-task call for it.
+    """
+
+    def __init__(self, sentiment_analyzer, summarizer, topic_modeller):
+        super().__init__()
+        self.sentiment_analyzer = sentiment_analyzer
+        self.summarizer = summarizer
+        self.topic_modeller = topic_modeller
+
+    def analyze(self, content: str, tasks: List[str], config: Dict) -> Dict:
+        """Run every task in `tasks` ('sentiment', 'summary', 'topic') in one request.
+
+        Returns a dict with a key per task that was answered: 'sentiment' (dict like
+        SentimentAnalyzer), 'summary' (dict like ArticleSummarizer) and 'topic' (str).
+        """
+        if not self.model or not tasks:
+            return {}
+
+        try:
+            prompt = self._create_prompt(content, tasks, config)
+            response_text = self._generate(prompt)
+            return self._parse_response(response_text, tasks, config)
+        except Exception as e:
+            print(f"Error in combined analysis: {str(e)}")
+            return {}
+
+    def _create_prompt(self, content: str, tasks: List[str], config: Dict) -> str:
+        instructions = {
+            'sentiment': lambda: self.sentiment_analyzer.task_instruction(config['sentiment_context']),
+            'summary': lambda: self.summarizer.task_instruction(config.get('summarize_config', {})),
+            'topic': lambda: self.topic_modeller.task_instruction(config.get('topic_config', {})),
+        }
+        task_lines = "\n".join(
+            f'        - "{task}": {instructions[task]()}' for task in tasks
+        )
+        keys = ", ".join(f'"{task}"' for task in tasks)
+
+        # One passage selection for all tasks: the largest task budget, every task's terms
+        terms = context_terms(
+            config.get('sentiment_context') if 'sentiment' in tasks else '',
+            config.get('summarize_config', {}).get('focus_aspect', '') if 'summary' in tasks else '',
+            config.get('topic_config', {}).get('user_topics', []) if 'topic' in tasks else []
+        )
+        passages = select_passages(content, terms, max(TASK_TOKEN_BUDGETS[task] for task in tasks))
+
+        return f"""
+        Analisis artikel berita berikut dan kerjakan SEMUA tugas di bawah ini.
+
+        ARTIKEL:
+        {passages}
+
+        TUGAS (satu key JSON per tugas):
+{task_lines}
+
+        Berikan HANYA satu objek JSON dengan key {keys}, tanpa penjelasan atau format tambahan.
+        """
+
+    def _parse_response(self, response_text: str, tasks: List[str], config: Dict) -> Dict:
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if not json_match:
+            return {}
+        try:
+            data = json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return {}
+
+        results = {}
+        sentiment = data.get('sentiment')
+        if 'sentiment' in tasks and isinstance(sentiment, dict) and sentiment.get('sentiment'):
+            results['sentiment'] = sentiment
+
+        summary = data.get('summary')
+        if 'summary' in tasks and isinstance(summary, (str, list)) and summary:
+            if isinstance(summary, list):
+                summary = "\n".join(f"- {point}" for point in summary)
+            results['summary'] = self.summarizer._parse_summary_response(summary, config.get('summarize_config', {}))
+
+        topic = data.get('topic')
+        if 'topic' in tasks and isinstance(topic, str) and topic.strip():
+            results['topic'] = self.topic_modeller._parse_response(topic)
+
+        return results
@@ -1,12 +1,33 @@
 # config.py
-import streamlit as st
 import os
+import sys
 
-# Try to get API key from Streamlit secrets first, then environment variable, then default
-try:
- GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
-except:
- GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "YOUR_GEMINI_API_KEY_HERE")
+DEFAULT_GEMINI_API_KEY = "YOUR_GEMINI_API_KEY_HERE"
 
-# For development, you can still put your key directly here:
-# GEMINI_API_KEY = "your_actual_api_key_here"
+_gemini_api_key = None
+
+def get_gemini_api_key() -> str:
+ """Streamlit secrets first, then environment variable, then default.
+
+ Read on first use instead of at import time: st.secrets parses secrets.toml and
+ reports a missing file on the page, which must not happen before set_page_config.
+ Outside Streamlit (cli.py, job workers) secrets are not consulted at all.
+ """
+ global _gemini_api_key
+ if _gemini_api_key is None:
+  _gemini_api_key = os.getenv("GEMINI_API_KEY", DEFAULT_GEMINI_API_KEY)
+  if "streamlit" in sys.modules:
+   try:
+    _gemini_api_key = sys.modules["streamlit"].secrets["GEMINI_API_KEY"]
+   except Exception:
+    pass
+ return _gemini_api_key
+
+def __getattr__(name):
+ # `from config import GEMINI_API_KEY` keeps working, resolved when it is imported
+ if name == "GEMINI_API_KEY":
+  return get_gemini_api_key()
+ raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# For development, you can still put your key directly here (used when no secret/env var is set):
+# DEFAULT_GEMINI_API_KEY = "your_actual_api_key_here"
@@ -0,0 +1,207 @@
+# content_extractor.py
+
+import re
+from typing import Dict, Iterator, List, Optional, Set
+
+import lxml.html
+from lxml import etree
+
+# Never part of the article body
+JUNK_TAGS = {
+    'script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'iframe', 'form', 'button',
+    'select', 'input', 'textarea', 'template', 'svg', 'canvas', 'object', 'embed',
+}
+
+# Class/id tokens of boilerplate blocks (ads, share bars, "baca juga" boxes, comments, ...)
+JUNK_ATTRIBUTE = re.compile(
+    r'(?:^|[\s_-])(?:ads?|advert\w*|iklan|banner|promo|sponsor\w*|social|share\w*|sharing|related|rekomendasi|'
+    r'comments?|komentar|sidebar|navigation|nav|navbar|menu|breadcrumbs?|tags?|category|meta|newsletter|'
+    r'subscribe|popular|terpopuler|trending|widget|baca-?juga|bacajuga|footer|header)(?:$|[\s_-])',
+    re.IGNORECASE
+)
+
+# Class/id tokens of the usual article containers; their score gets a small boost
+CONTENT_HINT = re.compile(
+    r'(?:^|[\s_-])(?:article|artikel|content|konten|post|entry|detail|body|news|berita|story|read|text|isi)(?:$|[\s_-])',
+    re.IGNORECASE
+)
+
+# Elements that can hold the article body
+BLOCK_TAGS = {'div', 'article', 'section', 'main', 'td', 'body'}
+
+# Short blocks that are mostly links ("Baca juga" lines, tag lists) are dropped whatever their class
+LINK_LIST_TAGS = {'p', 'li', 'ul', 'ol', 'div', 'section', 'table'}
+
+# Direct text runs at least this long count as paragraph text (sites that use <br> instead of <p>)
+PARAGRAPH_RUN = 40
+
+# Common Indonesian news site artifacts, removed from the final text in one pass
+ARTIFACTS = re.compile(
+    r'Baca juga:\s*|Lihat juga:\s*|ADVERTISEMENT|CONTINUE READING BELOW|SCROLL TO CONTINUE WITH CONTENT|'
+    r'Loading\.\.\.|Tunggu sebentar\.\.\.',
+    re.IGNORECASE
+)
+WHITESPACE = re.compile(r'\s+')
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>', re.IGNORECASE)
+PARAGRAPH_SKIP = ('copyright', 'baca juga', 'lihat juga', 'follow', 'subscribe')
+
+MIN_CONTENT_LENGTH = 200
+
+def parse_html(html: str) -> Optional[etree._Element]:
+    """lxml document tree, None for empty or unparseable markup"""
+    html = XML_DECLARATION.sub('', html or '', count=1)
+    if not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+class ContentExtractor:
+    """Single-pass article body extractor.
+
+    The page is parsed once with lxml and every element is visited once, children
+    before parents, accumulating text, link text and paragraph text. Boilerplate
+    blocks are dropped along the way, and each block element is scored on how much
+    paragraph text it holds against its link density and non-paragraph text.
+    The best block wins; its text is joined and cleaned with precompiled patterns.
+    """
+
+    def parse(self, html: str) -> Optional[etree._Element]:
+        return parse_html(html)
+
+    def extract(self, html: str) -> Dict:
+        """{'content', 'xpath', 'score'}; content is '' when nothing usable is found"""
+        root = self.parse(html)
+        if root is None:
+            return {'content': '', 'xpath': None, 'score': 0.0}
+
+        dropped: Set[etree._Element] = set()
+        best, best_score = self._score_blocks(root, dropped)
+
+        content, xpath = '', None
+        if best is not None:
+            content = self.clean(self.text_of(best, dropped))
+            xpath = self.xpath_for(best)
+        if len(content) < MIN_CONTENT_LENGTH:
+            paragraphs = self.paragraph_text(root, dropped)
+            if len(paragraphs) > len(content):
+                content, xpath = paragraphs, '//p'
+        return {'content': content, 'xpath': xpath, 'score': best_score}
+
+    def extract_at(self, html: str, xpath: str, root: Optional[etree._Element] = None) -> str:
+        """Cleaned text of the first element matching a remembered xpath ('' if missing).
+        `root`: the page's already parsed tree (read only), instead of parsing html again"""
+        if root is None:
+            root = self.parse(html)
+        if root is None or not xpath:
+            return ''
+        try:
+            matches = root.xpath(xpath)
+        except etree.XPathError:
+            return ''
+        if xpath == '//p':
+            return self.paragraph_text(root, self._junk_elements(root))
+        if not matches or not isinstance(matches[0], etree._Element):
+            return ''
+        return self.clean(self.text_of(matches[0], self._junk_elements(matches[0])))
+
+    def _score_blocks(self, root: etree._Element, dropped: Set[etree._Element]):
+        # Reversed document order visits every child before its parent
+        elements = [element for element in root.iter() if isinstance(element.tag, str)]
+        stats = {}
+        best, best_score = None, 0.0
+        for element in reversed(elements):
+            tag = element.tag.lower()
+            if tag in JUNK_TAGS:
+                dropped.add(element)
+                stats[element] = (0, 0, 0)
+                continue
+
+            runs = [element.text or '']
+            text = links = paragraph = 0
+            for child in element:
+                runs.append(child.tail or '')
+                child_stats = stats.get(child)
+                if child_stats:
+                    text += child_stats[0]
+                    links += child_stats[1]
+                    paragraph += child_stats[2]
+            own = [len(run.strip()) for run in runs]
+            text += sum(own)
+
+            if tag == 'a':
+                links = text
+            if tag == 'p':
+                paragraph = text - links
+            else:
+                paragraph += sum(length for length in own if length >= PARAGRAPH_RUN)
+
+            attributes = f"{element.get('class', '')} {element.get('id', '')}"
+            link_density = links / text if text else 0.0
+            junk = attributes.strip() and JUNK_ATTRIBUTE.search(attributes) and (text < 500 or link_density > 0.35)
+            if junk or (tag in LINK_LIST_TAGS and text < 200 and link_density >= 0.5):
+                # A wrapper like "main-content with-sidebar" keeps its text: it is long and not link-heavy
+                dropped.add(element)
+                stats[element] = (0, 0, 0)
+                continue
+            stats[element] = (text, links, paragraph)
+
+            if tag in BLOCK_TAGS and paragraph:
+                score = (paragraph - 0.3 * (text - paragraph)) * (1 - link_density)
+                if tag in ('article', 'main') or CONTENT_HINT.search(attributes):
+                    score *= 1.2
+                if score > best_score:
+                    best, best_score = element, score
+        return best, best_score
+
+    def _junk_elements(self, root: etree._Element) -> Set[etree._Element]:
+        """Boilerplate inside a remembered block (same rules as the scoring pass, without scoring)"""
+        dropped: Set[etree._Element] = set()
+        self._score_blocks(root, dropped)
+        return dropped
+
+    def text_of(self, element: etree._Element, dropped: Set[etree._Element]) -> str:
+        return ' '.join(self._runs(element, dropped))
+
+    def _runs(self, element: etree._Element, dropped: Set[etree._Element]) -> Iterator[str]:
+        stack = [element]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+                continue
+            if node in dropped or not isinstance(node.tag, str):
+                continue
+            if node.text:
+                yield node.text
+            # Children and their tails, pushed in reverse so they pop in document order
+            for child in reversed(node):
+                if child.tail:
+                    stack.append(child.tail)
+                stack.append(child)
+
+    def paragraph_text(self, root: etree._Element, dropped: Set[etree._Element]) -> str:
+        """Fallback: every meaningful <p> outside the boilerplate blocks"""
+        texts: List[str] = []
+        for paragraph in root.iter('p'):
+            if any(ancestor in dropped for ancestor in paragraph.iterancestors()):
+                continue
+            text = WHITESPACE.sub(' ', self.text_of(paragraph, dropped)).strip()
+            if len(text) > 30 and not any(skip in text.lower() for skip in PARAGRAPH_SKIP):
+                texts.append(text)
+        return self.clean(' '.join(texts))
+
+    def clean(self, text: str) -> str:
+        text = WHITESPACE.sub(' ', text)
+        return WHITESPACE.sub(' ', ARTIFACTS.sub('', text)).strip()
+
+    def xpath_for(self, element: etree._Element) -> str:
+        """Stable path for the block: by id, then by tag + class, then positional"""
+        element_id = element.get('id')
+        if element_id and '"' not in element_id and not re.search(r'\d{4,}', element_id):
+            return f'//*[@id="{element_id}"]'
+        element_class = element.get('class')
+        if element_class and '"' not in element_class:
+            return f'//{element.tag}[@class="{element_class}"]'
+        return element.getroottree().getpath(element)
@@ -0,0 +1,104 @@
+# domain_scheduler.py
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Second-level labels that belong to the suffix (kompas.co.id, ui.ac.id, ...)
+SECOND_LEVEL_SUFFIXES = {'co', 'ac', 'go', 'or', 'web', 'my', 'sch', 'net', 'com', 'org', 'gov', 'edu'}
+
+class DomainScheduler:
+    """Per-domain politeness: requests to different hosts run in parallel,
+    requests to the same site are spaced by a minimum interval"""
+
+    def __init__(self, min_interval: float = 1.0, jitter: float = 0.25,
+                 overrides: Optional[Dict[str, float]] = None):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.overrides = dict(overrides or {})
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Site key for a URL: news.detik.com and m.detik.com share detik.com"""
+        host = (urlparse(url).hostname or '').lower()
+        labels = [label for label in host.split('.') if label]
+        if len(labels) <= 2:
+            return '.'.join(labels)
+        if labels[-2] in SECOND_LEVEL_SUFFIXES and len(labels[-1]) == 2:
+            return '.'.join(labels[-3:])
+        return '.'.join(labels[-2:])
+
+    def configure(self, min_interval: float, overrides: Optional[Dict[str, float]] = None):
+        with self._lock:
+            self.min_interval = min_interval
+            self.overrides = dict(overrides or {})
+
+    def interval_for(self, domain: str) -> float:
+        return self.overrides.get(domain, self.min_interval)
+
+    def _take_slot(self, domain: str, slot: float):
+        interval = self.interval_for(domain)
+        if interval > 0:
+            # A little jitter so same-site requests don't look machine-timed
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._next_slot[domain] = slot + interval
+
+    def delay_for(self, url: str) -> float:
+        """Seconds until the URL's domain has a free slot (nothing is reserved)"""
+        with self._lock:
+            return max(0.0, self._next_slot.get(self.domain_of(url), 0.0) - time.monotonic())
+
+    def try_reserve(self, url: str) -> bool:
+        """Take the domain's slot only if it is free right now"""
+        domain = self.domain_of(url)
+        with self._lock:
+            now = time.monotonic()
+            if self._next_slot.get(domain, 0.0) > now:
+                return False
+            self._take_slot(domain, now)
+            return True
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next slot for the URL's domain and return how long to wait for it"""
+        domain = self.domain_of(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, 0.0))
+            self._take_slot(domain, slot)
+            return slot - now
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def wait_ready_async(self, url: str):
+        """Wait until the domain's slot is free, without reserving it (see try_reserve)"""
+        delay = self.delay_for(url)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.delay_for(url)
+
+    @staticmethod
+    def parse_overrides(text: str) -> Dict[str, float]:
+        """Parse 'detik.com=2, kompas.com=0.5' into {domain: interval}"""
+        overrides = {}
+        for part in (text or '').replace('\n', ',').split(','):
+            if '=' not in part:
+                continue
+            domain, value = part.split('=', 1)
+            try:
+                overrides[DomainScheduler.domain_of(f"http://{domain.strip()}")] = max(0.0, float(value))
+            except ValueError:
+                continue
+        return overrides
@@ -0,0 +1,150 @@
+# extraction_profiles.py
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from http_cache import CACHE_DIR
+
+# Remembered text shorter than this share of the site's usual article length counts as a miss
+MIN_LENGTH_RATIO = 0.3
+MIN_CONTENT_LENGTH = 200
+
+# Consecutive misses after which a profile is forgotten and learned again
+MAX_MISSES = 3
+
+class ExtractionProfiles:
+    """Per-host memory of which extraction method (and block xpath) wins on that site.
+
+    Stored as one JSON file: {host: {'method', 'xpath', 'avg_length', 'wins', 'misses', 'updated'}}.
+    The scraper tries the remembered path first and only runs the full search when
+    it gives low-quality text.
+    """
+
+    def __init__(self, path: Optional[str] = None, save_every: int = 20):
+        self.path = path or os.path.join(CACHE_DIR, 'extraction_profiles.json')
+        self.save_every = save_every
+        self.stats = {'hits': 0, 'misses': 0, 'learned': 0}
+        self._lock = threading.Lock()
+        self._dirty = 0
+        # Hosts changed (None: forgotten) since the last save, laid over the file on the next save
+        self._changes: Dict[str, Optional[Dict]] = {}
+        self._profiles: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                profiles = json.load(f)
+            return profiles if isinstance(profiles, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        host = (urlparse(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            profile = self._profiles.get(self.host_of(url))
+            return dict(profile) if profile else None
+
+    @staticmethod
+    def is_good(profile: Dict, content: str) -> bool:
+        """Remembered path still gives a full article (not a teaser, error page or empty block)"""
+        length = len(content or '')
+        return length >= max(MIN_CONTENT_LENGTH, MIN_LENGTH_RATIO * profile.get('avg_length', 0))
+
+    def record_hit(self, url: str, content: str):
+        host = self.host_of(url)
+        with self._lock:
+            self.stats['hits'] += 1
+            profile = self._profiles.get(host)
+            if profile:
+                profile['wins'] += 1
+                profile['misses'] = 0
+                profile['avg_length'] = round(0.8 * profile['avg_length'] + 0.2 * len(content))
+                self._touch(host)
+
+    def record_miss(self, url: str):
+        host = self.host_of(url)
+        with self._lock:
+            self.stats['misses'] += 1
+            profile = self._profiles.get(host)
+            if profile:
+                profile['misses'] += 1
+                if profile['misses'] >= MAX_MISSES:
+                    # Site redesign: forget and learn again from the next full search
+                    del self._profiles[host]
+                self._touch(host)
+
+    def learn(self, url: str, method: str, xpath: Optional[str], content: str):
+        """Remember the winner of a full search for the URL's host"""
+        host = self.host_of(url)
+        if not host or len(content or '') < MIN_CONTENT_LENGTH:
+            return
+        with self._lock:
+            profile = self._profiles.get(host)
+            if profile and profile['method'] == method and profile.get('xpath') == xpath:
+                return
+            self._profiles[host] = {
+                'method': method, 'xpath': xpath, 'avg_length': len(content),
+                'wins': 0, 'misses': 0, 'updated': time.time()
+            }
+            self.stats['learned'] += 1
+            self._touch(host)
+
+    def _touch(self, host: str):
+        self._changes[host] = self._profiles.get(host)
+        self._dirty += 1
+        if self._dirty >= self.save_every:
+            self._save()
+
+    def _save(self):
+        """Merge this process's changes into the file on disk and write it back.
+
+        Job workers and the app each hold their own copy, so the file is re-read first
+        and only the hosts changed here are replaced; everything else another process
+        learned in the meantime is kept (and picked up by this process too).
+        """
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            profiles = self._load()
+            for host, profile in self._changes.items():
+                if profile is None:
+                    profiles.pop(host, None)
+                else:
+                    profiles[host] = profile
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(profiles, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Gagal menyimpan profil ekstraksi: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._profiles = profiles
+        self._changes = {}
+        self._dirty = 0
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'domains': len(self._profiles)}
@@ -0,0 +1,126 @@
+# fetch_engine.py
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+
+_DONE = object()
+
+class FetchEngine:
+    """Concurrent fetch engine: many NewsScraper fetches in flight, results returned as they finish"""
+
+    def __init__(self, scraper, concurrency: int = 16, timeout: int = 30, basic_only: bool = False,
+                 head_only: bool = False):
+        self.scraper = scraper
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.basic_only = basic_only
+        self.head_only = head_only
+        # Extra threads so a fetch that outlived its timeout does not starve the queue
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency * 2, thread_name_prefix='fetch')
+        self._cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_task: Optional[asyncio.Task] = None
+
+    def _failed(self, url: str, error: str) -> Dict:
+        return {'url': url, 'document': None, 'title': 'Gagal mengambil judul', 'article_data': None, 'error': error}
+
+    def _fetch_blocking(self, url: str) -> Dict:
+        if self._cancelled.is_set():
+            return self._failed(url, 'cancelled')
+        try:
+            return self.scraper.scrape_url(url, timeout=self.timeout, basic_only=self.basic_only, scheduled=True,
+                                           head_only=self.head_only)
+        except Exception as e:
+            print(f"❌ Error fetching {url}: {str(e)}")
+            return self._failed(url, str(e))
+
+    async def fetch(self, url: str, semaphore: asyncio.Semaphore) -> Dict:
+        """Fetch one URL under the global concurrency limit and a hard per-request timeout"""
+        # Wait for the domain's politeness slot outside the semaphore, so a queue of
+        # same-site URLs never blocks other hosts, but only take the slot once a
+        # concurrency slot is held: a slot reserved while queued for the semaphore
+        # would expire and let same-site requests go out together (cache hits skip it)
+        scheduler = None if self.scraper.is_cached(url) else self.scraper.scheduler
+        while True:
+            if scheduler is not None:
+                await scheduler.wait_ready_async(url)
+            async with semaphore:
+                if scheduler is not None and not scheduler.try_reserve(url):
+                    continue  # another request of the site got there first: give the slot back
+                loop = asyncio.get_running_loop()
+                try:
+                    # requests' timeout covers each socket operation, this one the whole row
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(self._executor, self._fetch_blocking, url),
+                        timeout=self.timeout * 2
+                    )
+                except asyncio.TimeoutError:
+                    print(f"⏱️ Timeout fetching {url[:60]}...")
+                    return self._failed(url, 'timeout')
+
+    async def fetch_many(self, items: Iterable[Tuple[Any, str]]) -> AsyncIterator[Tuple[Any, Dict]]:
+        """Yield (key, result) pairs in completion order; pending fetches are cancelled on exit"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def keyed(key, url):
+            return key, await self.fetch(url, semaphore)
+
+        tasks = [asyncio.ensure_future(keyed(key, url)) for key, url in items]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def iter_completed(self, items: Iterable[Tuple[Any, str]]) -> Iterator[Tuple[Any, Dict]]:
+        """Synchronous bridge for Streamlit: the event loop runs on a background thread,
+        so fetches keep going while the caller processes finished rows"""
+        results = queue.Queue()
+        items = list(items)
+        self._cancelled.clear()
+        self._loop = asyncio.new_event_loop()
+
+        async def pump():
+            try:
+                async for item in self.fetch_many(items):
+                    results.put(item)
+            finally:
+                results.put(_DONE)
+
+        def run_loop():
+            asyncio.set_event_loop(self._loop)
+            self._main_task = self._loop.create_task(pump())
+            try:
+                self._loop.run_until_complete(self._main_task)
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=run_loop, name='fetch-loop', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            # Caller stopped early (error, Streamlit rerun): cancel whatever is still in flight
+            self.cancel()
+            thread.join()
+            self._loop.close()
+            self._loop = None
+
+    def cancel(self):
+        """Cancel all pending fetches; running requests finish but their results are dropped"""
+        self._cancelled.set()
+        if self._loop and self._main_task and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._main_task.cancel)
+
+    def close(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,189 @@
+# gemini_dispatcher.py
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from lazy_imports import lazy_import
+
+# Imported on the first set_api_key, i.e. only when a run uses Gemini
+genai = lazy_import('google.generativeai')
+
+# google.api_core exception names that are worth retrying (matched by name so the
+# dispatcher works with any client, or a stub model, without importing api_core)
+TRANSIENT_ERRORS = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'DeadlineExceeded',
+    'InternalServerError', 'GatewayTimeout', 'BadGateway', 'Aborted',
+    'TimeoutError', 'ConnectionError', 'ReadTimeout', 'ConnectTimeout',
+}
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class GeminiDispatcher:
+    """Shared dispatcher for Gemini requests.
+
+    Runs many requests at once under a concurrency cap while keeping a sliding
+    one-minute window within the requests-per-minute and tokens-per-minute budgets.
+    Transient errors (429, 5xx, timeouts) are retried with jittered exponential backoff
+    instead of ending up as "Gagal Analisis AI". Anything exposing
+    generate_content(prompt).text can be dispatched, so tests can pass a stub model.
+    """
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: int = 60,
+                 tokens_per_minute: int = 1_000_000, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._window = deque()  # (timestamp, tokens) of requests sent in the last minute
+        self._budget = threading.Condition()
+        self._queued = 0
+        self._in_flight = 0
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0, 'throttled_seconds': 0.0}
+        self.configure(max_concurrency=max_concurrency)
+
+    def configure(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[int] = None,
+                  tokens_per_minute: Optional[int] = None):
+        """Change budgets between runs (the job pool is recreated when concurrency changes)"""
+        with self._budget:
+            if requests_per_minute:
+                self.requests_per_minute = requests_per_minute
+            if tokens_per_minute:
+                self.tokens_per_minute = tokens_per_minute
+            if max_concurrency and max_concurrency != getattr(self, 'max_concurrency', None):
+                self.max_concurrency = max_concurrency
+                self._slots = threading.BoundedSemaphore(max_concurrency)
+                old_pool = getattr(self, '_pool', None)
+                self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='gemini')
+                if old_pool:
+                    old_pool.shutdown(wait=False)
+            self._budget.notify_all()
+
+    @staticmethod
+    def estimate_tokens(prompt: str, expected_output: int = 300) -> int:
+        # ~4 characters per token for Indonesian/English text
+        return len(prompt) // 4 + expected_output
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        if type(error).__name__ in TRANSIENT_ERRORS:
+            return True
+        code = getattr(error, 'code', None)
+        code = getattr(code, 'value', code)  # grpc StatusCode enums carry (number, name)
+        if isinstance(code, int) and code in TRANSIENT_STATUS_CODES:
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in ('429', 'quota', 'rate limit', 'timed out', 'deadline', 'unavailable'))
+
+    def _acquire_budget(self, tokens: int):
+        """Block until one more request of `tokens` fits in the one-minute window"""
+        waited_from = time.monotonic()
+        with self._budget:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._window.popleft()
+                used_tokens = sum(count for _, count in self._window)
+                fits_requests = len(self._window) < self.requests_per_minute
+                # A single prompt larger than the whole budget still goes through on an empty window
+                fits_tokens = used_tokens + tokens <= self.tokens_per_minute or not self._window
+                if fits_requests and fits_tokens:
+                    self._window.append((now, tokens))
+                    self.stats['requests'] += 1
+                    break
+                wait = 60 - (now - self._window[0][0]) if self._window else 0.1
+                self._budget.wait(timeout=max(0.05, wait))
+            self.stats['throttled_seconds'] += time.monotonic() - waited_from
+
+    def generate(self, model, prompt: str) -> str:
+        """Blocking model.generate_content(prompt).text under the budgets, with retries"""
+        tokens = self.estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            self._acquire_budget(tokens)
+            with self._slots:
+                try:
+                    return model.generate_content(prompt).text
+                except Exception as e:
+                    if attempt >= self.max_retries or not self.is_transient(e):
+                        with self._budget:
+                            self.stats['failed'] += 1
+                        raise
+                    error = e
+            # Full jitter: spread retries of many workers over the whole backoff window
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            with self._budget:
+                self.stats['retries'] += 1
+            print(f"🔁 Gemini transient error ({type(error).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a job (e.g. all AI tasks of one row) on the shared worker pool"""
+        with self._budget:
+            self._queued += 1
+
+        def run():
+            with self._budget:
+                self._queued -= 1
+                self._in_flight += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._budget:
+                    self._in_flight -= 1
+
+        return self._pool.submit(run)
+
+    def map(self, fn: Callable, items: Iterable, *args) -> List:
+        """fn(item, *args) for every item on the pool, results in input order"""
+        futures = [self.submit(fn, item, *args) for item in items]
+        return [future.result() for future in futures]
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._budget:
+            return {'queued': self._queued, 'in_flight': self._in_flight}
+
+    def reset_stats(self):
+        with self._budget:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class GeminiClient:
+    """Base of the AI modules: one Gemini model, called through the LLM cache and the
+    dispatcher shared by all of them (both optional, set by the pipeline)"""
+
+    def __init__(self, model_name: str = 'gemini-2.5-flash'):
+        self.api_key = None
+        self.model = None
+        self.model_name = model_name
+        self.cache = None
+        self.dispatcher: Optional[GeminiDispatcher] = None
+
+    def set_api_key(self, api_key: str):
+        """Sets the API key and configures the Generative AI model."""
+        self.api_key = api_key
+        if api_key:
+            genai.configure(api_key=api_key)
+            self.model = genai.GenerativeModel(self.model_name)
+
+    def _generate(self, prompt: str) -> str:
+        return generate_text(self.model, self.model_name, prompt, self.cache, self.dispatcher)
+
+def generate_text(model, model_name: str, prompt: str, cache=None,
+                  dispatcher: Optional[GeminiDispatcher] = None) -> str:
+    """One Gemini answer: LLM cache first, then the dispatcher (or a direct call)"""
+    def call(p: str) -> str:
+        if dispatcher:
+            return dispatcher.generate(model, p)
+        return model.generate_content(p).text
+
+    if cache:
+        return cache.generate(model_name, prompt, call)
+    return call(prompt)
@@ -0,0 +1,182 @@
+# http_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from url_canonicalizer import fetch_url
+
+CACHE_DIR = os.getenv('NEWS_ANALYZER_CACHE_DIR', '.cache')
+
+class CachedResponse:
+    """One cached page: status, headers and the decompressed body"""
+
+    def __init__(self, url: str, final_url: str, status: int, headers: Dict[str, str],
+                 body: bytes, stored_at: float):
+        self.url = url
+        self.final_url = final_url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('etag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('last-modified')
+
+class HttpCache:
+    """Persistent HTTP response cache in SQLite, with TTL, size-bounded LRU eviction
+    and conditional revalidation (ETag / If-Modified-Since) of stale entries"""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.path = path or os.path.join(CACHE_DIR, 'http_cache.sqlite')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0}
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                final_url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                stored_at REAL,
+                last_access REAL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def canonical_url(url: str) -> str:
+        """Lowercase scheme/host, no fragment or tracking parameters, sorted query (see url_canonicalizer)"""
+        return fetch_url(url)
+
+    @classmethod
+    def key_for(cls, url: str) -> str:
+        return hashlib.sha256(cls.canonical_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Cached entry for the URL (fresh or stale), None if not cached"""
+        key = self.key_for(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, final_url, status, headers, body, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+        try:
+            body = zlib.decompress(row[4])
+        except zlib.error:
+            self.delete(url)
+            return None
+        return CachedResponse(row[0], row[1], row[2], json.loads(row[3]), body, row[5])
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def is_cached_fresh(self, url: str) -> bool:
+        """Cheap check (no body read) used to skip the politeness wait for cache hits"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT stored_at FROM responses WHERE key = ?', (self.key_for(url),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def conditional_headers(self, entry: CachedResponse) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, final_url: str, status: int, headers: Dict[str, str], body: bytes):
+        # Only the headers needed for revalidation and decoding are kept
+        kept = {k.lower(): v for k, v in headers.items()
+                if k.lower() in ('etag', 'last-modified', 'content-type', 'cache-control')}
+        if 'no-store' in kept.get('cache-control', '').lower():
+            return
+
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.key_for(url), url, final_url, status, json.dumps(kept), compressed,
+                 len(compressed), now, now)
+            )
+            self._conn.commit()
+            self.stats['stored'] += 1
+        self._evict()
+
+    def refresh(self, url: str):
+        """Entry revalidated with 304 Not Modified: restart its TTL"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?',
+                (time.time(), time.time(), self.key_for(url))
+            )
+            self._conn.commit()
+
+    def delete(self, url: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (self.key_for(url),))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access ASC').fetchall()
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes * 0.9:
+                    break
+                evicted.append((key,))
+                total -= size
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+            self._conn.commit()
+        print(f"🧹 HTTP cache evicted {len(evicted)} entries")
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+            return dict(self.stats, entries=entries, bytes=size)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
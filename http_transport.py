@@ -0,0 +1,163 @@
+# http_transport.py
+
+import threading
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class HttpTransport:
+    """Pooled keep-alive HTTP transport shared by every fetch path and safe across threads.
+
+    Every thread gets its own requests.Session (cookies and state stay per thread)
+    but all sessions share the same adapters, so TCP/TLS connections are pooled
+    and reused process-wide. Headers are passed per request, never stored on a session.
+    """
+
+    def __init__(self, pool_connections: int = 64, pool_maxsize: int = 8):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._adapter = self._make_adapter(pool_maxsize)
+        self._host_adapters: Dict[str, HTTPAdapter] = {}
+        self._host_sizes: Dict[str, int] = {}
+        # Weak: a session goes away with its thread (fetch engines start new threads every run)
+        self._sessions = weakref.WeakSet()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _make_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        # pool_block=False: above pool_maxsize extra connections are opened but not kept
+        return HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=pool_maxsize,
+                           max_retries=0, pool_block=False)
+
+    def _mount(self, session: requests.Session):
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        for host, adapter in self._host_adapters.items():
+            session.mount(f'http://{host}', adapter)
+            session.mount(f'https://{host}', adapter)
+
+    @property
+    def session(self) -> requests.Session:
+        """Session for the calling thread, created on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # No session-level defaults: every request carries its own headers
+            session.headers.clear()
+            with self._lock:
+                self._mount(session)
+                self._sessions.add(session)
+            self._local.session = session
+        return session
+
+    def configure_host_pools(self, sizes: Optional[Dict[str, int]] = None):
+        """Dedicated connection pool sizes per host (e.g. a portal with many rows); hosts
+        not listed go back to the shared pool. Called between runs."""
+        sizes = {host.lower(): size for host, size in (sizes or {}).items() if size > 0}
+        with self._lock:
+            if sizes == self._host_sizes:
+                return
+            for host in list(self._host_adapters):
+                if sizes.get(host) != self._host_sizes.get(host):
+                    self._host_adapters.pop(host).close()
+            for host, size in sizes.items():
+                if host not in self._host_adapters:
+                    self._host_adapters[host] = self._make_adapter(size)
+            self._host_sizes = sizes
+            for session in list(self._sessions):
+                # Drop mounts of hosts that were removed, then mount the current set
+                for prefix in [prefix for prefix in session.adapters if prefix not in ('http://', 'https://')]:
+                    del session.adapters[prefix]
+                self._mount(session)
+
+    @staticmethod
+    def parse_pool_sizes(text: str) -> Dict[str, int]:
+        """Parse 'news.detik.com=16, www.kompas.com=12' into {host: pool size}"""
+        sizes = {}
+        for part in (text or '').replace('\n', ',').split(','):
+            if '=' not in part:
+                continue
+            host, value = part.split('=', 1)
+            host = host.strip().lower()
+            try:
+                if host:
+                    sizes[host] = max(1, int(value))
+            except ValueError:
+                continue
+        return sizes
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+            **kwargs) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+              max_bytes: Optional[int] = None, stop_at: Optional[bytes] = None,
+              chunk_size: int = 64 * 1024) -> Tuple[requests.Response, bytes, bool]:
+        """
+        Streamed GET that reads the (decoded) body in chunks.
+
+        Stops early once `stop_at` (e.g. b'</head>', case-insensitive) has been read or
+        the body reaches `max_bytes`; the connection is then dropped instead of drained.
+
+        Returns:
+            (response, body, truncated) - truncated is True when the body is partial.
+        """
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        chunks, size, truncated = [], 0, False
+        marker = stop_at.lower() if stop_at else None
+        tail = b''
+        try:
+            for chunk in response.iter_content(chunk_size):
+                chunks.append(chunk)
+                size += len(chunk)
+                if marker:
+                    # Keep the end of the previous chunk so a marker split across chunks is found
+                    window = tail + chunk.lower()
+                    if marker in window:
+                        truncated = True
+                        break
+                    tail = window[-len(marker):]
+                if max_bytes and size >= max_bytes:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+
+        body = b''.join(chunks)
+        if max_bytes and len(body) > max_bytes:
+            body = body[:max_bytes]
+        return response, body, truncated
+
+    def route_newspaper(self, header_factory: Callable[[str], Dict[str, str]]):
+        """Route newspaper3k's own downloads (Article.download without input_html) through this pool"""
+        from newspaper import network
+
+        original = getattr(network, '_original_get_html_2XX_only', network.get_html_2XX_only)
+        network._original_get_html_2XX_only = original
+
+        def get_html_2XX_only(url, config=None, response=None):
+            if response is not None:
+                return original(url, config, response)
+            timeout = getattr(config, 'request_timeout', 30)
+            response = self.get(url, headers=header_factory(url), timeout=timeout)
+            # Let newspaper decode the response exactly as it would its own
+            html = original(url, config, response)
+            if config is None or getattr(config, 'http_success_only', True):
+                response.raise_for_status()
+            return html
+
+        network.get_html_2XX_only = get_html_2XX_only
+
+    def close(self):
+        with self._lock:
+            for session in list(self._sessions):
+                session.close()
+            self._sessions.clear()
+            self._adapter.close()
+            for adapter in self._host_adapters.values():
+                adapter.close()
+            self._host_adapters.clear()
+            self._host_sizes = {}
+        self._local = threading.local()
@@ -0,0 +1,163 @@
+# job_runner.py
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from resources import get_pipeline
+from run_store import RunStore
+
+# Jobs running at the same time (one worker process each)
+JOB_WORKERS = int(os.getenv('NEWS_ANALYZER_JOB_WORKERS', '2'))
+
+# Rows per store write, and how often the progress report is refreshed
+JOB_BATCH_ROWS = 25
+PROGRESS_SECONDS = 1.0
+
+def parse_workers_per_job(workers: int = JOB_WORKERS) -> int:
+    """Parse processes one job may start, so jobs running side by side use each core once"""
+    return (os.cpu_count() or 1) // max(1, workers)
+
+def domain_intervals_per_job(config: Dict, workers: int = JOB_WORKERS) -> Dict:
+    """Per-domain spacing of one job, so jobs running side by side stay within the configured rate.
+
+    Every job process has its own DomainScheduler and does not see the requests of the
+    other jobs; with the interval multiplied by the number of jobs the site gets at most
+    one request per configured interval even when all of them hit it at the same time.
+    """
+    workers = max(1, workers)
+    return {
+        'domain_interval': config.get('domain_interval', 1.0) * workers,
+        'domain_overrides': {domain: interval * workers for domain, interval in (config.get('domain_overrides') or {}).items()},
+    }
+
+def run_job(run_id: str, kind: str, payload: Dict, config: Dict, api_key: Optional[str] = None,
+            store_path: Optional[str] = None) -> str:
+    """Process one run in a worker process, writing rows, progress and stats to the run store.
+
+    kind is 'urls' (payload {'urls'}) or 'records' (payload {'records', 'column_mapping'}).
+    Rows already in the store are skipped, so a resubmitted run continues where it stopped.
+    Returns the final status.
+    """
+    store = RunStore(run_id, path=store_path)
+    try:
+        if store.status() == 'cancelled':
+            return 'cancelled'
+        # Per-process pipeline, built on the first job a worker runs and reused after that
+        pipeline = get_pipeline(api_key)
+        total = len(payload['urls'] if kind == 'urls' else payload['records'])
+        skip = store.done_rows()
+        store.start(total)
+
+        last_report = [0.0]
+        def report(progress: Dict):
+            if progress.get('status') or time.monotonic() - last_report[0] >= PROGRESS_SECONDS:
+                last_report[0] = time.monotonic()
+                store.set_progress({**progress, 'resumed': len(skip)})
+
+        if kind == 'urls':
+            rows = pipeline.process_urls(payload['urls'], config, on_progress=report, skip=skip)
+        else:
+            rows = pipeline.process_records(
+                payload['records'], payload['column_mapping'], config, on_progress=report, skip=skip
+            )
+        if not store.consume(rows, batch_rows=JOB_BATCH_ROWS):
+            return 'cancelled'
+        store.finish(stats=pipeline.get_stats(config))
+        return 'done'
+    except Exception as e:
+        print(f"❌ Job {run_id} gagal: {str(e)}")
+        store.fail(str(e))
+        return 'failed'
+    finally:
+        store.close()
+
+class JobRunner:
+    """Local job queue: runs are processed by worker processes owned by the server,
+    not by the Streamlit script thread, so closing the tab or interacting with the
+    page does not stop them and several runs can go side by side. Everything a
+    job produces goes through its RunStore; the UI only submits and polls.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, store_path: Optional[str] = None):
+        self.workers = max(1, workers)
+        self.store_path = store_path
+        # Same start method as the parse pool: workers must not fork a process full of threads
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            self._context.set_forkserver_preload(['pipeline'])
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context)
+        self._jobs: Dict[str, Future] = {}
+        self._labels: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, run_id: str) -> RunStore:
+        return RunStore(run_id, path=self.store_path)
+
+    def submit(self, run_id: str, kind: str, payload: Dict, config: Dict, api_key: Optional[str] = None,
+               label: str = '', meta: Optional[Dict] = None) -> str:
+        """Queue a run (no-op while the same run is still queued or running)"""
+        with self._lock:
+            if self.is_active(run_id):
+                return run_id
+            total = len(payload['urls'] if kind == 'urls' else payload['records'])
+            # Every worker may run a job with its own parse pool at the same time
+            config = {**config, 'parse_workers': min(config.get('parse_workers', 0), parse_workers_per_job(self.workers)),
+                      **domain_intervals_per_job(config, self.workers)}
+            store = self._store(run_id)
+            store.queue(total, meta={'kind': kind, 'label': label, 'config': config, **(meta or {})})
+            store.close()
+            self._labels[run_id] = label
+            try:
+                future = self._executor.submit(run_job, run_id, kind, payload, config, api_key, self.store_path)
+            except BrokenProcessPool:
+                # A worker died (OOM, kill): start a fresh pool, the dead jobs show as interrupted
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context)
+                future = self._executor.submit(run_job, run_id, kind, payload, config, api_key, self.store_path)
+            self._jobs[run_id] = future
+        return run_id
+
+    def is_active(self, run_id: str) -> bool:
+        future = self._jobs.get(run_id)
+        return future is not None and not future.done()
+
+    def cancel(self, run_id: str):
+        store = self._store(run_id)
+        store.cancel()
+        store.close()
+        future = self._jobs.get(run_id)
+        if future is not None:
+            future.cancel()
+
+    def status(self, run_id: str) -> Optional[Dict]:
+        """Run info from the store; a run marked queued/running that no worker of this
+        process owns (server restart, crashed worker) is reported as 'interrupted'"""
+        store = self._store(run_id)
+        info = store.info()
+        store.close()
+        if info is None:
+            return None
+        if info['status'] in ('queued', 'running') and not self.is_active(run_id):
+            future = self._jobs.get(run_id)
+            if future is None or future.cancelled() or future.exception() is not None:
+                info['status'] = 'interrupted'
+        return info
+
+    def jobs(self) -> List[Dict]:
+        """Runs submitted to this runner, newest first"""
+        with self._lock:
+            run_ids = list(self._jobs)
+        jobs = []
+        for run_id in reversed(run_ids):
+            info = self.status(run_id)
+            if info is not None:
+                jobs.append({**info, 'label': self._labels.get(run_id, '')})
+        return jobs
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
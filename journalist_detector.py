@@ -1,53 +1,150 @@
-from newspaper import Article
-from bs4 import BeautifulSoup
+import json
 import re
-from typing import Optional
+from typing import Iterable, List, Optional
+
+# Capitalised name of one or more words
+NAME = r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*'
+
+# Last resort on the article text: the old byline patterns, precompiled and tried in
+# this order (a city dateline at the top must not beat a "Penulis:" line further down)
+BYLINE_PATTERNS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    rf'(?:Oleh|By|Penulis|Reporter|Wartawan)[\s:]+({NAME})',
+    rf'({NAME})\s*[-–—]\s*(?:Reporter|Wartawan|Jurnalis)',
+    rf'(?:^|\n)({NAME})\s*[-–—]\s*[A-Z][a-z]+',
+    rf'(?:Ditulis oleh|Written by)\s+({NAME})',
+))
+
+# Author meta tags, most specific first
+AUTHOR_META = (
+    '//meta[@name="author"]/@content',
+    '//meta[@property="article:author"]/@content',
+    '//meta[@name="article:author"]/@content',
+    '//meta[@name="dable:author"]/@content',
+    '//meta[@name="content_author"]/@content',
+    '//meta[@name="byl"]/@content',
+)
+
+# Byline elements in the page body
+BYLINE_DOM = (
+    '//*[@itemprop="author"]//*[@itemprop="name"]',
+    '//*[@itemprop="author"]',
+    '//*[@rel="author"]',
+    '//*[contains(@class, "author") or contains(@class, "byline") or contains(@class, "penulis")'
+    ' or contains(@class, "reporter") or contains(@class, "writer")]',
+)
+
+# Labels and outlet suffixes around a name: "Penulis: X", "X - detikNews", "X | Editor: Y"
+LABEL_PREFIX = re.compile(r'^\s*(?:oleh|by|penulis|reporter|wartawan|jurnalis|ditulis oleh|written by|author)\s*[:\-]?\s*',
+                          re.IGNORECASE)
+OUTLET_SUFFIX = re.compile(r'\s*(?:[-–—|/,]\s*(?:detik|kompas|tribun|cnn|liputan|tempo|kumparan|okezone|sindo|'
+                           r'antara|republika|suara|editor|penyunting)\w*.*|\|.*)$', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+MAX_NAME_LENGTH = 80
 
 class JournalistDetector:
     def __init__(self):
         pass
 
-    def detect_journalist(self, url: str, content: str) -> Optional[str]:
+    def detect_journalist(self, url: str, content: str, document=None) -> Optional[str]:
+        """Author from the already-fetched page (structured data, meta tags, byline elements,
+        newspaper3k), falling back to byline patterns in the text; never downloads anything"""
         journalist = None
-        
-        # Method 1: Using newspaper3k
-        journalist = self._detect_with_newspaper3k(url)
-        
+
+        if document is not None and document.metadata is not None:
+            # Already looked up by the parse worker (see parse_pool)
+            journalist = document.metadata.get('journalist')
+        elif document is not None:
+            journalist = self._detect_from_metadata(document) or self._detect_with_newspaper3k(document)
+
         if not journalist:
-            # Method 2: Using BeautifulSoup patterns
-            journalist = self._detect_with_patterns(content)
-        
+            # Last resort: byline patterns in the extracted text
+            journalist = self._detect_with_patterns(content or '')
+
         return journalist if journalist else "Tidak ditemukan"
 
-    def _detect_with_newspaper3k(self, url: str) -> Optional[str]:
+    def _detect_from_metadata(self, document) -> Optional[str]:
+        tree = document.tree
+        if tree is None:
+            return None
+
+        # 1. JSON-LD (NewsArticle.author)
+        for script in tree.xpath('//script[@type="application/ld+json"]/text()'):
+            names = self._names_from_json_ld(script)
+            if names:
+                return ', '.join(names)
+
+        # 2. Meta tags (name="author", article:author, ...)
+        for query in AUTHOR_META:
+            for value in tree.xpath(query):
+                name = self._clean_name(value)
+                if name:
+                    return name
+
+        # 3. Byline elements
+        for query in BYLINE_DOM:
+            for element in tree.xpath(query):
+                name = self._clean_name(element.text_content())
+                if name:
+                    return name
+        return None
+
+    def _names_from_json_ld(self, script: str) -> List[str]:
+        try:
+            data = json.loads(script)
+        except ValueError:
+            return []
+
+        names: List[str] = []
+        for node in self._json_ld_nodes(data):
+            authors = node.get('author') or node.get('creator')
+            if authors is None:
+                continue
+            for author in authors if isinstance(authors, list) else [authors]:
+                value = author.get('name') if isinstance(author, dict) else author
+                name = self._clean_name(value) if isinstance(value, str) else None
+                if name and name not in names:
+                    names.append(name)
+            if names:
+                break
+        return names
+
+    def _json_ld_nodes(self, data) -> Iterable[dict]:
+        """Every object in a JSON-LD document (top level, lists and @graph)"""
+        if isinstance(data, list):
+            for item in data:
+                yield from self._json_ld_nodes(item)
+        elif isinstance(data, dict):
+            yield data
+            if isinstance(data.get('@graph'), list):
+                yield from self._json_ld_nodes(data['@graph'])
+
+    def _clean_name(self, value: str) -> Optional[str]:
+        """'Penulis: Budi Santoso - detikNews' -> 'Budi Santoso'; None for URLs and non-names"""
+        name = WHITESPACE.sub(' ', value or '').strip()
+        if not name or '://' in name or name.startswith(('@', 'www.')):
+            return None
+        name = LABEL_PREFIX.sub('', name)
+        name = OUTLET_SUFFIX.sub('', name).strip(' ,:-–—|')
+        if not name or len(name) > MAX_NAME_LENGTH or not any(char.isalpha() for char in name):
+            return None
+        return name
+
+    def _detect_with_newspaper3k(self, document) -> Optional[str]:
+        """Authors newspaper3k found while parsing the shared document for the title"""
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            if hasattr(article, 'authors') and article.authors:
-                return ', '.join(article.authors)
-            
+            authors = document.authors
+            if authors:
+                return ', '.join(authors)
         except Exception as e:
             print(f"Error with newspaper3k: {str(e)}")
-        
+
         return None
 
     def _detect_with_patterns(self, content: str) -> Optional[str]:
-        # Common patterns for journalist names
-        patterns = [
-            r'(?:Oleh|By|Penulis|Reporter|Wartawan)[\s:]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*[-–—]\s*(?:Reporter|Wartawan|Jurnalis)',
-            r'(?:^|\n)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*[-–—]\s*[A-Z][a-z]+',
-            r'(?:Ditulis oleh|Written by)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            if matches:
-                # Return the first match that looks like a name
-                for match in matches:
-                    if len(match.split()) >= 2:  # At least first and last name
-                        return match.strip()
-        
-        return None
\ No newline at end of file
+        for pattern in BYLINE_PATTERNS:
+            for match in pattern.finditer(content):
+                name = match.group(1)
+                if len(name.split()) >= 2:  # At least first and last name
+                    return name.strip()
+
+        return None
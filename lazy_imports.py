@@ -0,0 +1,110 @@
+# lazy_imports.py
+
+"""
+Deferred imports for the heavy third-party modules, and a report of what they cost.
+
+    genai = lazy_import('google.generativeai')   # nothing imported yet
+    genai.configure(api_key=key)                 # imported (and timed) here
+
+Run on its own to measure the cold import cost of each heavy module, each in a
+fresh interpreter (what a new container pays before the first page):
+
+    python lazy_imports.py --profile-startup
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Modules worth deferring, roughly in the order the app would need them
+HEAVY_MODULES = (
+    'streamlit', 'pandas', 'numpy', 'requests', 'lxml.html', 'bs4', 'newspaper', 'google.generativeai',
+)
+
+# Seconds spent in the first import of each module loaded through this module (this process)
+IMPORT_TIMES: Dict[str, float] = {}
+
+_lock = threading.RLock()
+
+def timed_import(name: str):
+    """importlib.import_module, recording the time when this call did the actual import"""
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._callbacks: List[Callable] = []
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    module = timed_import(self._name)
+                    for callback in self._callbacks:
+                        callback(module)
+                    self._module = module
+        return self._module
+
+    def on_load(self, callback: Callable):
+        """Run callback(module) right after the import (at once if the module is already imported)"""
+        with _lock:
+            if self._module is None and self._name not in sys.modules:
+                self._callbacks.append(callback)
+                return
+        callback(self._load())
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+def startup_report(modules=HEAVY_MODULES) -> List[Dict]:
+    """Heavy modules of this process: loaded or not, and the import time when it went through here"""
+    return [
+        {'module': name, 'loaded': name in sys.modules, 'seconds': IMPORT_TIMES.get(name)}
+        for name in modules
+    ]
+
+def measure_cold_import(name: str, python: Optional[str] = None) -> Optional[float]:
+    """Import time of one module in a fresh interpreter (None when it fails to import)"""
+    code = f"import time; start = time.perf_counter(); import {name}; print(time.perf_counter() - start)"
+    result = subprocess.run([python or sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def print_cold_imports(modules=HEAVY_MODULES):
+    total = 0.0
+    print(f"{'Modul':<24}{'Detik':>8}")
+    for name in modules:
+        seconds = measure_cold_import(name)
+        if seconds is None:
+            print(f"{name:<24}{'gagal':>8}")
+            continue
+        total += seconds
+        print(f"{name:<24}{seconds:>8.3f}")
+    # Modules share dependencies, so the sum overstates a combined import
+    print(f"{'Jumlah (terpisah)':<24}{total:>8.3f}")
+
+if __name__ == "__main__":
+    if '--profile-startup' in sys.argv[1:]:
+        print_cold_imports()
+    else:
+        print(__doc__)
@@ -0,0 +1,116 @@
+# llm_cache.py
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional
+
+from http_cache import CACHE_DIR
+
+class LLMCache:
+    """Persistent cache of Gemini answers shared by every AI module.
+
+    The key is a hash of the model name and the whitespace-normalized prompt. The
+    prompt already contains the article text, the task template and the user's
+    config (context, summary options, topic list), so changing any of them misses.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path or os.path.join(CACHE_DIR, 'llm_cache.sqlite')
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0}
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                answer BLOB,
+                size INTEGER,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_answers_access ON answers(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r'\s+', ' ', text or '').strip()
+
+    @classmethod
+    def make_key(cls, model_name: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model_name}\n{cls.normalize(prompt)}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT answer FROM answers WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            self._conn.execute('UPDATE answers SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, key: str, model_name: str, answer: str):
+        if not answer or not answer.strip():
+            return
+        compressed = zlib.compress(answer.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model_name, compressed, len(compressed), now, now)
+            )
+            self._conn.commit()
+        self._evict()
+
+    def generate(self, model_name: str, prompt: str, call: Callable[[str], str]) -> str:
+        """Cached call(prompt); `call` does the actual Gemini request on a miss"""
+        key = self.make_key(model_name, prompt)
+        answer = self.get(key)
+        if answer is None:
+            answer = call(prompt)
+            self.set(key, model_name, answer)
+        return answer
+
+    def _evict(self):
+        """Drop least recently used answers until the cache fits in max_bytes"""
+        with self._lock:
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM answers').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute('SELECT key, size FROM answers ORDER BY last_access ASC').fetchall()
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes * 0.9:
+                    break
+                evicted.append((key,))
+                total -= size
+            self._conn.executemany('DELETE FROM answers WHERE key = ?', evicted)
+            self._conn.commit()
+        print(f"🧹 LLM cache evicted {len(evicted)} answers")
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+            lookups = self.stats['hits'] + self.stats['misses']
+            hit_rate = self.stats['hits'] / lookups if lookups else 0.0
+            return dict(self.stats, entries=entries, hit_rate=hit_rate)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
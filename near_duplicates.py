@@ -0,0 +1,93 @@
+# near_duplicates.py
+
+import hashlib
+import numpy as np
+from typing import Dict, Hashable, List, Optional
+
+from passage_selector import WORD_PATTERN
+
+# Word n-grams per shingle; long enough that two unrelated articles rarely share many
+SHINGLE_SIZE = 5
+
+# Texts with fewer words than this are never grouped (snippets, failed scrapes)
+MIN_WORDS = 40
+
+class NearDuplicateDetector:
+    """Incremental MinHash + LSH grouping of near-identical texts (syndicated wire stories).
+
+    Every text gets a MinHash signature of its word shingles; the signature is split
+    into bands and only texts sharing a band bucket are compared, so each `add` costs
+    roughly the same no matter how many texts came before. A candidate joins the group
+    of the first text whose estimated Jaccard similarity reaches `threshold`.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._leader: Dict[Hashable, Hashable] = {}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature, or None when the text is too short to compare reliably"""
+        words = WORD_PATTERN.findall((text or '').lower())
+        if len(words) < MIN_WORDS:
+            return None
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+             for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets"""
+        return float(np.mean(first == second))
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Register a text; returns the key of the group leader it duplicates, or None"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        band_keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+        leader = None
+        checked = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            for candidate in buckets.get(band_key, []):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if self.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    leader = self._leader.get(candidate, candidate)
+                    break
+            if leader is not None:
+                break
+
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, []).append(key)
+        if leader is not None:
+            self._leader[key] = leader
+        return leader
+
+    def leader_of(self, key: Hashable) -> Optional[Hashable]:
+        return self._leader.get(key)
+
+    def groups(self) -> Dict[Hashable, List[Hashable]]:
+        """{leader: [leader, duplicates...]} for every group with more than one member"""
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key, leader in self._leader.items():
+            groups.setdefault(leader, [leader]).append(key)
+        return groups
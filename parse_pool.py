@@ -0,0 +1,68 @@
+# parse_pool.py
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+# Per-process parser objects, created on the first page a worker handles
+_scraper = None
+_detector = None
+
+def _parsers():
+    global _scraper, _detector
+    if _scraper is None:
+        from journalist_detector import JournalistDetector
+        from scraper import NewsScraper
+        _scraper = NewsScraper()
+        _detector = JournalistDetector()
+    return _scraper, _detector
+
+def parse_page(url: str, final_url: str, content: bytes, status_code: Optional[int], basic_only: bool,
+               head_only: bool, profile: Optional[Dict]) -> Dict:
+    """Everything CPU-bound about one downloaded page, in a worker process.
+
+    Returns only plain data (title, article data, journalist from the page metadata);
+    the parsed trees never leave the worker.
+    """
+    from scraper import FetchedDocument
+
+    scraper, detector = _parsers()
+    document = FetchedDocument(url, content, final_url=final_url, status_code=status_code)
+    article_data = None
+    if not head_only:
+        try:
+            article_data = scraper.extract_article(document, basic_only, profile)
+        except Exception as e:
+            print(f"❌ Error scraping {url}: {str(e)}")
+    return {
+        'title': scraper.get_page_title(url, document, article_data),
+        'article_data': article_data,
+        'journalist': detector._detect_from_metadata(document) or detector._detect_with_newspaper3k(document),
+    }
+
+class ParsePool:
+    """Process pool (one worker per core by default) for HTML parsing and extraction,
+    so lxml / BeautifulSoup / newspaper3k work is not serialized by the GIL while
+    fetch threads and Gemini calls keep running in the main process."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # forkserver/spawn: workers start clean instead of forking a process full of threads
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            context.set_forkserver_preload(['scraper', 'journalist_detector'])
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def parse(self, document, basic_only: bool = False, head_only: bool = False,
+              profile: Optional[Dict] = None) -> Dict:
+        """Blocking: parse the document's raw bytes in a worker and return the compact result"""
+        future = self._executor.submit(
+            parse_page, document.url, document.final_url, document.content, document.status_code,
+            basic_only, head_only, profile
+        )
+        return future.result()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,456 @@
+# pipeline.py
+
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from scraper import NewsScraper
+from fetch_engine import FetchEngine
+from sentiment_analyzer import SentimentAnalyzer
+from journalist_detector import JournalistDetector
+from summarizer import ArticleSummarizer
+from topic_modeller import TopicModeller
+from combined_analyzer import CombinedAnalyzer
+from llm_cache import LLMCache
+from gemini_dispatcher import GeminiDispatcher
+from near_duplicates import NearDuplicateDetector
+from url_canonicalizer import dedupe_urls
+from parse_pool import ParsePool
+
+# Below this many pages starting worker processes costs more than it saves
+MIN_PARSE_POOL_URLS = 10
+
+# AI output columns copied from a duplicate group's leader to its other members
+AI_RESULT_COLUMNS = ('Sentiment', 'Confidence', 'Reasoning', 'Summary', 'Topic')
+
+# Batch topic mode: rows are classified in groups of this many while the run goes on
+TOPIC_FLUSH_ROWS = 50
+
+class NewsPipeline:
+    """Scrape / analyze pipeline without any UI.
+
+    process_urls and process_records are generators yielding (row_index, row) as
+    rows finish, in completion order. A yielded row may come again later with only
+    the columns that changed (a group leader getting its Duplicate_Group number),
+    so consumers merge by row index.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, scraper: Optional[NewsScraper] = None):
+        self.scraper = scraper or NewsScraper()
+        self.sentiment_analyzer = SentimentAnalyzer()
+        self.journalist_detector = JournalistDetector()
+        self.summarizer = ArticleSummarizer()
+        self.topic_modeller = TopicModeller()
+        self.combined_analyzer = CombinedAnalyzer(
+            self.sentiment_analyzer, self.summarizer, self.topic_modeller
+        )
+        self.llm_cache = LLMCache()
+        self.dispatcher = GeminiDispatcher()
+        for analyzer in (self.sentiment_analyzer, self.summarizer, self.topic_modeller, self.combined_analyzer):
+            analyzer.dispatcher = self.dispatcher
+        self.duplicates = None
+        self.url_stats = {'fetched': 0, 'skipped': 0}
+
+        # Gemini clients are configured by the first run that enables an AI feature,
+        # so scrape-only runs never import google.generativeai
+        self.api_key = api_key if api_key != "YOUR_GEMINI_API_KEY_HERE" else None
+        self._gemini_ready = False
+
+    def _configure_gemini(self):
+        if self._gemini_ready or not self.api_key:
+            return
+        self.sentiment_analyzer.set_api_key(self.api_key)
+        self.summarizer.set_api_key(self.api_key)
+        self.topic_modeller.set_api_key(self.api_key)
+        self.combined_analyzer.set_api_key(self.api_key)
+        self._gemini_ready = True
+
+    def close(self):
+        """Stop the Gemini workers and close the LLM cache (the scraper may be shared, see resources)"""
+        self.dispatcher.close()
+        self.llm_cache.close()
+
+    def prepare_run(self, config: Dict):
+        """Apply the run's politeness and cache settings and reset the per-run counters"""
+        self.scraper.scheduler.configure(
+            config.get('domain_interval', 1.0), config.get('domain_overrides')
+        )
+        if config.get('use_http_cache', True):
+            self.scraper.enable_cache(ttl_hours=config.get('cache_ttl_hours', 24))
+            self.scraper.cache.reset_stats()
+        else:
+            self.scraper.disable_cache()
+
+        self.scraper.max_body_bytes = int(config.get('max_body_mb', 5) * 1024 * 1024)
+        self.scraper.transport.configure_host_pools(config.get('host_pool_sizes'))
+
+        if config.get('use_extraction_profiles', True):
+            self.scraper.enable_profiles()
+            self.scraper.profiles.reset_stats()
+        else:
+            self.scraper.disable_profiles()
+
+        if any([config.get('enable_sentiment'), config.get('enable_summarize'), config.get('enable_topic')]):
+            self._configure_gemini()
+
+        llm_cache = self.llm_cache if config.get('use_llm_cache', True) else None
+        for analyzer in (self.sentiment_analyzer, self.summarizer, self.topic_modeller, self.combined_analyzer):
+            analyzer.cache = llm_cache
+        self.llm_cache.reset_stats()
+
+        self.dispatcher.configure(**config.get('gemini_quota', {}))
+        self.dispatcher.reset_stats()
+
+        self.sentiment_analyzer.local_first = config.get('sentiment_local_first', True)
+        self.sentiment_analyzer.local_threshold = config.get('sentiment_local_threshold', 0.75)
+        self.sentiment_analyzer.reset_tier_stats()
+
+        topic_config = config.get('topic_config', {})
+        self.topic_modeller.local_first = topic_config.get('local_first', True)
+        self.topic_modeller.local_margin = topic_config.get('local_margin', 0.15)
+        self.topic_modeller.reset_tier_stats()
+
+        # Per-run near-duplicate index (row index -> MinHash signature)
+        self.duplicates = None
+        if config.get('group_duplicates'):
+            self.duplicates = NearDuplicateDetector(threshold=config.get('duplicate_threshold', 0.7))
+
+    def get_stats(self, config: Dict) -> Dict:
+        """Counters of the last run as plain data (None for stages that were off)"""
+        ai_enabled = any([config.get('enable_sentiment'), config.get('enable_summarize'), config.get('enable_topic')])
+        groups = self.duplicates.groups() if self.duplicates is not None else None
+        return {
+            'http_cache': self.scraper.cache.get_stats() if self.scraper.cache else None,
+            'profiles': self.scraper.profiles.get_stats() if self.scraper.profiles else None,
+            'llm_cache': self.llm_cache.get_stats() if config.get('use_llm_cache') and ai_enabled else None,
+            'sentiment_tiers': dict(self.sentiment_analyzer.tier_stats) if config.get('enable_sentiment') else None,
+            'topic_tiers': dict(self.topic_modeller.tier_stats) if config.get('enable_topic') else None,
+            'urls': dict(self.url_stats),
+            'duplicates': {
+                'groups': len(groups), 'copies': sum(len(members) - 1 for members in groups.values())
+            } if groups is not None else None,
+            'gemini': dict(self.dispatcher.stats) if ai_enabled else None,
+        }
+
+    def _fetch_concurrently(self, urls: List[str], config: Dict):
+        """Yield (index, fetched, source) as each URL finishes, with many fetches in flight.
+        URL variants of the same article (tracking parameters, AMP/mobile mirrors, ...)
+        are fetched once and the result is yielded for every row that asked for it;
+        source is the row whose fetch it was (the row itself for fetched rows)."""
+        to_fetch, aliases = dedupe_urls(urls)
+        self.url_stats = {'fetched': len(to_fetch), 'skipped': sum(len(rows) for rows in aliases.values())}
+        if self.url_stats['skipped']:
+            print(f"🔗 {self.url_stats['skipped']} URL varian digabung, {len(to_fetch)} URL diunduh")
+
+        # Without scraping a row only uses the title and author <meta> of the page (the AI
+        # stages read the snippet), so the download stops at </head>
+        head_only = not config['enable_scraping']
+        engine = FetchEngine(
+            self.scraper,
+            concurrency=config.get('fetch_concurrency', 16),
+            timeout=config['scraping_timeout'],
+            basic_only=not config['enable_scraping'],
+            head_only=head_only
+        )
+        if config.get('parse_workers', 0) > 0 and not head_only and len(to_fetch) >= MIN_PARSE_POOL_URLS:
+            self.scraper.parse_pool = ParsePool(workers=config['parse_workers'])
+        try:
+            for i, fetched in engine.iter_completed(to_fetch.items()):
+                yield i, fetched, i
+                for alias in aliases.get(i, []):
+                    yield alias, fetched, i
+        finally:
+            engine.close()
+            if self.scraper.parse_pool is not None:
+                self.scraper.parse_pool.close()
+                self.scraper.parse_pool = None
+            if self.scraper.profiles:
+                self.scraper.profiles.save()
+
+    def _analyze_row(self, row_index: int, result: Dict, url: str, analysis_text: str, document, config: Dict,
+                     suffix: str = '', pending_topics: Optional[List] = None):
+        """Journalist, sentiment, summary and topic for one row (suffix '_New' for Excel columns).
+        In batch topic mode the row is queued in pending_topics instead (see _resolve_batched_topics)"""
+        batch_topics = pending_topics is not None and config['topic_config'].get('batch')
+        # 2. Journalist Detection
+        if config['enable_journalist']:
+            if analysis_text:
+                result[f'Journalist{suffix}'] = self.journalist_detector.detect_journalist(url, analysis_text, document=document)
+            else:
+                result[f'Journalist{suffix}'] = 'Tidak ada konten'
+
+        # Fused mode: one request for every AI task this row qualifies for;
+        # tasks the model did not answer fall back to their own call below
+        text_length = len(analysis_text.strip()) if analysis_text else 0
+
+        # Local sentiment tier first, so rows it settles are left out of the AI call
+        local_sentiment = None
+        if config['enable_sentiment'] and config['sentiment_context'] and text_length > 5:
+            local_sentiment = self.sentiment_analyzer.analyze_locally(analysis_text, config['sentiment_context'])
+
+        # Same for topics from a user list (batch mode classifies the whole batch at once later)
+        local_topic = None
+        if config['enable_topic'] and text_length > 50 and not batch_topics:
+            local_topic = self.topic_modeller.classify_locally([analysis_text], config['topic_config'])[0]
+
+        fused = {}
+        if config.get('combine_ai_calls'):
+            tasks = []
+            if config['enable_sentiment'] and config['sentiment_context'] and text_length > 5 and not local_sentiment:
+                tasks.append('sentiment')
+            if config['enable_summarize'] and text_length > 50:
+                tasks.append('summary')
+            if config['enable_topic'] and text_length > 50 and not batch_topics and not local_topic:
+                tasks.append('topic')
+            if len(tasks) >= 2:
+                fused = self.combined_analyzer.analyze(analysis_text, tasks, config)
+
+        # 3. Sentiment Analysis
+        if config['enable_sentiment'] and config['sentiment_context']:
+            if analysis_text and len(analysis_text.strip()) > 5:
+                if fused.get('sentiment'):
+                    self.sentiment_analyzer.record_tier('gemini')
+                sentiment = local_sentiment or fused.get('sentiment') or self.sentiment_analyzer.analyze_sentiment(
+                    analysis_text, config['sentiment_context'], local_first=False
+                )
+                if sentiment:
+                    result.update({
+                        f'Sentiment{suffix}': sentiment.get('sentiment', 'Gagal'),
+                        f'Confidence{suffix}': sentiment.get('confidence', ''),
+                        f'Reasoning{suffix}': sentiment.get('reasoning', '')
+                    })
+                else:
+                    result.update({f'Sentiment{suffix}': 'Gagal Analisis AI'})
+            else:
+                result.update({f'Sentiment{suffix}': 'Konten tidak cukup'})
+
+        # 4. Summarize
+        if config['enable_summarize']:
+            if analysis_text and len(analysis_text.strip()) > 50:
+                summary = fused.get('summary') or self.summarizer.summarize_article(
+                    analysis_text, config['summarize_config']
+                )
+                result[f'Summary{suffix}'] = summary.get('summary', 'Gagal summarize') if summary else 'Gagal summarize'
+            else:
+                result[f'Summary{suffix}'] = 'Konten terlalu pendek'
+
+        # 5. Topic Modelling
+        if config['enable_topic']:
+            if analysis_text and len(analysis_text.strip()) > 50:
+                if batch_topics:
+                    pending_topics.append((row_index, result, analysis_text))
+                else:
+                    if fused.get('topic'):
+                        self.topic_modeller.record_tier('gemini')
+                    topic = local_topic or fused.get('topic') or self.topic_modeller.determine_topic(
+                        analysis_text, config['topic_config'], local_first=False
+                    )
+                    result[f'Topic{suffix}'] = topic
+            else:
+                result[f'Topic{suffix}'] = 'Konten terlalu pendek'
+
+    def _analyze_safely(self, row_index: int, result: Dict, url: str, analysis_text: str, document, config: Dict,
+                        suffix: str = '', pending_topics: Optional[List] = None):
+        try:
+            self._analyze_row(row_index, result, url, analysis_text, document, config, suffix, pending_topics)
+        except Exception as e:
+            print(f"❌ Error analyzing row: {str(e)}")
+            if not suffix:
+                # Manual input: the row becomes an error row
+                result.clear()
+                result.update({'URL': url, 'Title': f'Error: {str(e)}'})
+
+    def _resolve_batched_topics(self, pending_topics: List, config: Dict, suffix: str = ''):
+        """Topics for the queued rows with a few multi-article prompts"""
+        if not pending_topics:
+            return
+        topics = self.topic_modeller.determine_topics_batch(
+            [text for _, _, text in pending_topics],
+            config['topic_config'],
+            token_budget=config['topic_config'].get('batch_token_budget', 8000)
+        )
+        for (_, result, _), topic in zip(pending_topics, topics):
+            result[f'Topic{suffix}'] = topic
+
+    def _row_config(self, row_index: int, analysis_text: str, config: Dict) -> Tuple[Dict, Optional[int]]:
+        """Config for one row and its group leader: near-duplicates of an earlier row skip
+        the AI stages, their results are copied from the leader once it has finished"""
+        if self.duplicates is None or not analysis_text:
+            return config, None
+        leader = self.duplicates.add(row_index, analysis_text)
+        if leader is None:
+            return config, None
+        return {**config, 'enable_sentiment': False, 'enable_summarize': False, 'enable_topic': False}, leader
+
+    def process_urls(self, urls: List[str], config: Dict, on_progress: Optional[Callable[[Dict], None]] = None,
+                     skip: Optional[Set[int]] = None) -> Iterator[Tuple[int, Dict]]:
+        """Manual URL input: one row per URL; rows in `skip` (finished earlier) are left out"""
+        def build_row(i: int, fetched: Optional[Dict]):
+            result = {'URL': urls[i]}
+            result['Title'] = fetched['title'] if fetched['title'] else 'Gagal mengambil judul'
+
+            article_data = fetched['article_data']
+            content = article_data.get('content', '') if article_data else ''
+            if config['enable_scraping']:
+                if article_data:
+                    result['Content'] = content
+                    result['Scraping_Method'] = article_data.get('method', 'unknown')
+                else:
+                    result['Content'] = 'Gagal scraping'
+                    result['Scraping_Method'] = 'failed'
+            return result, content, fetched['document']
+
+        yield from self._process(urls, build_row, config, suffix='', on_progress=on_progress, skip=skip)
+
+    def process_records(self, records: List[Dict], column_mapping: Dict, config: Dict,
+                        on_progress: Optional[Callable[[Dict], None]] = None,
+                        skip: Optional[Set[int]] = None) -> Iterator[Tuple[int, Dict]]:
+        """Excel/tabular input: the original columns plus *_New result columns"""
+        urls = []
+        for record in records:
+            url = record.get(column_mapping['url_column'], '')
+            urls.append('' if url is None or url != url else str(url).strip())  # url != url: NaN
+
+        def build_row(i: int, fetched: Optional[Dict]):
+            record = records[i]
+            result = dict(record)
+
+            snippet = ""
+            content = ""
+            if column_mapping['snippet_column']:
+                snippet = str(record.get(column_mapping['snippet_column'], ''))
+                if snippet == 'nan': snippet = ""
+
+            document = fetched['document'] if fetched else None
+            if fetched and fetched['title']:
+                result['Title_New'] = fetched['title']
+
+            if config['enable_scraping'] and fetched:
+                article_data = fetched['article_data']
+                if article_data:
+                    result['Content_New'] = article_data.get('content', '')
+                    result['Scraping_Method_New'] = article_data.get('method', 'unknown')
+                    content = article_data.get('content', '')
+                elif fetched.get('error'):
+                    result['Content_New'] = f"Error scraping: {fetched['error']}"
+                    result['Scraping_Method_New'] = 'error'
+                else:
+                    result['Content_New'] = 'Gagal scraping'
+                    result['Scraping_Method_New'] = 'failed'
+
+            analysis_text = content if content and len(content.strip()) > 10 else snippet
+            return result, analysis_text, document
+
+        yield from self._process(urls, build_row, config, suffix='_New', on_progress=on_progress, skip=skip)
+
+    def _process(self, urls: List[str], build_row: Callable, config: Dict, suffix: str = '',
+                 on_progress: Optional[Callable[[Dict], None]] = None,
+                 skip: Optional[Set[int]] = None) -> Iterator[Tuple[int, Dict]]:
+        """Fetch, build and analyze every row not in `skip`, yielding rows as soon as they are
+        complete: analysis done, batched topic resolved and, for near-duplicates, the leader finished"""
+        self.prepare_run(config)
+        skip = skip or set()
+        active = [i for i in range(len(urls)) if i not in skip]
+        total = len(active)
+        progress = {'fetched': 0, 'analyzed': 0, 'total': total}
+        batch_topics = config['enable_topic'] and config['topic_config'].get('batch')
+
+        rows: Dict[int, Dict] = {}          # built, not yet yielded
+        analysis: Dict[int, object] = {}    # row index -> analysis future
+        analyzed: List[int] = []            # analysis done, waiting to be yielded
+        pending_topics: List = []           # (row index, result, text) queued by analysis threads
+        leaders: Dict[int, int] = {}        # duplicate row -> group leader
+        url_sources: Dict[int, int] = {}    # URL variant row -> row that fetched the article
+        leader_columns: Dict[int, Dict] = {}  # AI columns of finished rows, for their copies
+        numbered = set()                    # leaders already given their Duplicate_Group number
+
+        def report(status: Optional[str] = None):
+            if on_progress:
+                on_progress({**progress, **self.dispatcher.queue_depth(), 'status': status})
+
+        def start(i: int, fetched: Optional[Dict], source: Optional[int] = None):
+            progress['fetched'] += 1
+            try:
+                result, analysis_text, document = build_row(i, fetched)
+            except Exception as e:
+                print(f"❌ Error: {urls[i][:30]}... - {str(e)[:50]}...")
+                rows[i] = {'URL': urls[i], 'Title': f'Error: {str(e)}'}
+                analyzed.append(i)
+                return
+            rows[i] = result
+            if source is not None and source != i:
+                # Same article as the source row: its AI results are copied, not recomputed
+                url_sources[i] = source
+                row_config = {**config, 'enable_sentiment': False, 'enable_summarize': False, 'enable_topic': False}
+            else:
+                row_config, leader = self._row_config(i, analysis_text, config)
+                if leader is not None:
+                    leaders[i] = leader
+            analysis[i] = self.dispatcher.submit(
+                self._analyze_safely, i, result, urls[i], analysis_text, document, row_config,
+                suffix, pending_topics if batch_topics else None
+            )
+
+        def finished(final: bool = False) -> Iterator[Tuple[int, Dict]]:
+            for i in [i for i, future in analysis.items() if future.done()]:
+                del analysis[i]
+                analyzed.append(i)
+                progress['analyzed'] += 1
+
+            if pending_topics and (len(pending_topics) >= TOPIC_FLUSH_ROWS or (final and not analysis)):
+                batch = pending_topics[:TOPIC_FLUSH_ROWS] if not final else list(pending_topics)
+                del pending_topics[:len(batch)]
+                report(f"Menentukan topik {len(batch)} baris secara batch...")
+                self._resolve_batched_topics(batch, config, suffix)
+
+            waiting = {entry[0] for entry in pending_topics}
+            # Repeat: a leader finishing in this pass releases its duplicates and URL variants
+            released = True
+            while released:
+                released = False
+                for i in list(analyzed):
+                    if i in waiting:
+                        continue
+                    result = rows[i]
+                    leader = leaders.get(i)
+                    source = url_sources.get(i)
+                    if source is not None:
+                        if source not in leader_columns:
+                            continue
+                        result.update(leader_columns[source])
+                    elif leader is not None:
+                        if leader not in leader_columns:
+                            continue
+                        result.update(leader_columns[leader])
+                        result['Duplicate_Group'] = leader + 1
+                        if leader not in numbered:
+                            numbered.add(leader)
+                            yield leader, {'Duplicate_Group': leader + 1}
+                    if self.duplicates is not None:
+                        result.setdefault('Duplicate_Group', '')
+                    # Any finished row can be the source of a URL variant, copies included
+                    leader_columns[i] = {
+                        f'{column}{suffix}': result[f'{column}{suffix}']
+                        for column in AI_RESULT_COLUMNS if f'{column}{suffix}' in result
+                    }
+                    analyzed.remove(i)
+                    released = True
+                    yield i, rows.pop(i)
+            report()
+
+        # Baris tanpa URL langsung dianalisis dari snippet
+        for i in active:
+            if not urls[i]:
+                start(i, None)
+        yield from finished()
+
+        # URL diproses sesuai urutan selesainya download; analisis AI berjalan paralel di dispatcher
+        fetch_urls = ['' if i in skip else url for i, url in enumerate(urls)]
+        for i, fetched, source in self._fetch_concurrently(fetch_urls, config):
+            start(i, fetched, source)
+            yield from finished()
+
+        while analysis or analyzed or pending_topics:
+            if analysis:
+                wait(list(analysis.values()), timeout=0.5, return_when=FIRST_COMPLETED)
+            yield from finished(final=True)
+        report("Selesai!")
@@ -0,0 +1,76 @@
+# resources.py
+
+import atexit
+import multiprocessing.util
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+class ResourceRegistry:
+    """Heavyweight components created once per process and shared by every session.
+
+    Streamlit re-executes app.py on each interaction but keeps imported modules, so
+    anything held here (scraper and its connection pool, Gemini clients, SQLite
+    caches, job workers) survives reruns and is shared across browser sessions.
+    Each resource is built on first use and torn down in reverse creation order
+    when the process exits, or explicitly with release() / close().
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, Any] = {}
+        self._teardowns: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._order: List[str] = []
+        self._lock = threading.RLock()
+
+    def get(self, name: str, factory: Callable[[], Any], teardown: Optional[Callable[[Any], None]] = None) -> Any:
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = factory()
+                self._teardowns[name] = teardown
+                self._order.append(name)
+            return self._resources[name]
+
+    def release(self, name: str):
+        """Tear one resource down; the next get() builds it again"""
+        with self._lock:
+            if name not in self._resources:
+                return
+            resource = self._resources.pop(name)
+            teardown = self._teardowns.pop(name)
+            self._order.remove(name)
+        if teardown is not None:
+            try:
+                teardown(resource)
+            except Exception as e:
+                print(f"⚠️ Gagal menutup {name}: {str(e)}")
+
+    def close(self):
+        for name in reversed(list(self._order)):
+            self.release(name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._order)
+
+registry = ResourceRegistry()
+atexit.register(registry.close)
+# Worker processes (parse pool, job runner) skip atexit; multiprocessing finalizers still run
+multiprocessing.util.Finalize(registry, registry.close, exitpriority=10)
+
+def get_scraper():
+    from scraper import NewsScraper
+    return registry.get('scraper', NewsScraper, lambda scraper: scraper.close())
+
+def get_user_agent_stats() -> Dict:
+    """User-Agent counts for the header (they never change within a process)"""
+    return registry.get('user_agent_stats', lambda: get_scraper().get_user_agent_stats())
+
+def get_pipeline(api_key: Optional[str] = None):
+    """Pipeline sharing this process's scraper; Gemini clients are configured once here"""
+    from pipeline import NewsPipeline
+    return registry.get(
+        'pipeline', lambda: NewsPipeline(api_key=api_key, scraper=get_scraper()), lambda pipeline: pipeline.close()
+    )
+
+def get_job_runner():
+    from job_runner import JobRunner
+    return registry.get('job_runner', JobRunner, lambda runner: runner.close())
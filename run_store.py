@@ -0,0 +1,260 @@
+# run_store.py
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from http_cache import CACHE_DIR
+from lazy_imports import lazy_import
+
+# Only the readers below need pandas; job workers write rows without it
+pd = lazy_import('pandas')
+
+# Settings that change how fast a run goes, not what it produces; left out of the run id
+RUNTIME_CONFIG_KEYS = {
+    'fetch_concurrency', 'parse_workers', 'gemini_quota', 'domain_interval', 'domain_overrides',
+    'use_http_cache', 'cache_ttl_hours', 'use_llm_cache', 'use_extraction_profiles', 'max_body_mb',
+    'host_pool_sizes',
+}
+
+# Runs not touched for this long are deleted when a store is opened
+MAX_RUN_AGE = 7 * 24 * 3600
+
+class RunStore:
+    """Durable results of batch runs in SQLite, keyed by run id and row index.
+
+    The run id is a hash of the input and the result-affecting config, so the same
+    upload with the same settings maps to the same run after a Streamlit rerun, a
+    browser refresh or a worker restart. Every finished row is written as soon as
+    its batch is flushed: a rerun reloads the rows instead of recomputing them and
+    an interrupted run resumes with the rows that are not stored yet. Writing the
+    same row index again merges the new columns into the stored row.
+
+    Each run also carries its job status, last progress report and final stats, so
+    a run processed in another process (see job_runner) can be followed from here.
+    """
+
+    def __init__(self, run_id: str, path: Optional[str] = None):
+        self.run_id = run_id
+        self.path = path or os.path.join(CACHE_DIR, 'runs.sqlite')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                total INTEGER,
+                status TEXT,
+                created_at REAL,
+                updated_at REAL
+            )
+        ''')
+        # Job columns (stores created before background jobs lack them)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(runs)').fetchall()}
+        for column in ('meta', 'progress', 'stats', 'error'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE runs ADD COLUMN {column} TEXT')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS rows (
+                run_id TEXT,
+                row_index INTEGER,
+                data BLOB,
+                seq INTEGER,
+                PRIMARY KEY (run_id, row_index)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_rows_seq ON rows(run_id, seq)')
+        self._conn.commit()
+        self._prune()
+        self._seq = self._conn.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM rows WHERE run_id = ?', (run_id,)
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_run_id(run_input, config: Dict) -> str:
+        """Hash of the input (URLs, or file hash + column mapping) and the result-affecting config"""
+        settings = {key: value for key, value in config.items() if key not in RUNTIME_CONFIG_KEYS}
+        payload = json.dumps({'input': run_input, 'config': settings}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+    @staticmethod
+    def _encode(row: Dict) -> bytes:
+        return zlib.compress(pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _decode(data: bytes) -> Dict:
+        return pickle.loads(zlib.decompress(data))
+
+    def _prune(self):
+        cutoff = time.time() - MAX_RUN_AGE
+        with self._lock:
+            old = [run_id for (run_id,) in self._conn.execute(
+                'SELECT run_id FROM runs WHERE updated_at < ?', (cutoff,)
+            ).fetchall()]
+            for run_id in old:
+                self._conn.execute('DELETE FROM rows WHERE run_id = ?', (run_id,))
+                self._conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+            self._conn.commit()
+
+    def queue(self, total: int, meta: Optional[Dict] = None):
+        """Register (or reopen) the run as waiting for a worker; rows already stored are kept"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO runs (run_id, total, status, created_at, updated_at, meta) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(run_id) DO UPDATE SET total = excluded.total, status = excluded.status, '
+                'updated_at = excluded.updated_at, meta = excluded.meta, error = NULL',
+                (self.run_id, total, 'queued', now, now, json.dumps(meta or {}, default=str))
+            )
+            self._conn.commit()
+
+    def _set(self, **columns):
+        assignments = ', '.join(f'{name} = ?' for name in columns)
+        with self._lock:
+            self._conn.execute(
+                f'UPDATE runs SET {assignments}, updated_at = ? WHERE run_id = ?',
+                (*columns.values(), time.time(), self.run_id)
+            )
+            self._conn.commit()
+
+    def start(self, total: int):
+        """Mark the run as being processed (registering it first if needed)"""
+        if self.status() is None:
+            self.queue(total)
+        self._set(total=total, status='running', error=None)
+
+    def finish(self, stats: Optional[Dict] = None):
+        self._set(status='done', stats=json.dumps(stats or {}, default=str))
+
+    def fail(self, error: str):
+        self._set(status='failed', error=error)
+
+    def cancel(self):
+        """Ask the worker to stop after its current batch; finished rows are kept"""
+        self._set(status='cancelled')
+
+    def set_progress(self, progress: Dict):
+        self._set(progress=json.dumps(progress, default=str))
+
+    def status(self) -> Optional[str]:
+        """'queued', 'running', 'done', 'failed', 'cancelled', or None for a new run"""
+        with self._lock:
+            row = self._conn.execute('SELECT status FROM runs WHERE run_id = ?', (self.run_id,)).fetchone()
+        return row[0] if row else None
+
+    def info(self) -> Optional[Dict]:
+        """The run's status, size, progress, stats and meta, with the number of stored rows"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, total, meta, progress, stats, error, updated_at FROM runs WHERE run_id = ?',
+                (self.run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, total, meta, progress, stats, error, updated_at = row
+        return {
+            'run_id': self.run_id, 'status': status, 'total': total, 'done': self.count(),
+            'meta': json.loads(meta or '{}'), 'progress': json.loads(progress or '{}'),
+            'stats': json.loads(stats or '{}'), 'error': error, 'updated_at': updated_at,
+        }
+
+    def is_complete(self) -> bool:
+        return self.status() == 'done'
+
+    def clear(self):
+        """Forget the run's rows so it is processed again from the start"""
+        with self._lock:
+            self._conn.execute('DELETE FROM rows WHERE run_id = ?', (self.run_id,))
+            self._conn.execute('DELETE FROM runs WHERE run_id = ?', (self.run_id,))
+            self._conn.commit()
+            self._seq = 0
+
+    def put_many(self, rows: Iterable[Tuple[int, Dict]]):
+        """Write a batch of (row_index, row); partial rows are merged into what is stored"""
+        with self._lock:
+            for row_index, row in rows:
+                stored = self._conn.execute(
+                    'SELECT data FROM rows WHERE run_id = ? AND row_index = ?', (self.run_id, row_index)
+                ).fetchone()
+                if stored is not None:
+                    row = {**self._decode(stored[0]), **row}
+                self._seq += 1
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?)',
+                    (self.run_id, row_index, self._encode(row), self._seq)
+                )
+            self._conn.execute('UPDATE runs SET updated_at = ? WHERE run_id = ?', (time.time(), self.run_id))
+            self._conn.commit()
+
+    def consume(self, rows: Iterator[Tuple[int, Dict]], batch_rows: int = 25, flush_seconds: float = 2.0,
+                on_flush: Optional[Callable[[], None]] = None) -> bool:
+        """Write a pipeline's rows in batches (every batch_rows rows or flush_seconds).
+        Stops early when the run is cancelled; returns True when every row was written."""
+        batch = []
+        last_flush = time.monotonic()
+        for row_index, row in rows:
+            batch.append((row_index, row))
+            if len(batch) >= batch_rows or time.monotonic() - last_flush >= flush_seconds:
+                self.put_many(batch)
+                batch = []
+                last_flush = time.monotonic()
+                if on_flush:
+                    on_flush()
+                if self.status() == 'cancelled':
+                    rows.close()
+                    return False
+        self.put_many(batch)
+        return True
+
+    def done_rows(self) -> Set[int]:
+        """Row indices already finished (skipped when the run resumes)"""
+        with self._lock:
+            return {row_index for (row_index,) in self._conn.execute(
+                'SELECT row_index FROM rows WHERE run_id = ?', (self.run_id,)
+            ).fetchall()}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM rows WHERE run_id = ?', (self.run_id,)).fetchone()[0]
+
+    def latest(self, limit: int) -> 'pd.DataFrame':
+        """The most recently finished rows, in input order (live preview)"""
+        with self._lock:
+            data = self._conn.execute(
+                'SELECT row_index, data FROM rows WHERE run_id = ? ORDER BY seq DESC LIMIT ?', (self.run_id, limit)
+            ).fetchall()
+        return pd.DataFrame([self._decode(blob) for _, blob in sorted(data)])
+
+    def iter_items(self, chunk_size: int = 500) -> Iterator[Tuple[int, Dict]]:
+        """Every stored (row_index, row) in input order, read chunk by chunk"""
+        last = -1
+        while True:
+            with self._lock:
+                chunk = self._conn.execute(
+                    'SELECT row_index, data FROM rows WHERE run_id = ? AND row_index > ? ORDER BY row_index LIMIT ?',
+                    (self.run_id, last, chunk_size)
+                ).fetchall()
+            if not chunk:
+                return
+            for row_index, blob in chunk:
+                yield row_index, self._decode(blob)
+            last = chunk[-1][0]
+
+    def iter_rows(self, chunk_size: int = 500) -> Iterator[Dict]:
+        """Every stored row in input order"""
+        for _, row in self.iter_items(chunk_size):
+            yield row
+
+    def to_dataframe(self) -> 'pd.DataFrame':
+        return pd.DataFrame(list(self.iter_rows()))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
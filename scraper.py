@@ -1,14 +1,155 @@
+import asyncio
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-import re
-from typing import Dict, Optional
-import time
+from typing import Dict, List, Optional
 import random
 
+from domain_scheduler import DomainScheduler
+from http_cache import HttpCache
+from http_transport import HttpTransport
+from content_extractor import ContentExtractor, parse_html
+from extraction_profiles import ExtractionProfiles
+from lazy_imports import lazy_import
+
+# newspaper3k pulls in nltk, PIL, feedparser, ...: imported when the first page is parsed
+newspaper = lazy_import('newspaper')
+bs4 = lazy_import('bs4')
+
+# Title and publish date straight from the lxml tree, most specific first (profile hits
+# skip the newspaper3k parse, see NewsScraper._scrape_with_profile)
+META_TITLE = (
+    '//meta[@property="og:title"]/@content',
+    '//meta[@name="twitter:title"]/@content',
+    '//title/text()',
+)
+META_PUBLISH_DATE = (
+    '//meta[@property="article:published_time"]/@content',
+    '//meta[@name="pubdate" or @name="publishdate" or @name="publish-date"]/@content',
+    '//meta[@itemprop="datePublished"]/@content',
+    '//meta[@name="content_PublishedDate" or @name="dtk:publishdate"]/@content',
+    '//time[@datetime]/@datetime',
+)
+
+# Default cap for a full page; Indonesian portals are 0.3-2 MB, anything far above is pathological
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+class FetchedDocument:
+    """Hasil satu kali download URL, dipakai bersama untuk judul, konten, tanggal dan jurnalis"""
+
+    def __init__(self, url: str, content: bytes, final_url: Optional[str] = None, status_code: Optional[int] = None,
+                 from_cache: bool = False, truncated: bool = False):
+        self.url = url
+        self.final_url = final_url or url
+        self.content = content or b''
+        self.status_code = status_code
+        self.from_cache = from_cache
+        # Partial body: only <head> (metadata-only fetch) or cut at the size limit
+        self.truncated = truncated
+        # Title/journalist already computed by a parse worker (see parse_pool), so the
+        # main process never parses this page itself
+        self.metadata: Optional[Dict] = None
+        self._html = None
+        self._soup = None
+        self._tree = None
+        self._tree_parsed = False
+        self._article = None
+        self._article_parsed = False
+
+    @property
+    def html(self) -> str:
+        """Raw HTML as text (encoding detected the same way BeautifulSoup does)"""
+        if self._html is None:
+            self._html = bs4.UnicodeDammit(self.content, is_html=True).unicode_markup or ''
+        return self._html
+
+    @property
+    def soup(self):
+        """Shared parsed tree (read only)"""
+        if self._soup is None:
+            self._soup = bs4.BeautifulSoup(self.content, 'lxml')
+        return self._soup
+
+    @property
+    def tree(self):
+        """Shared lxml tree (read only) for xpath lookups such as author metadata"""
+        if not self._tree_parsed:
+            self._tree_parsed = True
+            self._tree = parse_html(self.html)
+        return self._tree
+
+    @property
+    def article(self):
+        """newspaper3k Article parsed from the already downloaded HTML (no extra request)"""
+        if not self._article_parsed:
+            self._article_parsed = True
+            try:
+                article = newspaper.Article(self.url)
+                article.download(input_html=self.html)
+                article.parse()
+                self._article = article
+            except Exception as e:
+                print(f"📰 Newspaper3k parse failed for {self.url}: {str(e)}")
+        return self._article
+
+    def _first_meta(self, queries) -> str:
+        tree = self.tree
+        if tree is None:
+            return ''
+        for query in queries:
+            for value in tree.xpath(query):
+                text = ' '.join(str(value).split())
+                if text:
+                    return text
+        return ''
+
+    @property
+    def meta_title(self) -> str:
+        """Title from og:title / twitter:title / <title>, without a newspaper3k parse"""
+        return self._first_meta(META_TITLE)
+
+    @property
+    def meta_publish_date(self) -> str:
+        return self._first_meta(META_PUBLISH_DATE)
+
+    @property
+    def title(self) -> str:
+        article = self.article
+        return article.title if article and article.title else ''
+
+    @property
+    def publish_date(self) -> str:
+        article = self.article
+        return str(article.publish_date) if article and article.publish_date else ''
+
+    @property
+    def authors(self) -> List[str]:
+        article = self.article
+        return list(article.authors) if article and article.authors else []
+
 class NewsScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        # Pooled keep-alive transport shared by every fetch path, newspaper3k included
+        self.transport = transport or HttpTransport()
+        
+        # Jeda per domain menggantikan sleep acak sebelum setiap URL. Berlaku per proses:
+        # JobRunner mengalikan jedanya dengan jumlah job (lihat domain_intervals_per_job)
+        self.scheduler = DomainScheduler()
+        
+        # Cache HTTP persisten (None = selalu download)
+        self.cache: Optional[HttpCache] = None
+        self._http_cache: Optional[HttpCache] = None
+        
+        # Batas ukuran body untuk scraping penuh (None = tanpa batas)
+        self.max_body_bytes: Optional[int] = MAX_BODY_BYTES
+        
+        # Ekstraksi konten satu kali jalan (lxml) untuk fallback non-newspaper3k
+        self.extractor = ContentExtractor()
+        
+        # Metode/xpath pemenang per situs (None = selalu pencarian penuh)
+        self.profiles: Optional[ExtractionProfiles] = None
+        self._profiles: Optional[ExtractionProfiles] = None
+        
+        # Pool proses untuk parsing (None = parsing di thread fetch)
+        self.parse_pool = None
         
         # Multiple User-Agents untuk rotasi random
         self.user_agents = [
@@ -53,36 +194,19 @@ class NewsScraper:
             'Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36'
         ]
         
-        # Set initial random user agent
-        self._rotate_user_agent()
-    
-    def _rotate_user_agent(self):
-        """Rotate user agent randomly"""
-        selected_ua = random.choice(self.user_agents)
-        
-        self.session.headers.update({
-            'User-Agent': selected_ua,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7',  # Prioritas Indonesia
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-            'DNT': '1'  # Do Not Track
-        })
+        # Last User-Agent handed out (display only; headers are built per request)
+        self.last_user_agent = None
         
-        # Log user agent yang dipilih (untuk debugging)
-        print(f"🔄 Using User-Agent: {selected_ua[:60]}...")
+        # newspaper3k downloads (Article.download without HTML) also go through the pool,
+        # hooked in once newspaper3k is actually imported
+        newspaper.on_load(lambda module: self.transport.route_newspaper(self.get_random_headers))
     
     def get_random_headers(self, url: str = None) -> Dict[str, str]:
         """Generate random headers with Indonesian language priority"""
         
         # Rotate user agent untuk setiap request
         user_agent = random.choice(self.user_agents)
+        self.last_user_agent = user_agent
         
         # Detect if it's a bot or browser for different header sets
         is_bot = any(bot in user_agent.lower() for bot in ['bot', 'crawler', 'spider'])
@@ -126,28 +250,126 @@ class NewsScraper:
         
         return headers
     
-    def get_title_newspaper3k(self, url: str) -> Optional[str]:
-        """Get title using newspaper3k - primary method"""
+    def enable_cache(self, ttl_hours: float = 24, path: Optional[str] = None):
+        """Turn on the persistent HTTP cache (shared by every fetch path)"""
+        if self._http_cache is None or (path and self._http_cache.path != path):
+            if self._http_cache is not None:
+                self._http_cache.close()
+            self._http_cache = HttpCache(path=path)
+        self.cache = self._http_cache
+        self.cache.ttl = ttl_hours * 3600
+    
+    def disable_cache(self):
+        # The opened cache is kept for the next run that turns it back on
+        self.cache = None
+    
+    def enable_profiles(self, path: Optional[str] = None):
+        """Remember per site which extraction path wins and try it first next time"""
+        if self._profiles is None or (path and self._profiles.path != path):
+            self._profiles = ExtractionProfiles(path=path)
+        self.profiles = self._profiles
+    
+    def disable_profiles(self):
+        if self.profiles is not None:
+            self.profiles.save()
+        self.profiles = None
+    
+    def close(self):
+        """Save profiles and close the cache and connection pool (process shutdown)"""
+        if self._profiles is not None:
+            self._profiles.save()
+        if self._http_cache is not None:
+            self._http_cache.close()
+        self.cache = self._http_cache = None
+        self.profiles = self._profiles = None
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+        self.transport.close()
+    
+    def is_cached(self, url: str) -> bool:
+        """True when the URL can be served from cache without touching the network"""
+        return self.cache is not None and self.cache.is_cached_fresh(url)
+    
+    def fetch_document(self, url: str, timeout: int = 30, scheduled: bool = False,
+                       head_only: bool = False) -> Optional[FetchedDocument]:
+        """Download URL satu kali; hasilnya dipakai untuk judul, konten dan jurnalis.
+        head_only: berhenti setelah </head> (cukup untuk judul dan metadata)"""
         try:
-            # Rotate user agent sebelum request
-            self._rotate_user_agent()
+            cached = self.cache.get(url) if self.cache else None
+            if cached and self.cache.is_fresh(cached):
+                self.cache.record('hits')
+                print(f"💾 Cache hit: {url[:60]}...")
+                return FetchedDocument(url, cached.body, final_url=cached.final_url,
+                                       status_code=cached.status, from_cache=True)
             
-            article = Article(url)
-            article.download()
-            article.parse()
-            return article.title if article.title else None
+            # Be respectful per site; the fetch engine already waited for the slot when scheduled
+            if not scheduled:
+                self.scheduler.wait(url)
+            
+            headers = self.get_random_headers(url)
+            if cached:
+                # Stale entry: ask the server whether it changed
+                headers.update(self.cache.conditional_headers(cached))
+            print(f"🌐 Fetching: {url[:60]}... ({headers['User-Agent'][:40]}...)")
+            
+            response, body, truncated = self.transport.fetch(
+                url, headers=headers, timeout=timeout,
+                max_bytes=self.max_body_bytes, stop_at=b'</head>' if head_only else None
+            )
+            
+            if cached and response.status_code == 304:
+                self.cache.refresh(url)
+                self.cache.record('revalidated')
+                print(f"💾 Cache revalidated (304): {url[:60]}...")
+                return FetchedDocument(url, cached.body, final_url=cached.final_url,
+                                       status_code=cached.status, from_cache=True)
+            
+            response.raise_for_status()
+            
+            # Check if we got meaningful content
+            if len(body) < 1000 and not head_only:
+                print(f"⚠️ Suspiciously small response: {len(body)} bytes")
+            if truncated and not head_only:
+                print(f"✂️ Response cut at {len(body) // 1024} KB: {url[:60]}...")
+            
+            if self.cache:
+                self.cache.record('misses')
+                # A partial body must never be served later as the full page
+                if not truncated:
+                    self.cache.store(url, response.url, response.status_code, response.headers, body)
+            
+            return FetchedDocument(url, body, final_url=response.url, status_code=response.status_code,
+                                   truncated=truncated)
+            
+        except requests.exceptions.RequestException as e:
+            print(f"🌐 Network error for {url}: {str(e)}")
+            return None
         except Exception as e:
-            print(f"Error getting title with newspaper3k for {url}: {str(e)}")
-            # Fallback to manual extraction
-            return self._get_title_manual(url)
+            print(f"❌ Error fetching {url}: {str(e)}")
+            return None
+    
+    def get_title_newspaper3k(self, url: str, document: Optional[FetchedDocument] = None) -> Optional[str]:
+        """Get title using newspaper3k - primary method"""
+        if document is None:
+            document = self.fetch_document(url, head_only=True)
+        if document is None:
+            return "Gagal mengambil judul"
+        
+        if document.title:
+            return document.title
+        
+        # Fallback to manual extraction
+        return self._get_title_manual(url, document)
     
-    def _get_title_manual(self, url: str) -> Optional[str]:
+    def _get_title_manual(self, url: str, document: Optional[FetchedDocument] = None) -> Optional[str]:
         """Fallback title extraction"""
         try:
-            headers = self.get_random_headers(url)
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if document is None:
+                document = self.fetch_document(url, head_only=True)
+            if document is None:
+                return "Gagal mengambil judul"
+            soup = document.soup
             
             # Try multiple title selectors
             title_selectors = [
@@ -182,224 +404,162 @@ class NewsScraper:
             return "Gagal mengambil judul"
     
     async def scrape_article(self, url: str, timeout: int = 30, basic_only: bool = False) -> Optional[Dict]:
-        """Scrape article using requests + newspaper3k + BeautifulSoup"""
-        return self.scrape_article_sync(url, timeout, basic_only)
+        """Scrape article using requests + newspaper3k + BeautifulSoup without blocking the event loop"""
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self.scrape_article_sync, url, timeout, basic_only),
+                timeout=timeout * 2
+            )
+        except asyncio.TimeoutError:
+            print(f"⏱️ Timeout scraping {url[:60]}...")
+            return None
+    
+    def scrape_url(self, url: str, timeout: int = 30, basic_only: bool = False, scheduled: bool = False,
+                   head_only: bool = False) -> Dict:
+        """Fetch stage for one row: shared document, title and article data
+        (head_only: title/metadata run, only <head> is downloaded and no content is extracted)"""
+        document = self.fetch_document(url, timeout, scheduled=scheduled, head_only=head_only)
+        if document is None:
+            return {'url': url, 'document': None, 'title': 'Gagal mengambil judul', 'article_data': None}
+        
+        if self.parse_pool is not None:
+            # CPU-bound parsing on another core; this fetch thread just waits for the compact result
+            profile = self.profiles.get(document.final_url) if self.profiles and not head_only else None
+            parsed = self.parse_pool.parse(document, basic_only, head_only, profile)
+            document.metadata = parsed
+            if not head_only:
+                self._update_profile(document, profile, parsed['article_data'])
+            return {'url': url, 'document': document, 'title': parsed['title'], 'article_data': parsed['article_data']}
+        
+        article_data = None if head_only else self.scrape_article_sync(url, timeout, basic_only, document=document)
+        return {
+            'url': url,
+            'document': document,
+            'title': self.get_page_title(url, document, article_data),
+            'article_data': article_data
+        }
+
+    def get_page_title(self, url: str, document: FetchedDocument, article_data: Optional[Dict]) -> str:
+        """Title the extraction already found (profile hits read it from the meta tags),
+        otherwise newspaper3k with the manual fallback"""
+        if article_data and article_data.get('title'):
+            return article_data['title']
+        return self.get_title_newspaper3k(url, document=document)
     
-    def scrape_article_sync(self, url: str, timeout: int = 30, basic_only: bool = False) -> Optional[Dict]:
+    def scrape_article_sync(self, url: str, timeout: int = 30, basic_only: bool = False,
+                            document: Optional[FetchedDocument] = None) -> Optional[Dict]:
         """Synchronous scraping method with random user agents"""
         try:
-            # Add random delay to be respectful and avoid rate limiting
-            delay = random.uniform(0.5, 2.0)
-            time.sleep(delay)
-            
-            print(f"🌐 Scraping: {url[:60]}...")
+            if document is None:
+                document = self.fetch_document(url, timeout)
+            if document is None:
+                return None
             
-            # Method 1: Try newspaper3k first (most reliable)
-            article_data = self._scrape_with_newspaper3k(url)
-            if article_data and len(article_data.get('content', '')) > 200:
-                print(f"✅ Success with newspaper3k: {len(article_data.get('content', ''))} chars")
-                return article_data
-            
-            # Method 2: Fallback to manual scraping
-            print("🔄 Fallback to manual scraping...")
-            return self._scrape_with_requests(url, timeout, basic_only)
+            profile = self.profiles.get(document.final_url) if self.profiles else None
+            article_data = self.extract_article(document, basic_only, profile)
+            self._update_profile(document, profile, article_data)
+            return article_data
             
         except Exception as e:
             print(f"❌ Error scraping {url}: {str(e)}")
             return None
     
-    def _scrape_with_newspaper3k(self, url: str) -> Optional[Dict]:
-        """Primary method using newspaper3k with random UA"""
+    def extract_article(self, document: FetchedDocument, basic_only: bool = False,
+                        profile: Optional[Dict] = None) -> Optional[Dict]:
+        """Content extraction only (no network, no shared state), so it also runs in a parse worker.
+        `profile` is the site's remembered extraction path, if any."""
+        print(f"🌐 Scraping: {document.url[:60]}...")
+        
+        # Method 0: the path that won last time on this site
+        article_data = self._scrape_with_profile(document, profile)
+        if article_data:
+            return article_data
+        
+        # Method 1: Try newspaper3k first (most reliable)
+        article_data = self._scrape_with_newspaper3k(document)
+        if article_data and len(article_data.get('content', '')) > 200:
+            print(f"✅ Success with newspaper3k: {len(article_data.get('content', ''))} chars")
+            return article_data
+        
+        # Method 2: Fallback to manual scraping (same HTML, no second download)
+        print("🔄 Fallback to manual scraping...")
+        return self._scrape_with_requests(document, basic_only)
+    
+    def _scrape_with_profile(self, document: FetchedDocument, profile: Optional[Dict]) -> Optional[Dict]:
+        """Remembered method/xpath for the site; None when unknown or the text looks wrong"""
+        if not profile:
+            return None
+        
+        if profile['method'] == 'newspaper3k':
+            # Needs the full Article.parse for the text anyway; title and date come with it
+            article_data = self._scrape_with_newspaper3k(document)
+        else:
+            # Everything from the one lxml tree: no newspaper3k parse on a hit
+            article_data = {
+                'content': self.extractor.extract_at(document.html, profile.get('xpath'), root=document.tree),
+                'url': document.url,
+                'title': document.meta_title,
+                'publish_date': document.meta_publish_date,
+                'method': 'requests_profile'
+            }
+        
+        content = article_data.get('content', '') if article_data else ''
+        if ExtractionProfiles.is_good(profile, content):
+            article_data['profile_hit'] = True
+            return article_data
+        
+        print(f"🧭 Profil ekstraksi tidak cocok, pencarian penuh: {document.url[:60]}...")
+        return None
+    
+    def _update_profile(self, document: FetchedDocument, profile: Optional[Dict], article_data: Optional[Dict]):
+        """Profile bookkeeping in the main process: hit, miss and what the full search found"""
+        if article_data is not None and article_data.pop('profile_hit', False):
+            if self.profiles:
+                self.profiles.record_hit(document.final_url, article_data.get('content', ''))
+            return
+        if self.profiles is None:
+            return
+        if profile:
+            self.profiles.record_miss(document.final_url)
+        if article_data:
+            method = 'newspaper3k' if article_data.get('method') == 'newspaper3k' else 'density'
+            self.profiles.learn(document.final_url, method, article_data.get('xpath'), article_data.get('content', ''))
+    
+    def _scrape_with_newspaper3k(self, document: FetchedDocument) -> Optional[Dict]:
+        """Primary method using newspaper3k on the fetched HTML"""
         try:
-            # Rotate user agent
-            self._rotate_user_agent()
+            article = document.article
             
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            if article.text and len(article.text.strip()) > 100:
+            if article and article.text and len(article.text.strip()) > 100:
                 return {
                     'content': article.text.strip(),
-                    'url': url,
-                    'title': article.title or '',
-                    'publish_date': str(article.publish_date) if article.publish_date else '',
+                    'url': document.url,
+                    'title': document.title,
+                    'publish_date': document.publish_date,
                     'method': 'newspaper3k'
                 }
             
             return None
             
         except Exception as e:
-            print(f"📰 Newspaper3k failed for {url}: {str(e)}")
+            print(f"📰 Newspaper3k failed for {document.url}: {str(e)}")
             return None
     
-    def _scrape_with_requests(self, url: str, timeout: int = 30, basic_only: bool = False) -> Optional[Dict]:
-        """Fallback method using requests + BeautifulSoup with random headers"""
+    def _scrape_with_requests(self, document: FetchedDocument, basic_only: bool = False) -> Optional[Dict]:
+        """Fallback method: single-pass density extractor on the fetched HTML"""
         try:
-            headers = self.get_random_headers(url)
-            print(f"🔧 Using headers: {headers['User-Agent'][:50]}...")
-            
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # Check if we got meaningful content
-            if len(response.content) < 1000:
-                print(f"⚠️ Suspiciously small response: {len(response.content)} bytes")
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract data
-            if basic_only:
-                content = self._extract_content(soup)
-                return {'content': content, 'url': url, 'method': 'requests_basic'}
-            else:
-                article_data = self._extract_article_data(soup, url)
-                article_data['method'] = 'requests_full'
-                return article_data
+            extracted = self.extractor.extract(document.html)
+            return {
+                'content': extracted['content'],
+                'url': document.url,
+                'xpath': extracted['xpath'],
+                'method': 'requests_basic' if basic_only else 'requests_full'
+            }
                 
-        except requests.exceptions.RequestException as e:
-            print(f"🌐 Network error for {url}: {str(e)}")
-            return None
         except Exception as e:
-            print(f"❌ Error scraping with requests {url}: {str(e)}")
+            print(f"❌ Error scraping with requests {document.url}: {str(e)}")
             return None
     
-    def _extract_article_data(self, soup: BeautifulSoup, url: str) -> Dict:
-        # Remove unwanted elements
-        unwanted_elements = [
-            'script', 'style', 'nav', 'header', 'footer', 
-            'sidebar', 'advertisement', 'ads', 'menu',
-            'noscript', 'iframe', 'form', 'button'
-        ]
-        
-        for element_name in unwanted_elements:
-            for element in soup.find_all(element_name):
-                element.decompose()
-        
-        # Remove unwanted classes and IDs
-        unwanted_selectors = [
-            '.ad', '.ads', '.advertisement', '.social-share', 
-            '.related-posts', '.comments', '.comment-section',
-            '.sidebar', '.navigation', '.nav', '.menu',
-            '#comments', '#sidebar', '#navigation'
-        ]
-        
-        for selector in unwanted_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-        
-        # Extract content
-        content = self._extract_content(soup)
-        
-        return {
-            'content': content,
-            'url': url
-        }
-    
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        # Try multiple selectors for article content (prioritized for Indonesian news sites)
-        content_selectors = [
-            # Generic article selectors
-            'article',
-            '[role="main"] article',
-            
-            # Common Indonesian news site patterns
-            '.article-content',
-            '.post-content',
-            '.entry-content',
-            '.article-body',
-            '.post-body',
-            '.content-body',
-            '.detail-content',
-            '.news-content',
-            
-            # Specific patterns with wildcards
-            '[class*="article-content"]',
-            '[class*="post-content"]',
-            '[class*="entry-content"]',
-            '[class*="detail-content"]',
-            '[class*="news-content"]',
-            
-            # Broader selectors
-            '.content',
-            '[class*="content"]',
-            'main article',
-            'main .content',
-            '.text',
-            'main',
-            
-            # Fallback
-            '.container article',
-            '.wrapper article'
-        ]
-        
-        best_content = ""
-        
-        for selector in content_selectors:
-            try:
-                elements = soup.select(selector)
-                for element in elements:
-                    # Additional cleaning for Indonesian news sites
-                    for unwanted in element.select('''
-                        script, style, .ad, .ads, .advertisement, 
-                        .social-share, .related-posts, .comments, 
-                        .comment-section, nav, header, footer,
-                        .breadcrumb, .tags, .category, .meta,
-                        .share-buttons, .social-buttons
-                    '''):
-                        unwanted.decompose()
-                    
-                    text = element.get_text(separator=' ', strip=True)
-                    
-                    # Use the longest meaningful content
-                    if len(text) > len(best_content) and len(text) > 200:
-                        best_content = text
-                        print(f"📄 Found content with selector '{selector}': {len(text)} chars")
-            except Exception as e:
-                print(f"⚠️ Error with selector '{selector}': {e}")
-                continue
-        
-        # If no good content found, try paragraph extraction
-        if len(best_content) < 200:
-            print("🔍 Trying paragraph extraction...")
-            paragraphs = soup.find_all('p')
-            paragraph_texts = []
-            
-            for p in paragraphs:
-                text = p.get_text(strip=True)
-                # Skip very short paragraphs and common non-content patterns
-                if (len(text) > 30 and 
-                    not any(skip in text.lower() for skip in ['copyright', 'baca juga', 'lihat juga', 'follow', 'subscribe'])):
-                    paragraph_texts.append(text)
-            
-            if paragraph_texts:
-                best_content = ' '.join(paragraph_texts)
-                print(f"📝 Paragraph extraction: {len(best_content)} chars")
-        
-        # Clean the content
-        if best_content:
-            # Remove multiple spaces and newlines
-            best_content = re.sub(r'\s+', ' ', best_content)
-            best_content = re.sub(r'\n+', '\n', best_content)
-            
-            # Remove common Indonesian news site artifacts
-            artifacts = [
-                r'Baca juga:.*?(?=\w)',
-                r'Lihat juga:.*?(?=\w)', 
-                r'ADVERTISEMENT',
-                r'CONTINUE READING BELOW',
-                r'Loading...',
-                r'Tunggu sebentar...'
-            ]
-            
-            for artifact in artifacts:
-                best_content = re.sub(artifact, '', best_content, flags=re.IGNORECASE)
-            
-            best_content = best_content.strip()
-        
-        return best_content
-    
     def get_user_agent_stats(self):
         """Get statistics about available user agents"""
         bot_count = sum(1 for ua in self.user_agents if any(bot in ua.lower() for bot in ['bot', 'crawler', 'spider']))
@@ -409,5 +569,5 @@ class NewsScraper:
             'total': len(self.user_agents),
             'bots': bot_count,
             'browsers': browser_count,
-            'current': self.session.headers.get('User-Agent', 'Not set')[:60] + '...'
+            'current': (self.last_user_agent or 'Not set')[:60] + '...'
         }
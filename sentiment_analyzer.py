@@ -1,41 +1,222 @@
-import google.generativeai as genai
-from typing import Dict, Optional
+import numpy as np
+from typing import Dict, List, Optional
 import json
 import re
+import threading
 
-class SentimentAnalyzer:
+from gemini_dispatcher import GeminiClient
+from passage_selector import TASK_TOKEN_BUDGETS, WORD_PATTERN, STOPWORDS, context_terms, select_passages, split_sentences
+
+# Indonesian news sentiment lexicon (weight 2 = strong signal)
+POSITIVE_WORDS = {
+    'baik': 1, 'bagus': 1, 'positif': 1, 'meningkat': 1, 'peningkatan': 1, 'tumbuh': 1, 'pertumbuhan': 1,
+    'untung': 1, 'laba': 1, 'sukses': 1.5, 'berhasil': 1.5, 'keberhasilan': 1.5, 'unggul': 1, 'prestasi': 1.5,
+    'apresiasi': 1, 'puas': 1.5, 'memuaskan': 1.5, 'hebat': 1.5, 'inovatif': 1, 'inovasi': 1, 'efisien': 1,
+    'stabil': 1, 'aman': 1, 'nyaman': 1, 'mudah': 1, 'murah': 1, 'terjangkau': 1, 'menguntungkan': 1,
+    'optimis': 1, 'optimisme': 1, 'dukungan': 1, 'mendukung': 1, 'rekor': 1.5, 'juara': 1.5,
+    'penghargaan': 1.5, 'populer': 1, 'laris': 1.5, 'favorit': 1, 'solusi': 1, 'membaik': 1.5,
+    'pulih': 1, 'pemulihan': 1, 'menguat': 1, 'andal': 1, 'berkualitas': 1, 'unggulan': 1, 'ramah': 1,
+    'canggih': 1, 'terbaik': 2, 'sejahtera': 1, 'bermanfaat': 1, 'manfaat': 1, 'memuji': 1.5, 'pujian': 1.5,
+    'diminati': 1, 'melonjak': 1, 'lancar': 1, 'tangguh': 1, 'hemat': 1, 'irit': 1,
+}
+NEGATIVE_WORDS = {
+    'buruk': 1.5, 'jelek': 1.5, 'negatif': 1, 'menurun': 1, 'penurunan': 1, 'turun': 1, 'anjlok': 1.5,
+    'merosot': 1.5, 'rugi': 1.5, 'kerugian': 1.5, 'gagal': 1.5, 'kegagalan': 1.5, 'masalah': 1,
+    'bermasalah': 1.5, 'keluhan': 1.5, 'mengeluh': 1.5, 'mengeluhkan': 1.5, 'kecewa': 1.5,
+    'mengecewakan': 1.5, 'kritik': 1, 'mengkritik': 1, 'protes': 1, 'skandal': 2, 'korupsi': 2,
+    'tersangka': 1.5, 'penipuan': 2, 'cacat': 1.5, 'rusak': 1.5, 'kerusakan': 1.5, 'kecelakaan': 1.5,
+    'bahaya': 1, 'berbahaya': 1.5, 'mahal': 1, 'lambat': 1, 'lemah': 1, 'melemah': 1, 'krisis': 1.5,
+    'ancaman': 1, 'mengancam': 1, 'gugatan': 1.5, 'recall': 1.5, 'pelanggaran': 1.5, 'melanggar': 1.5,
+    'sanksi': 1.5, 'denda': 1, 'mogok': 1, 'phk': 1.5, 'bangkrut': 2, 'pailit': 2, 'defisit': 1,
+    'boikot': 1.5, 'kontroversi': 1, 'polemik': 1, 'terburuk': 2, 'hoaks': 1.5, 'sengketa': 1,
+    'macet': 1, 'terbakar': 1.5, 'kebakaran': 1.5, 'ditarik': 1, 'lonjakan': 0.5,
+}
+NEGATIONS = {'tidak', 'tak', 'bukan', 'belum', 'kurang', 'tanpa', 'not', 'no'}
+
+# A negation covers the next few words ("tidak terlalu baik") but not past a clause break
+NEGATION_WINDOW = 3
+CLAUSE_BREAKS = {'.', ',', ';', ':', '!', '?'}
+TOKEN_PATTERN = re.compile(r'\w+|[.,;:!?]')
+
+# Evidence (sublinear weighted lexicon matches) needed before a polarity counts as fully confident
+FULL_CONFIDENCE_HITS = 4
+
+class LocalSentimentScorer:
+    """Offline lexicon scorer for Indonesian news, vectorized over a batch of texts.
+
+    Texts become sublinear term-count vectors over the lexicon vocabulary (negated
+    words get their own NOT_ column with the opposite polarity); one matrix product
+    then gives every text's polarity and evidence at once.
+    """
+
+    def __init__(self):
+        weights = {word: weight for word, weight in POSITIVE_WORDS.items()}
+        weights.update({word: -weight for word, weight in NEGATIVE_WORDS.items()})
+
+        self.vocabulary: Dict[str, int] = {}
+        columns = []
+        for word, weight in weights.items():
+            self.vocabulary[word] = len(columns)
+            columns.append(weight)
+            # "tidak baik" is not as strong as "buruk"
+            self.vocabulary[f'NOT_{word}'] = len(columns)
+            columns.append(-0.8 * weight)
+        self.weights = np.array(columns, dtype=float)
+
+    def _columns(self, text: str) -> List[int]:
+        columns = []
+        negate = 0  # words still covered by the last negation
+        for word in TOKEN_PATTERN.findall(text.lower()):
+            if word in NEGATIONS:
+                negate = NEGATION_WINDOW
+                continue
+            if word in CLAUSE_BREAKS:
+                negate = 0
+                continue
+            column = self.vocabulary.get(f'NOT_{word}' if negate else word)
+            if column is not None:
+                columns.append(column)
+                negate = 0
+            elif negate:
+                negate -= 1
+        return columns
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.weights)))
+        for row, text in enumerate(texts):
+            columns = self._columns(text)
+            if columns:
+                np.add.at(matrix[row], columns, 1.0)
+        return np.log1p(matrix)
+
+    def score_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Polarity in [-1, 1], evidence (weighted hits) and confidence in [0, 1] per text"""
+        matrix = self.vectorize(texts)
+        signed = matrix @ self.weights
+        evidence = matrix @ np.abs(self.weights)
+        polarity = np.divide(signed, evidence, out=np.zeros_like(signed), where=evidence > 0)
+        confidence = np.abs(polarity) * np.minimum(1.0, evidence / FULL_CONFIDENCE_HITS)
+        return {'polarity': polarity, 'evidence': evidence, 'confidence': confidence}
+
+def _mentions(text: str, terms) -> bool:
+    """Phrase match, or at least half of the term's significant words (so 'Avanza' alone
+    counts for 'Toyota Avanza'); errs towards escalating rather than calling a row unrelated"""
+    lowered = text.lower()
+    words = set(WORD_PATTERN.findall(lowered))
+    for term, term_words in terms:
+        if term in lowered:
+            return True
+        if term_words and sum(1 for word in term_words if word in words) * 2 >= len(term_words):
+            return True
+    return False
+
+def _context_term_words(context: str):
+    return [(term, [word for word in WORD_PATTERN.findall(term) if word not in STOPWORDS])
+            for term in context_terms(context)]
+
+def mentions_context(content: str, context: str) -> bool:
+    """True when the article mentions any of the context terms"""
+    return _mentions(content or '', _context_term_words(context))
+
+def context_window(content: str, context: str) -> str:
+    """Sentences that mention the context, with their neighbours"""
+    sentences = split_sentences(content)
+    terms = _context_term_words(context)
+    keep = set()
+    for i, sentence in enumerate(sentences):
+        if _mentions(sentence, terms):
+            keep.update({i - 1, i, i + 1})
+    return ' '.join(sentences[i] for i in sorted(keep) if 0 <= i < len(sentences))
+
+class SentimentAnalyzer(GeminiClient):
     def __init__(self):
-        self.api_key = None
-        self.model = None
+        super().__init__()
+        
+        # Offline first tier: unrelated and clear-cut rows never reach Gemini
+        self.local_first = True
+        self.local_threshold = 0.75
+        self.local_scorer = LocalSentimentScorer()
+        self.tier_stats = {'tidak_terkait': 0, 'lokal': 0, 'gemini': 0}
+        self._stats_lock = threading.Lock()
+
+    def analyze_locally(self, content: str, context: str) -> Optional[Dict]:
+        """First tier: settle unrelated and high-confidence rows offline, None = escalate to Gemini"""
+        if not self.local_first:
+            return None
+        
+        if not mentions_context(content, context):
+            self.record_tier('tidak_terkait')
+            return {
+                "sentiment": "tidak terkait",
+                "confidence": "tinggi",
+                "reasoning": f"Konteks '{context}' tidak disebut dalam artikel (analisis lokal)"
+            }
+        
+        window = context_window(content, context) or content
+        scores = self.local_scorer.score_batch([window])
+        polarity, confidence = scores['polarity'][0], scores['confidence'][0]
+        if confidence >= self.local_threshold:
+            self.record_tier('lokal')
+            return {
+                "sentiment": "positif" if polarity > 0 else "negatif",
+                "confidence": "tinggi" if confidence >= 0.9 else "sedang",
+                "reasoning": f"Skor leksikon lokal {polarity:+.2f} pada kalimat yang menyebut konteks (analisis lokal)"
+            }
+        
+        return None
+    
+    def record_tier(self, tier: str):
+        """Count a row for the tier report (also used when the fused call answered sentiment)"""
+        with self._stats_lock:
+            self.tier_stats[tier] += 1
     
-    def set_api_key(self, api_key: str):
-        self.api_key = api_key
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+    def reset_tier_stats(self):
+        with self._stats_lock:
+            for tier in self.tier_stats:
+                self.tier_stats[tier] = 0
     
-    def analyze_sentiment(self, content: str, context: str) -> Optional[Dict]:
+    def analyze_sentiment(self, content: str, context: str, local_first: Optional[bool] = None) -> Optional[Dict]:
+        """Cascade: local tier first (unless local_first=False, e.g. already tried), then Gemini"""
+        if local_first is None or local_first:
+            local = self.analyze_locally(content, context)
+            if local:
+                return local
+        
         if not self.model:
             return None
         
+        self.record_tier('gemini')
         try:
             prompt = self._create_sentiment_prompt(content, context)
-            response = self.model.generate_content(prompt)
+            response_text = self._generate(prompt)
             
             # Parse response
-            return self._parse_sentiment_response(response.text)
+            return self._parse_sentiment_response(response_text)
             
         except Exception as e:
             print(f"Error analyzing sentiment: {str(e)}")
             return None
     
+    def task_instruction(self, context: str) -> str:
+        """Instruksi tugas sentimen untuk prompt gabungan (lihat CombinedAnalyzer)"""
+        return (
+            f'Analisis sentimen artikel berdasarkan KONTEKS: {context}. '
+            'Isi dengan objek {"sentiment": "positif/negatif/netral", "confidence": "tinggi/sedang/rendah", '
+            '"reasoning": "penjelasan singkat mengapa sentimen tersebut dipilih berdasarkan konteks"}. '
+            'Fokus hanya pada konteks tersebut; jika konteks tidak ditemukan dalam artikel, berikan sentimen "tidak terkait".'
+        )
+    
     def _create_sentiment_prompt(self, content: str, context: str) -> str:
+        # Only the passages about the context (plus the lede) instead of a blind cut-off
+        passages = select_passages(content, context_terms(context), TASK_TOKEN_BUDGETS['sentiment'])
+        
         prompt = f"""
         Analisis sentimen dari artikel berita berikut berdasarkan konteks yang diberikan.
         
         KONTEKS: {context}
         
         ARTIKEL:
-        {content[:3000]}  # Limit content to avoid token limits
+        {passages}
         
         Berikan analisis sentimen dalam format JSON dengan struktur berikut:
         {{
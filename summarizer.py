@@ -1,43 +1,33 @@
-import google.generativeai as genai
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import json
 import re
 
-class ArticleSummarizer:
-    def __init__(self):
-        self.api_key = None
-        self.model = None
-
-    def set_api_key(self, api_key: str):
-        self.api_key = api_key
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+from gemini_dispatcher import GeminiClient
+from passage_selector import TASK_TOKEN_BUDGETS, context_terms, select_passages
 
+class ArticleSummarizer(GeminiClient):
     def summarize_article(self, content: str, config: Dict) -> Optional[Dict]:
         if not self.model:
             return None
         
         try:
             prompt = self._create_summary_prompt(content, config)
-            response = self.model.generate_content(prompt)
+            response_text = self._generate(prompt)
             
             # Parse response
-            return self._parse_summary_response(response.text, config)
+            return self._parse_summary_response(response_text, config)
             
         except Exception as e:
             print(f"Error summarizing article: {str(e)}")
             return None
 
-    def _create_summary_prompt(self, content: str, config: Dict) -> str:
-        # Base prompt components
+    def _summary_requirements(self, config: Dict) -> List[str]:
+        """Requirement lines shared by the single and the combined prompt"""
         summary_type = config.get('summary_type', 'Ringkas')
         max_length = config.get('max_length', 150)
         language = config.get('language', 'Bahasa Indonesia')
         focus_aspect = config.get('focus_aspect', '')
         
-        # Limit content length to avoid token limits
-        content = content[:4000] if len(content) > 4000 else content
-        
         # Language instruction
         if language == "English":
             lang_instruction = "Respond in English."
@@ -56,19 +46,31 @@ class ArticleSummarizer:
         
         type_instruction = type_instructions.get(summary_type, type_instructions['Ringkas'])
         
+        requirements = [type_instruction, lang_instruction, f"Maximum {max_length} words"]
+        
         # Focus aspect instruction
-        focus_instruction = ""
         if focus_aspect:
-            focus_instruction = f"\nFocus specifically on: {focus_aspect}"
+            requirements.append(f"Focus specifically on: {focus_aspect}")
+        
+        return requirements
+    
+    def task_instruction(self, config: Dict) -> str:
+        """Summary task for the combined prompt (see CombinedAnalyzer)"""
+        return "Summarize the article as a plain string. " + " ".join(
+            f"{requirement.rstrip('.')}." for requirement in self._summary_requirements(config)
+        )
+    
+    def _create_summary_prompt(self, content: str, config: Dict) -> str:
+        # Most relevant passages within the token budget (focus aspect first, if any)
+        content = select_passages(content, context_terms(config.get('focus_aspect', '')), TASK_TOKEN_BUDGETS['summary'])
+        
+        requirements = "\n        ".join(f"- {requirement}" for requirement in self._summary_requirements(config))
         
         prompt = f"""
         Summarize the following article according to these requirements:
         
         REQUIREMENTS:
-        - {type_instruction}
-        - {lang_instruction}
-        - Maximum {max_length} words
-        {focus_instruction}
+        {requirements}
         
         ARTICLE:
         {content}
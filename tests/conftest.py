@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Caches and run stores of the modules under test go to a throwaway directory
+os.environ.setdefault('NEWS_ANALYZER_CACHE_DIR', tempfile.mkdtemp(prefix='news-analyzer-tests-'))
+
+# The app's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+import json
+
+from extraction_profiles import ExtractionProfiles, MAX_MISSES
+
+ARTICLE = 'isi berita ' * 50
+
+
+def test_processes_saving_the_same_file_keep_each_others_hosts(tmp_path):
+    path = str(tmp_path / 'profiles.json')
+    first, second = ExtractionProfiles(path), ExtractionProfiles(path)
+
+    first.learn('https://news.example.com/a', 'density', '//article', ARTICLE)
+    second.learn('https://www.contoh.co.id/b', 'newspaper3k', None, ARTICLE)
+    first.save()
+    second.save()
+
+    with open(path, encoding='utf-8') as f:
+        assert set(json.load(f)) == {'news.example.com', 'contoh.co.id'}
+    assert second.get('https://news.example.com/x')['xpath'] == '//article'
+    assert list(tmp_path.iterdir()) == [tmp_path / 'profiles.json']
+
+
+def test_forgotten_host_is_removed_from_the_file(tmp_path):
+    path = str(tmp_path / 'profiles.json')
+    profiles = ExtractionProfiles(path)
+    profiles.learn('https://news.example.com/a', 'density', '//article', ARTICLE)
+    profiles.save()
+
+    for _ in range(MAX_MISSES):
+        profiles.record_miss('https://news.example.com/a')
+    profiles.save()
+
+    assert ExtractionProfiles(path).get('https://news.example.com/a') is None
+
+
+def test_unwritable_file_does_not_raise(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    profiles = ExtractionProfiles(str(blocker / 'profiles.json'), save_every=1)
+
+    profiles.learn('https://news.example.com/a', 'density', '//article', ARTICLE)
+
+    assert profiles.get('https://news.example.com/a')['method'] == 'density'
@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+
+import gemini_dispatcher
+from gemini_dispatcher import GeminiDispatcher
+
+
+class ApiError(Exception):
+    """Error shaped like google.api_core's: an HTTP status in .code"""
+
+    def __init__(self, code: int, message: str = ''):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGemini:
+    """Stands in for genai.GenerativeModel: fails with the scripted errors first, then answers"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        with self._lock:
+            self.prompts.append(prompt)
+            if self.errors:
+                raise self.errors.pop(0)
+        return StubResponse(f"jawaban: {prompt}")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the dispatcher asked for (without actually sleeping)"""
+    delays = []
+    monkeypatch.setattr(gemini_dispatcher.time, 'sleep', delays.append)
+    return delays
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = GeminiDispatcher(max_concurrency=2, requests_per_minute=100, tokens_per_minute=1_000_000)
+    yield dispatcher
+    dispatcher.close()
+
+
+@pytest.mark.parametrize('code', [429, 500, 502, 503, 504])
+def test_transient_errors_are_retried(dispatcher, sleeps, code):
+    model = StubGemini(errors=[ApiError(code), ApiError(code)])
+
+    assert dispatcher.generate(model, 'halo') == 'jawaban: halo'
+    assert len(model.prompts) == 3
+    assert dispatcher.stats['retries'] == 2
+    assert dispatcher.stats['failed'] == 0
+    assert len(sleeps) == 2
+
+
+def test_backoff_is_exponential_with_full_jitter(sleeps, monkeypatch):
+    # Upper end of every jitter window, so the delays are the backoff caps
+    monkeypatch.setattr(gemini_dispatcher.random, 'uniform', lambda low, high: high)
+    dispatcher = GeminiDispatcher(base_delay=1.0, max_delay=5.0, max_retries=4)
+    model = StubGemini(errors=[ApiError(429)] * 4)
+
+    dispatcher.generate(model, 'halo')
+    dispatcher.close()
+
+    assert sleeps == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_jitter_stays_within_backoff_window(dispatcher, sleeps):
+    dispatcher.base_delay = 0.5
+    model = StubGemini(errors=[ApiError(503)] * 3)
+
+    dispatcher.generate(model, 'halo')
+
+    for attempt, delay in enumerate(sleeps):
+        assert 0 <= delay <= 0.5 * 2 ** attempt
+
+
+def test_gives_up_after_max_retries(sleeps):
+    dispatcher = GeminiDispatcher(max_retries=2)
+    model = StubGemini(errors=[ApiError(429)] * 5)
+
+    with pytest.raises(ApiError):
+        dispatcher.generate(model, 'halo')
+    dispatcher.close()
+
+    assert len(model.prompts) == 3
+    assert dispatcher.stats['failed'] == 1
+
+
+def test_permanent_errors_are_not_retried(dispatcher, sleeps):
+    model = StubGemini(errors=[ApiError(400, 'invalid argument')])
+
+    with pytest.raises(ApiError):
+        dispatcher.generate(model, 'halo')
+
+    assert len(model.prompts) == 1
+    assert sleeps == []
+    assert dispatcher.stats['failed'] == 1
+
+
+def test_errors_are_recognised_by_name_or_message():
+    class ResourceExhausted(Exception):
+        pass
+
+    assert GeminiDispatcher.is_transient(ResourceExhausted('quota'))
+    assert GeminiDispatcher.is_transient(RuntimeError('Rate limit exceeded'))
+    assert not GeminiDispatcher.is_transient(ValueError('bad prompt'))
+
+
+def _generate_in_thread(dispatcher, prompt):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('text', dispatcher.generate(StubGemini(), prompt)))
+    thread.start()
+    return thread, result
+
+
+def _age_window(dispatcher, seconds: float = 61.0):
+    """Move every request in the one-minute window into the past"""
+    with dispatcher._budget:
+        dispatcher._window = type(dispatcher._window)((at - seconds, tokens) for at, tokens in dispatcher._window)
+        dispatcher._budget.notify_all()
+
+
+def test_requests_per_minute_budget_holds_back_extra_requests(dispatcher):
+    dispatcher.configure(requests_per_minute=2)
+    model = StubGemini()
+    dispatcher.generate(model, 'satu')
+    dispatcher.generate(model, 'dua')
+
+    thread, result = _generate_in_thread(dispatcher, 'tiga')
+    thread.join(timeout=0.3)
+    assert thread.is_alive()
+
+    _age_window(dispatcher)
+    thread.join(timeout=2)
+    assert result['text'] == 'jawaban: tiga'
+    assert dispatcher.stats['throttled_seconds'] > 0
+
+
+def test_tokens_per_minute_budget_holds_back_extra_requests(dispatcher):
+    prompt = 'x' * 400  # 100 prompt tokens + 300 expected output
+    dispatcher.configure(tokens_per_minute=2 * GeminiDispatcher.estimate_tokens(prompt))
+    model = StubGemini()
+    dispatcher.generate(model, prompt)
+    dispatcher.generate(model, prompt)
+
+    thread, result = _generate_in_thread(dispatcher, prompt)
+    thread.join(timeout=0.3)
+    assert thread.is_alive()
+
+    _age_window(dispatcher)
+    thread.join(timeout=2)
+    assert result['text'] == f"jawaban: {prompt}"
+
+
+def test_oversized_prompt_goes_through_on_an_empty_window(dispatcher):
+    dispatcher.configure(tokens_per_minute=10)
+
+    assert dispatcher.generate(StubGemini(), 'x' * 4000).startswith('jawaban')
+
+
+def test_queue_depth_reports_queued_and_in_flight_jobs():
+    dispatcher = GeminiDispatcher(max_concurrency=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def job():
+        started.set()
+        release.wait(timeout=5)
+
+    futures = [dispatcher.submit(job) for _ in range(3)]
+    started.wait(timeout=2)
+    assert dispatcher.queue_depth() == {'queued': 2, 'in_flight': 1}
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert dispatcher.queue_depth() == {'queued': 0, 'in_flight': 0}
+    dispatcher.close()
+
+
+def test_map_keeps_input_order(dispatcher):
+    def slow_upper(text):
+        time.sleep(0.01 * (3 - len(text)))
+        return text.upper()
+
+    assert dispatcher.map(slow_upper, ['a', 'bb', 'ccc']) == ['A', 'BB', 'CCC']
@@ -0,0 +1,10 @@
+from job_runner import domain_intervals_per_job
+
+
+def test_domain_spacing_is_shared_by_the_jobs_running_side_by_side():
+    config = {'domain_interval': 1.0, 'domain_overrides': {'detik.com': 2.0, 'kompas.com': 0.5}}
+
+    assert domain_intervals_per_job(config, workers=3) == {
+        'domain_interval': 3.0, 'domain_overrides': {'detik.com': 6.0, 'kompas.com': 1.5},
+    }
+    assert domain_intervals_per_job(config, workers=1)['domain_interval'] == 1.0
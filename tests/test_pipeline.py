@@ -0,0 +1,137 @@
+import copy
+import threading
+
+import pytest
+
+from cli import DEFAULT_CONFIG
+from http_transport import HttpTransport
+from pipeline import NewsPipeline
+
+HEAD = (b'<html><head><title>Harga Beras Naik di Jakarta</title>'
+        b'<meta name="author" content="Budi Santoso"></head>')
+BODY_CHUNK = b'<body>' + b'<p>isi berita yang panjang</p>' * 200 + b'</body>'
+
+
+class StreamedResponse:
+    """requests.Response stand-in that records how much of the body was read"""
+
+    def __init__(self, url: str, chunks):
+        self.url = url
+        self.status_code = 200
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.chunks = chunks
+        self.read = 0
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StubSession:
+    """Serves `chunks` for every URL, or chunks(url) when it is a function"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, stream=False, **kwargs):
+        response = StreamedResponse(url, self.chunks(url) if callable(self.chunks) else self.chunks)
+        with self._lock:
+            self.responses.append(response)
+        return response
+
+
+def make_config(**overrides):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config.update({
+        'use_http_cache': False, 'use_llm_cache': False, 'use_extraction_profiles': False,
+        'domain_interval': 0.0, 'parse_workers': 0,
+    })
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = StubSession([HEAD] + [BODY_CHUNK] * 5)
+    monkeypatch.setattr(HttpTransport, 'session', property(lambda self: session))
+    return session
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = NewsPipeline()
+    yield pipeline
+    pipeline.close()
+
+
+def test_title_only_run_never_reads_past_head(session, pipeline):
+    config = make_config(enable_scraping=False, enable_journalist=True)
+    urls = ['https://news.example.com/a', 'https://www.contoh.co.id/b']
+
+    rows = dict(pipeline.process_urls(urls, config))
+
+    assert [rows[i]['Title'] for i in range(len(urls))] == ['Harga Beras Naik di Jakarta'] * 2
+    assert len(session.responses) == 2
+    assert all(response.read == 1 for response in session.responses)
+
+
+def test_scraping_run_reads_the_whole_body(session, pipeline):
+    config = make_config(enable_scraping=True)
+
+    dict(pipeline.process_urls(['https://news.example.com/a'], config))
+
+    assert session.responses[0].read == 6
+
+
+class StubGemini:
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        return type('Response', (), {'text': '{"sentiment": "positif", "confidence": "tinggi", "reasoning": "stub"}'})()
+
+
+def article_page(url):
+    """A different long article per path, so every page is a distinct story"""
+    slug = url.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+    paragraphs = ''.join(f'<p>Berita {slug} nomor {n} tentang harga beras di pasar induk Jakarta hari ini.</p>'
+                         for n in range(30))
+    return [f'<html><head><title>Berita {slug} hari ini</title></head><body><article>{paragraphs}'
+            f'</article></body></html>'.encode('utf-8')]
+
+
+def test_url_variants_reuse_the_ai_results_of_their_article(monkeypatch, pipeline):
+    session = StubSession(article_page)
+    monkeypatch.setattr(HttpTransport, 'session', property(lambda self: session))
+    model = StubGemini()
+    pipeline.sentiment_analyzer.model = model
+    config = make_config(enable_scraping=True, enable_sentiment=True, sentiment_context='harga beras',
+                         sentiment_local_first=False, combine_ai_calls=False)
+    urls = [
+        'https://news.example.com/satu',
+        'https://news.example.com/satu?utm_source=twitter',
+        'https://news.example.com/dua',
+        'https://m.news.example.com/dua',
+        'https://news.example.com/tiga',
+        'https://news.example.com/empat',
+    ]
+
+    rows = dict(pipeline.process_urls(urls, config))
+
+    assert len(session.responses) == 4
+    assert len(model.prompts) == 4
+    assert [rows[i]['Sentiment'] for i in range(len(urls))] == ['positif'] * len(urls)
+    assert rows[1]['Title'] == rows[0]['Title']
+    assert pipeline.url_stats == {'fetched': 4, 'skipped': 2}
@@ -0,0 +1,25 @@
+import pytest
+
+from sentiment_analyzer import LocalSentimentScorer
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return LocalSentimentScorer()
+
+
+def polarity(scorer, text):
+    return scorer.score_batch([text])['polarity'][0]
+
+
+@pytest.mark.parametrize('text', ['tidak terlalu baik', 'kinerjanya tidak begitu bagus', 'belum cukup memuaskan'])
+def test_negation_reaches_past_intensifiers(scorer, text):
+    assert polarity(scorer, text) < 0
+
+
+def test_negation_stops_at_punctuation(scorer):
+    assert polarity(scorer, 'tidak ada kendala, hasilnya baik') > 0
+
+
+def test_negation_covers_only_the_next_sentiment_word(scorer):
+    assert polarity(scorer, 'tidak buruk dan sukses besar') > 0
@@ -1,24 +1,202 @@
 # topic_modeller.py
 
-import google.generativeai as genai
+import numpy as np
 from typing import Dict, Optional, List
 import json
 import re
+import threading
 
-class TopicModeller:
+from gemini_dispatcher import GeminiClient
+from passage_selector import TASK_TOKEN_BUDGETS, WORD_PATTERN, STOPWORDS, context_terms, estimate_tokens, select_passages
+
+# Upper bound per batch prompt so the JSON answer stays short enough to parse reliably
+MAX_BATCH_ARTICLES = 40
+
+# Keyword expansions for common Indonesian news topics, keyed by a word of the label
+# ("Politik Nasional" picks up 'politik'). Labels not listed here are represented by
+# their own words plus whatever the user adds in the "Kata Kunci Topik" box.
+TOPIC_KEYWORDS = {
+    'politik': ['partai', 'pemilu', 'pilkada', 'dpr', 'presiden', 'menteri', 'kampanye', 'koalisi', 'capres', 'legislatif', 'parlemen', 'politisi'],
+    'ekonomi': ['inflasi', 'harga', 'pertumbuhan', 'investasi', 'rupiah', 'pasar', 'ekspor', 'impor', 'pajak', 'bank', 'suku', 'fiskal', 'pdb'],
+    'bisnis': ['perusahaan', 'penjualan', 'laba', 'pendapatan', 'saham', 'investor', 'produk', 'pasar', 'emiten', 'korporasi', 'usaha'],
+    'keuangan': ['bank', 'kredit', 'saham', 'obligasi', 'bunga', 'rupiah', 'asuransi', 'investasi', 'reksa', 'ojk', 'pinjaman'],
+    'olahraga': ['pertandingan', 'pemain', 'tim', 'pelatih', 'liga', 'gol', 'turnamen', 'juara', 'atlet', 'klub', 'sepak', 'bola', 'laga'],
+    'teknologi': ['aplikasi', 'digital', 'internet', 'smartphone', 'perangkat', 'software', 'startup', 'data', 'ai', 'teknologi', 'gadget', 'siber'],
+    'kesehatan': ['pasien', 'rumah', 'sakit', 'dokter', 'penyakit', 'vaksin', 'obat', 'kemenkes', 'virus', 'gizi', 'bpjs', 'medis'],
+    'pendidikan': ['sekolah', 'siswa', 'guru', 'mahasiswa', 'kampus', 'universitas', 'kurikulum', 'pelajar', 'beasiswa', 'ujian'],
+    'hukum': ['pengadilan', 'hakim', 'jaksa', 'tersangka', 'terdakwa', 'sidang', 'vonis', 'kpk', 'gugatan', 'putusan', 'pidana', 'kasus'],
+    'kriminal': ['polisi', 'pelaku', 'korban', 'ditangkap', 'pencurian', 'pembunuhan', 'narkoba', 'penipuan', 'tersangka', 'polres'],
+    'otomotif': ['mobil', 'motor', 'kendaraan', 'mesin', 'dealer', 'varian', 'otomotif', 'listrik', 'sepeda', 'pabrikan', 'gaikindo'],
+    'hiburan': ['film', 'musik', 'artis', 'penyanyi', 'konser', 'aktor', 'aktris', 'selebriti', 'album', 'serial', 'sinetron'],
+    'lingkungan': ['sampah', 'polusi', 'emisi', 'iklim', 'hutan', 'lingkungan', 'pencemaran', 'limbah', 'karbon', 'konservasi'],
+    'bencana': ['banjir', 'gempa', 'longsor', 'erupsi', 'tsunami', 'korban', 'bnpb', 'evakuasi', 'pengungsi', 'kebakaran'],
+    'transportasi': ['kereta', 'pesawat', 'bandara', 'penerbangan', 'jalan', 'tol', 'angkutan', 'bus', 'pelabuhan', 'mudik', 'kemenhub'],
+    'energi': ['listrik', 'bbm', 'minyak', 'gas', 'batu', 'bara', 'pertamina', 'pln', 'energi', 'terbarukan', 'tambang'],
+    'pariwisata': ['wisata', 'wisatawan', 'turis', 'hotel', 'destinasi', 'liburan', 'kunjungan', 'pariwisata', 'kemenparekraf'],
+    'internasional': ['negara', 'asing', 'global', 'dunia', 'pbb', 'diplomatik', 'luar', 'amerika', 'china', 'eropa', 'bilateral'],
+    'pertanian': ['petani', 'panen', 'beras', 'pupuk', 'pangan', 'sawah', 'komoditas', 'bulog', 'gabah', 'perkebunan'],
+}
+
+# Indonesian affixes stripped when a word is not in the vocabulary as-is ("perekonomian" -> "ekonomi")
+PREFIXES = ('meng', 'mem', 'men', 'per', 'ber', 'ter', 'me', 'pe', 'di', 'ke', 'se')
+SUFFIXES = ('nya', 'kan', 'an', 'i')
+
+# Distinct keywords of the best topic an article must mention before the local label counts
+MIN_KEYWORD_HITS = 2
+
+def parse_topic_keywords(text: str) -> Dict[str, List[str]]:
+    """'Otomotif: mobil, motor' per line -> {'Otomotif': ['mobil', 'motor']}"""
+    keywords = {}
+    for line in (text or '').splitlines():
+        label, sep, words = line.partition(':')
+        if sep and label.strip():
+            keywords[label.strip()] = context_terms(words)
+    return keywords
+
+class LocalTopicClassifier:
+    """Offline classifier for a fixed topic list, vectorized over a batch of articles.
+
+    Each topic becomes an idf-weighted vector over its label words (weight 2) and
+    keyword expansions; articles become sublinear term-count vectors over the same
+    vocabulary, so one matrix product gives the cosine similarity of every article
+    to every topic.
+    """
+
+    def __init__(self, topics: List[str], keywords: Optional[Dict[str, List[str]]] = None):
+        self.topics = list(topics)
+        keywords = {label.lower(): words for label, words in (keywords or {}).items()}
+
+        self.vocabulary: Dict[str, int] = {}
+        rows = []
+        for topic in self.topics:
+            label_words = [word for word in WORD_PATTERN.findall(topic.lower()) if word not in STOPWORDS]
+            weights = {word: 2.0 for word in label_words}
+            expansions = list(keywords.get(topic.lower(), []))
+            for word in label_words:
+                expansions.extend(TOPIC_KEYWORDS.get(word, []))
+            for term in expansions:
+                for word in WORD_PATTERN.findall(term.lower()):
+                    if word not in STOPWORDS:
+                        weights.setdefault(word, 1.0)
+            for word in weights:
+                self.vocabulary.setdefault(word, len(self.vocabulary))
+            rows.append(weights)
+
+        matrix = np.zeros((len(self.topics), len(self.vocabulary)))
+        for row, weights in enumerate(rows):
+            for word, weight in weights.items():
+                matrix[row, self.vocabulary[word]] = weight
+        # Keywords shared by many topics say little about which one it is
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        self.idf = np.log1p(len(self.topics) / np.maximum(document_frequency, 1))
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.topic_matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        self.topic_keywords = (matrix > 0).astype(float)
+        self._word_columns: Dict[str, Optional[int]] = {}
+
+    def _column(self, word: str) -> Optional[int]:
+        if word not in self._word_columns:
+            column = self.vocabulary.get(word)
+            if column is None and len(word) > 5:
+                stems = [word]
+                for prefix in PREFIXES:
+                    if word.startswith(prefix):
+                        stems.append(word[len(prefix):])
+                        break
+                for stem in list(stems):
+                    for suffix in SUFFIXES:
+                        if stem.endswith(suffix):
+                            stems.append(stem[:-len(suffix)])
+                            break
+                column = next((self.vocabulary[stem] for stem in stems if stem in self.vocabulary), None)
+            self._word_columns[word] = column
+        return self._word_columns[word]
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.vocabulary)))
+        for row, text in enumerate(texts):
+            columns = [self._column(word) for word in WORD_PATTERN.findall((text or '').lower())]
+            columns = [column for column in columns if column is not None]
+            if columns:
+                np.add.at(matrix[row], columns, 1.0)
+        return matrix
+
+    def score_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Best topic index, its similarity, the margin over the runner-up and keyword hits per text"""
+        counts = self.vectorize(texts)
+        weighted = np.log1p(counts) * self.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        weighted = np.divide(weighted, norms, out=np.zeros_like(weighted), where=norms > 0)
+        similarity = weighted @ self.topic_matrix.T
+        hits = (counts > 0).astype(float) @ self.topic_keywords.T
+
+        best = np.argmax(similarity, axis=1)
+        ranked = np.sort(similarity, axis=1)
+        top = ranked[:, -1]
+        runner_up = ranked[:, -2] if len(self.topics) > 1 else np.zeros_like(top)
+        rows = np.arange(len(texts))
+        return {'best': best, 'score': top, 'margin': top - runner_up, 'hits': hits[rows, best]}
+
+class TopicModeller(GeminiClient):
     def __init__(self):
         """Initializes the TopicModeller."""
-        self.api_key = None
-        self.model = None
+        super().__init__(model_name='gemini-1.5-flash')
+
+        # Offline first tier for user topic lists: confident rows never reach Gemini
+        self.local_first = True
+        self.local_margin = 0.15
+        self.tier_stats = {'lokal': 0, 'gemini': 0}
+        self._classifier = None
+        self._classifier_key = None
+        self._lock = threading.Lock()
 
-    def set_api_key(self, api_key: str):
-        """Sets the API key and configures the Generative AI model."""
-        self.api_key = api_key
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+    def _local_classifier(self, config: Dict) -> Optional[LocalTopicClassifier]:
+        """Classifier for the run's topic list, rebuilt only when the list or keywords change"""
+        topics = config.get('user_topics', [])
+        if config.get('mode') not in ('Ditentukan User', 'Hybrid') or not topics:
+            return None
+        keywords = config.get('topic_keywords', {})
+        key = (tuple(topics), tuple(sorted((label, tuple(words)) for label, words in keywords.items())))
+        with self._lock:
+            if key != self._classifier_key:
+                self._classifier = LocalTopicClassifier(topics, keywords)
+                self._classifier_key = key
+            return self._classifier
+
+    def classify_locally(self, contents: List[str], config: Dict) -> List[Optional[str]]:
+        """
+        First tier: labels for the articles the local classifier is sure about.
 
-    def determine_topic(self, content: str, config: Dict) -> Optional[str]:
+        An article gets a label when it mentions enough of the topic's keywords and its
+        similarity beats the runner-up topic by `local_margin`; None = send to Gemini
+        (in Hybrid mode Gemini may then come up with a new topic).
+        """
+        classifier = self._local_classifier(config) if self.local_first else None
+        if classifier is None or not contents:
+            return [None] * len(contents)
+
+        scores = classifier.score_batch(contents)
+        labels = []
+        for best, margin, hits in zip(scores['best'], scores['margin'], scores['hits']):
+            if hits >= MIN_KEYWORD_HITS and margin >= self.local_margin:
+                labels.append(classifier.topics[best])
+            else:
+                labels.append(None)
+        self.record_tier('lokal', sum(1 for label in labels if label))
+        return labels
+
+    def record_tier(self, tier: str, count: int = 1):
+        """Count rows for the tier report (also used when the fused call answered the topic)"""
+        with self._lock:
+            self.tier_stats[tier] += count
+
+    def reset_tier_stats(self):
+        with self._lock:
+            for tier in self.tier_stats:
+                self.tier_stats[tier] = 0
+
+    def determine_topic(self, content: str, config: Dict, local_first: Optional[bool] = None) -> Optional[str]:
         """
         Determines the topic of the article based on the provided configuration.
 
@@ -26,28 +204,155 @@ class TopicModeller:
             content: The text content of the article.
             config: A dictionary containing topic modelling configuration,
                     including 'mode', and 'user_topics'.
+            local_first: Try the local classifier first (default), False when already tried.
 
         Returns:
             The determined topic as a string, or an error message.
         """
+        if local_first is None or local_first:
+            local = self.classify_locally([content], config)[0]
+            if local:
+                return local
+
         if not self.model:
             return "Model AI tidak dikonfigurasi"
 
+        self.record_tier('gemini')
         try:
             prompt = self._create_prompt(content, config)
-            response = self.model.generate_content(prompt)
-            return self._parse_response(response.text)
+            response_text = self._generate(prompt)
+            return self._parse_response(response_text)
         except Exception as e:
             print(f"Error determining topic: {str(e)}")
             return "Gagal menentukan topik"
 
+    def determine_topics_batch(self, contents: List[str], config: Dict, token_budget: int = 8000,
+                               article_budget: int = TASK_TOKEN_BUDGETS['topic_batch']) -> List[str]:
+        """
+        Determines topics for many articles with as few requests as possible.
+
+        With a user topic list the local classifier labels the confident articles first.
+        The rest are packed into prompts up to `token_budget` (estimated) and the model
+        answers with a JSON array of {"id", "topic"}. Articles it misses or mangles
+        (e.g. a label outside the user list) are retried one by one.
+
+        Returns:
+            A list of topics aligned with `contents`.
+        """
+        topics: List[Optional[str]] = self.classify_locally(contents, config)
+        remaining = [i for i, topic in enumerate(topics) if topic is None]
+        if not remaining:
+            return topics
+        if not self.model:
+            return [topic or "Model AI tidak dikonfigurasi" for topic in topics]
+
+        batches = self._pack_batches(contents, config, token_budget, article_budget, remaining)
+        if self.dispatcher:
+            batch_answers = self.dispatcher.map(self._run_batch, batches, config)
+        else:
+            batch_answers = [self._run_batch(batch, config) for batch in batches]
+        for answers in batch_answers:
+            for article_id, topic in answers.items():
+                topics[article_id] = topic
+
+        missing = [i for i, topic in enumerate(topics) if topic is None]
+        # Retried rows are counted by determine_topic itself
+        self.record_tier('gemini', len(remaining) - len(missing))
+        print(f"📦 Topik batch: {len(contents) - len(remaining)} artikel diputuskan lokal, {len(remaining)} dalam "
+              f"{len(batches)} request, {len(missing)} diulang satu per satu")
+        if self.dispatcher:
+            retried = self.dispatcher.map(self.determine_topic, [contents[i] for i in missing], config, False)
+        else:
+            retried = [self.determine_topic(contents[i], config, local_first=False) for i in missing]
+        for i, topic in zip(missing, retried):
+            topics[i] = topic
+
+        return topics
+
+    def _run_batch(self, batch: Dict[int, str], config: Dict) -> Dict[int, str]:
+        """One multi-article request; returns {article id: topic} for the usable answers."""
+        try:
+            prompt = self._create_batch_prompt(batch, config)
+            response_text = self._generate(prompt)
+            answers = self._parse_batch_response(response_text, config)
+            return {article_id: topic for article_id, topic in answers.items() if article_id in batch}
+        except Exception as e:
+            print(f"Error determining topics in batch: {str(e)}")
+            return {}
+
+    def _pack_batches(self, contents: List[str], config: Dict, token_budget: int,
+                      article_budget: int, ids: Optional[List[int]] = None) -> List[Dict[int, str]]:
+        """Greedily fills batches of {article id: selected passages} up to the token budget."""
+        # Rough estimate: ~4 characters per token, plus the fixed instructions
+        terms = context_terms(config.get('user_topics', []))
+        overhead = 150 + estimate_tokens(', '.join(config.get('user_topics', [])))
+        batches, current, used = [], {}, overhead
+        for i in (ids if ids is not None else range(len(contents))):
+            text = select_passages(contents[i], terms, article_budget)
+            cost = estimate_tokens(text) + 10
+            if current and (used + cost > token_budget or len(current) >= MAX_BATCH_ARTICLES):
+                batches.append(current)
+                current, used = {}, overhead
+            current[i] = text
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _create_batch_prompt(self, batch: Dict[int, str], config: Dict) -> str:
+        """Prompt for several articles at once, answered as a JSON array."""
+        articles = "\n\n".join(f"[{article_id}]\n{text}" for article_id, text in batch.items())
+        return f"""
+        Tentukan topik untuk SETIAP artikel berikut. Setiap artikel diawali nomor id dalam kurung siku.
+        {self.task_instruction(config)}
+
+        ARTIKEL:
+        {articles}
+
+        Berikan HANYA array JSON dengan satu objek per artikel, tanpa penjelasan:
+        [{{"id": <nomor id>, "topic": "<nama topik>"}}]
+        """
+
+    def _parse_batch_response(self, response_text: str, config: Dict) -> Dict[int, str]:
+        """Parses the JSON array answer; entries with unusable ids or labels are dropped."""
+        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        if not json_match:
+            return {}
+        try:
+            items = json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return {}
+
+        allowed = {}
+        if config.get('mode') == 'Ditentukan User':
+            allowed = {topic.lower(): topic for topic in config.get('user_topics', [])}
+
+        topics = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                article_id = int(item.get('id'))
+            except (TypeError, ValueError):
+                continue
+            topic = self._parse_response(str(item.get('topic') or ''))
+            if topic == "Tidak dapat di-parse":
+                continue
+            if allowed:
+                # Must be one of the user's labels; anything else goes to the single retry
+                if topic.lower() not in allowed:
+                    continue
+                topic = allowed[topic.lower()]
+            topics[article_id] = topic
+        return topics
+
     def _create_prompt(self, content: str, config: Dict) -> str:
         """Creates a prompt for the AI based on the selected mode."""
         mode = config.get('mode', 'Ditentukan AI')
         user_topics = config.get('user_topics', [])
         
-        # Limit content to avoid token limits
-        truncated_content = content[:3500]
+        # Most representative passages within the token budget instead of a blind cut-off
+        truncated_content = select_passages(content, context_terms(user_topics), TASK_TOKEN_BUDGETS['topic'])
 
         if mode == 'Ditentukan User':
             return self._create_user_defined_prompt(truncated_content, user_topics)
@@ -56,6 +361,21 @@ class TopicModeller:
         else: # 'Ditentukan AI'
             return self._create_ai_defined_prompt(truncated_content)
 
+    def task_instruction(self, config: Dict) -> str:
+        """Instruksi tugas topik untuk prompt gabungan (lihat CombinedAnalyzer)."""
+        mode = config.get('mode', 'Ditentukan AI')
+        topics = ', '.join(config.get('user_topics', []))
+
+        if mode == 'Ditentukan User':
+            return f"Pilih SATU topik yang paling relevan HANYA dari daftar berikut: {topics}. Isi dengan nama topiknya saja."
+        elif mode == 'Hybrid':
+            return (f"Cocokkan topik artikel dengan salah satu dari daftar berikut: {topics}. "
+                    "Jika tidak ada yang cocok sama sekali, tentukan sendiri topik yang paling sesuai dalam 1-3 kata. "
+                    "Isi dengan nama topiknya saja.")
+        else: # 'Ditentukan AI'
+            return ('Tentukan topik utama artikel dalam 1-3 kata, contoh: "Politik Nasional", "Teknologi Smartphone". '
+                    "Isi dengan nama topiknya saja.")
+
     def _create_user_defined_prompt(self, content: str, topics: List[str]) -> str:
         """Prompt to force a choice from a user-defined list."""
         return f"""
@@ -0,0 +1,94 @@
+# url_canonicalizer.py
+
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, unquote_plus, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click; dropped from every URL before fetching
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'twclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref', 'ref_src', 'referrer', 'cmpid', 'share', 'shared',
+    'spm', 'rtm', 'tag_from', 'xtor', 's_cid', 'ocid', 'smid', 'soc_src', 'soc_trk',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+
+# Parameters that switch the same article to another view (single page, AMP, print);
+# ignored when deciding whether two URLs are the same article, kept when fetching
+VIEW_PARAMS = {
+    'page': {'all', 'full', '1'},
+    'single': None, 'showall': None, 'amp': None, 'outputtype': {'amp'}, 'view': {'amp', 'full', 'print'},
+    'print': None, 'mode': {'amp'},
+}
+
+# Host prefixes of mobile / AMP mirrors ("m.detik.com" is the same article as "detik.com")
+MIRROR_HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'wap.')
+
+# AMP and index variants of the path
+AMP_PATH = re.compile(r'(^/amp(?=/)|/amp/?$|\.amp$|/amp(?=/))', re.IGNORECASE)
+INDEX_PAGE = re.compile(r'/(index|default)\.(html?|php|aspx?)$', re.IGNORECASE)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def _is_view(name: str, value: str) -> bool:
+    values = VIEW_PARAMS.get(name.lower(), False)
+    return values is None or (values is not False and value.lower() in values)
+
+def _netloc(scheme: str, netloc: str) -> str:
+    host, _, port = netloc.lower().rpartition(':') if ':' in netloc else (netloc.lower(), '', '')
+    if port and port != DEFAULT_PORTS.get(scheme):
+        return f'{host}:{port}'
+    return host
+
+def fetch_url(url: str) -> str:
+    """Safe normalization for fetching and caching: lowercase scheme/host, no default port,
+    fragment or tracking parameters. Never changes which page is served: the rest of the
+    query is kept byte for byte, in its original order and encoding ("?amp", "%20")."""
+    parts = urlsplit((url or '').strip())
+    scheme = parts.scheme.lower()
+    query = '&'.join(field for field in parts.query.split('&')
+                     if field and not _is_tracking(unquote_plus(field.split('=', 1)[0])))
+    return urlunsplit((scheme, _netloc(scheme, parts.netloc), parts.path or '/', query, ''))
+
+def canonical_url(url: str) -> str:
+    """Identity of the article behind the URL, for deduplication only (not fetched):
+    also folds http/https, mobile and AMP mirrors, view switches, index pages and trailing slashes."""
+    parts = urlsplit(fetch_url(url))
+    host = parts.netloc
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            host = host[len(prefix):]
+            break
+
+    path = AMP_PATH.sub('', parts.path)
+    path = INDEX_PAGE.sub('/', path)
+    path = re.sub(r'/{2,}', '/', path).rstrip('/') or '/'
+
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_view(name, value))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme, host, path, urlencode(query), ''))
+
+def dedupe_urls(urls: List[str]) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+    """
+    Collapse URL variants of the same article before any network work.
+
+    Returns:
+        ({row index: URL to fetch} for the first row of every article,
+         {that row index: [other row indices with the same article]})
+    """
+    first: Dict[str, int] = {}
+    to_fetch: Dict[int, str] = {}
+    aliases: Dict[int, List[int]] = {}
+    for i, url in enumerate(urls):
+        if not url:
+            continue
+        key = canonical_url(url)
+        if key in first:
+            aliases.setdefault(first[key], []).append(i)
+        else:
+            first[key] = i
+            to_fetch[i] = fetch_url(url)
+    return to_fetch, aliases